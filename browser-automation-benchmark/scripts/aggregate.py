@@ -0,0 +1,281 @@
+"""Online summary statistics: the per-(tool, site) summary, built one record at a time.
+
+``SummaryAggregator.add`` folds a record into its (tool, site) group and
+``summary()`` can be taken at any point. A group keeps counters, running
+moments (Welford) and, per timing field, a log-bucket quantile sketch, so
+its memory doesn't grow with the number of attempts. A timing field also
+keeps its values while there are at most ``EXACT_LIMIT`` of them, and its
+statistics are then exactly those of the full list; past that limit,
+quantiles come from the sketch, within ``SKETCH_ACCURACY`` relative error.
+"""
+
+import bisect
+import math
+import statistics
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Values a timing field keeps for exact statistics before relying on its sketch alone
+EXACT_LIMIT = 1024
+# Relative error of sketched quantiles
+SKETCH_ACCURACY = 0.01
+# Values at or below this land in the sketch's zero bucket
+MIN_SKETCH_VALUE = 1e-9
+
+# Summary timing field -> record field, and whether only successful / non-crash records count
+TIMING_FIELDS: Tuple[Tuple[str, str, Optional[str]], ...] = (
+    ("timing_total", "duration_s", "non-crash"),
+    ("timing_success", "duration_s", "success"),
+    ("timing_navigation", "navigation_s", None),
+    ("timing_wait", "wait_s", None),
+    ("timing_extraction", "extraction_s", None),
+    ("timing_setup", "setup_s", None),
+)
+
+
+def timing_stats(values: List[float]) -> Optional[Dict[str, float]]:
+    """Compute descriptive statistics for a list of timing values."""
+    if not values:
+        return None
+    s: Dict[str, float] = {
+        "mean": round(statistics.mean(values), 3),
+        "median": round(statistics.median(values), 3),
+        "min": round(min(values), 3),
+        "max": round(max(values), 3),
+    }
+    if len(values) >= 2:
+        s["stdev"] = round(statistics.stdev(values), 3)
+        q = statistics.quantiles(values, n=4)
+        s["iqr"] = round(q[2] - q[0], 3)
+        s["p95"] = round(statistics.quantiles(values, n=20)[-1], 3)
+    return s
+
+
+class QuantileSketch:
+    """Counts per logarithmic bucket; any quantile within ``accuracy`` relative error.
+
+    Bucket ``k`` holds values in ``(gamma**(k-1), gamma**k]``, so the number
+    of buckets depends on the range of the values, not on how many there are.
+    """
+
+    def __init__(self, accuracy: float = SKETCH_ACCURACY) -> None:
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= MIN_SKETCH_VALUE:
+            self.zeros += 1
+            return
+        k = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[k] = self.buckets.get(k, 0) + 1
+
+    def _values_at(self, ranks: List[int]) -> List[float]:
+        """Estimated values of the given 0-based ranks."""
+        keys = sorted(self.buckets)
+        ends: List[int] = []
+        seen = self.zeros
+        for k in keys:
+            seen += self.buckets[k]
+            ends.append(seen)
+        out = []
+        for rank in ranks:
+            if rank < self.zeros or not keys:
+                out.append(0.0)
+                continue
+            k = keys[min(bisect.bisect_right(ends, rank), len(keys) - 1)]
+            out.append(2 * self.gamma ** k / (self.gamma + 1))
+        return out
+
+    def median(self) -> float:
+        low, high = self._values_at([(self.count - 1) // 2, self.count // 2])
+        return (low + high) / 2
+
+    def quantiles(self, n: int) -> List[float]:
+        """Cut points dividing the values into ``n`` groups, as ``statistics.quantiles`` (exclusive method)."""
+        m = self.count + 1
+        cuts = []
+        for i in range(1, n):
+            j = min(max(i * m // n, 1), self.count - 1)
+            cuts.append((j, i * m - j * n))
+        values = self._values_at([r for j, _ in cuts for r in (j - 1, j)])
+        return [(values[2 * c] * (n - delta) + values[2 * c + 1] * delta) / n for c, (_, delta) in enumerate(cuts)]
+
+
+class TimingStats:
+    """Running statistics of one timing field, reported in ``timing_stats`` form."""
+
+    __slots__ = ("count", "mean", "_m2", "min", "max", "_exact", "_sketch")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        # The values themselves, dropped once there are more than EXACT_LIMIT
+        self._exact: Optional[List[float]] = []
+        self._sketch = QuantileSketch()
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._sketch.add(value)
+        if self._exact is not None:
+            if len(self._exact) < EXACT_LIMIT:
+                self._exact.append(value)
+            else:
+                self._exact = None
+
+    def result(self) -> Optional[Dict[str, float]]:
+        if self._exact is not None:
+            return timing_stats(self._exact)
+
+        def clamp(value: float) -> float:
+            return round(min(max(value, self.min), self.max), 3)
+
+        q = [clamp(v) for v in self._sketch.quantiles(4)]
+        return {
+            "mean": round(self.mean, 3),
+            "median": clamp(self._sketch.median()),
+            "min": round(self.min, 3),
+            "max": round(self.max, 3),
+            "stdev": round(math.sqrt(self._m2 / (self.count - 1)), 3),
+            "iqr": round(q[2] - q[0], 3),
+            "p95": clamp(self._sketch.quantiles(20)[-1]),
+        }
+
+
+class SiteSummary:
+    """The running summary of one (tool, site)'s records."""
+
+    def __init__(self, tool: str, site: str) -> None:
+        self.tool = tool
+        self.site = site
+        self.attempts = 0
+        self.outcomes: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.failure_reasons: Counter = Counter()
+        self.timings = {name: TimingStats() for name, _, _ in TIMING_FIELDS}
+        self.ready = 0
+        self.ready_known = 0
+        self.completeness = 0.0
+        self.correctness = [0.0, 0]
+        self.correctness_success = [0.0, 0]
+        self.index_ms = TimingStats()
+        self.layer_ms: Dict[str, TimingStats] = {}
+        self.provenance: Dict[str, Counter] = {}
+
+    def add(self, record: Dict[str, Any]) -> None:
+        outcome = record["outcome"]
+        self.attempts += 1
+        self.outcomes[outcome] += 1
+        for name, key, only in TIMING_FIELDS:
+            if only == "success" and outcome != "success":
+                continue
+            if only == "non-crash" and outcome == "crash/error":
+                continue
+            value = record.get(key)
+            if value is not None:
+                self.timings[name].add(value)
+        if record.get("wait_ready") is not None:
+            self.ready_known += 1
+            self.ready += bool(record["wait_ready"])
+
+        expected = len(record["expected"])
+        got = sum(1 for field in record["expected"] if record["extracted"].get(field))
+        self.completeness += 100 * got / expected if expected else 0
+        gt_pct = record["ground_truth"].get("correctness_pct")
+        if gt_pct is not None:
+            self.correctness[0] += gt_pct
+            self.correctness[1] += 1
+            if outcome == "success":
+                self.correctness_success[0] += gt_pct
+                self.correctness_success[1] += 1
+
+        if record.get("failure_reason"):
+            self.failure_reasons[record["failure_reason"]] += 1
+        if record.get("failure_category"):
+            self.categories[record["failure_category"]] += 1
+
+        # Cached extractions carry provenance but no profile, so they count
+        # towards the field sources and not towards the timings
+        profile = record.get("extraction_profile")
+        if profile:
+            self.index_ms.add(profile["index_ms"])
+            for name, layer in profile["layers"].items():
+                self.layer_ms.setdefault(name, TimingStats()).add(layer["ms"])
+        for field, layer_name in (record.get("extraction_provenance") or {}).items():
+            self.provenance.setdefault(field, Counter())[layer_name] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        n = self.attempts
+        succ = self.outcomes["success"]
+        partial = self.outcomes["partial"]
+        blocked = self.outcomes["blocked/challenged"]
+        timeout = self.outcomes["timeout"]
+        crash = self.outcomes["crash/error"]
+        timings = {name: stats.result() for name, stats in self.timings.items()}
+        stability = max(0, 100 - (timeout + crash) * 8)
+        gt_sum, gt_n = self.correctness
+        gts_sum, gts_n = self.correctness_success
+        return {
+            "tool": self.tool,
+            "site": self.site,
+            "attempts": n,
+            "success": succ,
+            "partial": partial,
+            "blocked": blocked,
+            "timeout": timeout,
+            "crash": crash,
+            "success_rate": f"{succ}/{n}",
+            "success_rate_pct": round(100 * succ / n, 2),
+            "block_rate_pct": round(100 * blocked / n, 2),
+            "partial_rate_pct": round(100 * partial / n, 2),
+            "timing_total": timings["timing_total"],
+            "timing_success": timings["timing_success"],
+            "timing_navigation": timings["timing_navigation"],
+            "timing_wait": timings["timing_wait"],
+            "ready_rate_pct": round(100 * self.ready / self.ready_known, 2) if self.ready_known else None,
+            "timing_extraction": timings["timing_extraction"],
+            "timing_setup": timings["timing_setup"],
+            "timing_extraction_index_ms": self.index_ms.result(),
+            "timing_extraction_layers_ms": {name: stats.result() for name, stats in self.layer_ms.items()},
+            "field_provenance": {field: dict(counts) for field, counts in self.provenance.items()},
+            "data_completeness_pct": round(self.completeness / n, 2),
+            "correctness_pct": round(gt_sum / gt_n, 2) if gt_n else None,
+            "correctness_success_only_pct": round(gts_sum / gts_n, 2) if gts_n else None,
+            "stability_score": round(stability, 2),
+            "setup_failures": self.categories["setup"],
+            "startup_failures": self.categories["startup"],
+            "site_failures": self.categories["site"],
+            "extraction_failures": self.categories["extraction"],
+            "failure_reasons": dict(self.failure_reasons),
+        }
+
+
+class SummaryAggregator:
+    """Running summaries of every (tool, site) seen, in the order first seen.
+
+    Records must carry ``ground_truth`` (see ``extractors.validate_records``).
+    """
+
+    def __init__(self) -> None:
+        self._groups: Dict[Tuple[str, str], SiteSummary] = {}
+
+    def add(self, record: Dict[str, Any]) -> None:
+        key = (record["tool"], record["site"])
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = SiteSummary(*key)
+        group.add(record)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        return [group.summary() for group in self._groups.values()]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Append-only structured log of one attempt: ``log.jsonl`` (or ``log.jsonl.gz``) in its artifact dir.
+
+Each section a runner logs (a step's stdout, stderr or command summary, a
+cookie import, an exception) is one JSON line:
+
+    {"ts": float, "stream": "stdout" | "stderr" | "commands", "label": str, "content": str}
+
+The file is opened once per attempt and only ever appended to, so logging
+a step costs the bytes it adds, however large the log already is. Sections
+are buffered and flushed at step boundaries. Run this module on an
+artifact dir to print its log in the old ``===== label =====`` text form.
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional
+
+LOG_NAME = "log.jsonl"
+# Write buffer of a plain log (it is also flushed at every step boundary)
+BUFFER_BYTES = 1024 * 1024
+
+
+class AttemptLog:
+    """One attempt's log file, held open until ``close``."""
+
+    def __init__(self, adir: Path, compress: bool = False) -> None:
+        self.path = Path(adir) / (LOG_NAME + (".gz" if compress else ""))
+        self._fh: IO[str] = (
+            gzip.open(self.path, "at", encoding="utf-8") if compress
+            else open(self.path, "a", encoding="utf-8", buffering=BUFFER_BYTES)
+        )
+        self._lock = threading.Lock()
+
+    def write(self, stream: str, label: str, content: str) -> None:
+        line = json.dumps({"ts": round(time.time(), 3), "stream": stream, "label": label, "content": content})
+        with self._lock:
+            self._fh.write(line + "\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+_OPEN: Dict[Path, AttemptLog] = {}
+_OPEN_LOCK = threading.Lock()
+
+# Compress logs opened from now on (set from --compress-logs)
+COMPRESS = False
+
+
+def open_log(adir: Path) -> AttemptLog:
+    """The open log for an artifact dir, opening it on first use."""
+    key = Path(adir)
+    with _OPEN_LOCK:
+        log = _OPEN.get(key)
+        if log is None:
+            log = _OPEN[key] = AttemptLog(key, COMPRESS)
+        return log
+
+
+def close_log(adir: Path) -> None:
+    """Flush and close an artifact dir's log (a later write reopens it for appending)."""
+    with _OPEN_LOCK:
+        log = _OPEN.pop(Path(adir), None)
+    if log is not None:
+        log.close()
+
+
+def close_all() -> None:
+    with _OPEN_LOCK:
+        logs = list(_OPEN.values())
+        _OPEN.clear()
+    for log in logs:
+        log.close()
+
+
+def read_sections(adir: Path, stream: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Sections logged for an artifact dir, in order (plain and compressed files both read)."""
+    for path in (Path(adir) / LOG_NAME, Path(adir) / (LOG_NAME + ".gz")):
+        if not path.exists():
+            continue
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8", errors="ignore") as fh:
+            for line in fh:
+                try:
+                    section = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash mid-write
+                    continue
+                if stream is None or section.get("stream") == stream:
+                    yield section
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print an attempt's structured log as text")
+    parser.add_argument("adir", type=Path, help="Attempt artifact directory")
+    parser.add_argument("--stream", choices=["stdout", "stderr", "commands"], help="Only this stream")
+    args = parser.parse_args()
+    for section in read_sections(args.adir, args.stream):
+        content = section["content"]
+        prefix = "" if args.stream else f"[{section['stream']}] "
+        sys.stdout.write(f"\n===== {prefix}{section['label']} =====\n")
+        sys.stdout.write(content if content.endswith("\n") else f"{content}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Streaming attempt records: ``results/attempts.jsonl``, with ``summary.json`` kept current.
+
+An ``AttemptSink`` appends each finished attempt's record to
+``attempts.jsonl`` as one flushed JSON line, folds it into a
+``SummaryAggregator`` and rewrites ``summary.json``. An interrupted run
+therefore keeps every attempt it finished and an up-to-date summary, and
+no list of records is held in memory. ``close`` also writes the
+``attempts.json`` array older tooling reads, one record at a time, in
+tool/site/attempt order.
+"""
+
+import json
+import os
+import textwrap
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from aggregate import SummaryAggregator
+
+ATTEMPTS_JSONL = "attempts.jsonl"
+
+
+def iter_attempts(res: Path) -> Iterator[Dict[str, Any]]:
+    """Records in a results dir's attempts.jsonl, in the order they finished."""
+    path = Path(res) / ATTEMPTS_JSONL
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A line cut short by a crash mid-write
+                continue
+
+
+def write_json_atomic(path: Path, payload: Any) -> None:
+    """Write JSON (as json_dump does) via a temporary file, so readers never see half a file."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload, indent=2))
+    os.replace(tmp, path)
+
+
+def write_attempts_jsonl(res: Path, records: Iterable[Dict[str, Any]]) -> None:
+    """Replace a results dir's attempts.jsonl with ``records``, one per line, in the order given."""
+    path = Path(res) / ATTEMPTS_JSONL
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        for record in records:
+            fh.write(json.dumps(record) + "\n")
+    os.replace(tmp, path)
+
+
+class AttemptSink:
+    """Where one result set's records go as they finish (safe to share between chain threads).
+
+    ``extra`` keys (e.g. ``mode``) are added to every record; ``tool_order``
+    and ``site_order`` set the order of summary.json and attempts.json.
+    """
+
+    def __init__(
+        self,
+        res: Path,
+        extra: Optional[Dict[str, Any]] = None,
+        tool_order: Sequence[str] = (),
+        site_order: Sequence[str] = (),
+    ) -> None:
+        self.res = Path(res)
+        self.path = self.res / ATTEMPTS_JSONL
+        self.extra = dict(extra or {})
+        self.tool_order = list(tool_order)
+        self.site_order = list(site_order)
+        self.count = 0
+        self._aggregator = SummaryAggregator()
+        # (sort key, byte offset) of each line, for writing attempts.json in order
+        self._index: List[Tuple[Tuple[int, int, int], int]] = []
+        self._lock = threading.Lock()
+        self._fh = open(self.path, "wb")
+
+    def _order(self, record: Dict[str, Any]) -> Tuple[int, int, int]:
+        def position(order: List[str], name: str) -> int:
+            return order.index(name) if name in order else len(order)
+
+        return (position(self.tool_order, record["tool"]), position(self.site_order, record["site"]),
+                record["attempt"])
+
+    def add(self, record: Dict[str, Any]) -> None:
+        record.update(self.extra)
+        line = (json.dumps(record) + "\n").encode()
+        with self._lock:
+            self._index.append((self._order(record), self._fh.tell()))
+            self._fh.write(line)
+            self._fh.flush()
+            self._aggregator.add(record)
+            self.count += 1
+            write_json_atomic(self.res / "summary.json", self._summary())
+
+    def _summary(self) -> List[Dict[str, Any]]:
+        return sorted(self._aggregator.summary(), key=lambda s: self._order(dict(s, attempt=0)))
+
+    def summary(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._summary()
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish the result set: final summary.json and attempts.json; returns the summary."""
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+            summary = self._summary()
+            write_json_atomic(self.res / "summary.json", summary)
+            self._write_attempts_json()
+        return summary
+
+    def _write_attempts_json(self) -> None:
+        """attempts.json as json_dump would write the full list, read back from the JSONL one line at a time."""
+        out = self.res / "attempts.json"
+        tmp = out.with_name(out.name + ".tmp")
+        with open(self.path, "rb") as src, open(tmp, "w", encoding="utf-8") as dst:
+            if not self._index:
+                dst.write("[]")
+            for i, (_, offset) in enumerate(sorted(self._index)):
+                src.seek(offset)
+                record = json.loads(src.readline())
+                dst.write("[\n" if i == 0 else ",\n")
+                dst.write(textwrap.indent(json.dumps(record, indent=2), "  "))
+            if self._index:
+                dst.write("\n]")
+        os.replace(tmp, out)
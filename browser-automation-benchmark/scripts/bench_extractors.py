@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Extractor throughput benchmark on synthetic pages, with saved baselines.
+
+Builds a deterministic synthetic page per GROUND_TRUTH site at each size.
+Each page carries the site's real JSON-LD / meta / markup. The rest is
+padded with an unrelated JSON-LD graph (~10%), an inline app-state script
+(~30%) and ordinary markup (~60%). Timed per page:
+
+    index      DocumentIndex build (the one tokenizer pass the layers share)
+    json_ld / opengraph / regex
+               each layer on a prebuilt index
+    extract    the full pipeline, every layer
+    classify   classify_page on the extracted fields
+    validate   validate_ground_truth
+
+Times are the best of ``--repeat`` runs, reported with MB/s. Allocations
+(peak traced memory, and what the result still holds afterwards) come from
+one extra run under tracemalloc, so tracing doesn't skew the timings.
+
+    python3 scripts/bench_extractors.py
+    python3 scripts/bench_extractors.py --sizes 100KB 1MB --sites x reddit
+    python3 scripts/bench_extractors.py --sizes 100KB 1MB --repeat 5 --save bench/baseline.json
+    python3 scripts/bench_extractors.py --sizes 100KB 1MB --repeat 5 --baseline bench/baseline.json
+
+bench/baseline.json is committed for those sizes; timings are per machine,
+so save a fresh baseline from the unchanged tree before checking a change.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Allow running directly: python3 scripts/bench_extractors.py
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from config import CONTROL_SITES, GROUND_TRUTH, URLS
+
+from extractors import extract, validate_ground_truth
+from extractors.document import DocumentIndex
+from extractors.layers import LAYERS
+from run_benchmark import classify_page
+
+SIZES: Dict[str, int] = {
+    "100KB": 100 * 1024,
+    "1MB": 1024 * 1024,
+    "10MB": 10 * 1024 * 1024,
+    "50MB": 50 * 1024 * 1024,
+}
+
+# Share of the padding taken by each kind of filler
+NOISE_MIX = (("ld_graph", 0.10), ("app_state", 0.30), ("markup", 0.60))
+
+# Neutral vocabulary: nothing here may trip BLOCK_PAT or a site's fallback patterns
+_WORDS = (
+    "alpha bravo delta echo golf hotel india kilo lima mike oscar papa quebec romeo sierra tango "
+    "uniform victor whiskey yankee zulu orbit prism ember cobalt maple cedar harbor meadow summit "
+    "lantern quartz willow canyon glacier island jungle nectar opal ribbon saddle timber velvet"
+).split()
+
+_SITE_CONTENT: Dict[str, Dict[str, Any]] = {
+    "x": {
+        "title": 'jack on X: "just setting up my twttr" / X',
+        "meta": {
+            "og:description": "just setting up my twttr",
+            "twitter:creator": "@jack",
+            "og:url": "https://x.com/jack/status/20",
+        },
+        "ld": {
+            "@context": "https://schema.org",
+            "@type": "SocialMediaPosting",
+            "articleBody": "just setting up my twttr",
+            "author": {"@type": "Person", "name": "jack", "additionalName": "@jack"},
+            "datePublished": "2006-03-21T20:50:14.000Z",
+            "url": "https://x.com/jack/status/20",
+        },
+        "body": '<article><div data-testid="tweetText">just setting up my twttr</div>'
+                '<a href="/jack">@jack</a><time>3:50 PM - Mar 21, 2006</time></article>',
+    },
+    "reddit": {
+        "title": "Lad wrote a Python script to download Alexa voice recordings : r/Python",
+        "meta": {
+            "og:title": "Lad wrote a Python script to download Alexa voice recordings",
+            "og:url": "https://www.reddit.com/r/Python/comments/g53lxf/lad_wrote_a_python_script_to_download_alexa_voice/",
+        },
+        "ld": {
+            "@context": "https://schema.org",
+            "@type": "DiscussionForumPosting",
+            "headline": "Lad wrote a Python script to download Alexa voice recordings",
+            "author": {"@type": "Person", "name": "iEslam", "url": "https://www.reddit.com/user/iEslam"},
+            "datePublished": "2020-04-21T12:00:00+00:00",
+            "url": "https://www.reddit.com/r/Python/comments/g53lxf/lad_wrote_a_python_script_to_download_alexa_voice/",
+            "isPartOf": {"@type": "WebPage", "url": "https://www.reddit.com/r/Python/"},
+        },
+        "body": '<shreddit-post author="iEslam" subreddit-prefixed-name="r/Python" '
+                'post-title="Lad wrote a Python script to download Alexa voice recordings"></shreddit-post>',
+    },
+    "linkedin": {
+        "title": "Microsoft | LinkedIn",
+        "meta": {"og:title": "Microsoft | LinkedIn", "og:url": "https://www.linkedin.com/company/microsoft/"},
+        "ld": {
+            "@context": "https://schema.org",
+            "@type": "Organization",
+            "name": "Microsoft",
+            "address": {"@type": "PostalAddress", "addressLocality": "Redmond", "addressRegion": "Washington"},
+            "numberOfEmployees": {"@type": "QuantitativeValue", "value": 221000},
+            "url": "https://www.linkedin.com/company/microsoft/",
+        },
+        "body": "<section><h1>Microsoft</h1><p>Software Development · Redmond, Washington · 221,000 employees</p></section>",
+    },
+    "instagram": {
+        "title": "Instagram (@instagram) • Instagram photos and videos",
+        "meta": {"og:title": "Instagram (@instagram)", "og:url": "https://www.instagram.com/instagram/"},
+        "ld": {
+            "@context": "https://schema.org",
+            "@type": "ProfilePage",
+            "mainEntity": {"@type": "Person", "alternateName": "instagram", "name": "Instagram"},
+            "alternateName": "instagram",
+            "url": "https://www.instagram.com/instagram/",
+        },
+        "body": "<header><h2>instagram</h2></header>",
+    },
+    "control_local": {
+        "title": "Benchmark control page",
+        "meta": {"og:description": "This is the benchmark control page.", "og:url": "http://localhost:8000/"},
+        "ld": {
+            "@context": "https://schema.org",
+            "@type": "Article",
+            "articleBody": "This is the benchmark control page.",
+            "author": {"@type": "Person", "name": "benchmark-bot"},
+            "datePublished": "2024-01-01T00:00:00Z",
+            "url": "http://localhost:8000/",
+        },
+        "body": "<main><p>This is the benchmark control page.</p></main>",
+    },
+    "control_example": {
+        "title": "Example Domain",
+        "meta": {},
+        "ld": None,
+        "body": "<div><h1>Example Domain</h1><p>This domain is for use in illustrative examples.</p></div>",
+    },
+}
+
+
+def site_url(site: str) -> str:
+    cfg = URLS.get(site) or CONTROL_SITES.get(site) or {}
+    return cfg.get("url", "").replace("__PORT__", "8000")
+
+
+def site_expected(site: str) -> List[str]:
+    cfg = URLS.get(site) or CONTROL_SITES.get(site) or {}
+    return list(cfg.get("expected", []))
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def _filler(kind: str, rng: random.Random, size: int) -> str:
+    """About ``size`` characters of one kind of page padding."""
+    parts: List[str] = []
+    total = 0
+    n = 0
+    if kind == "ld_graph":
+        items = []
+        while total < size:
+            item = {"@type": "ListItem", "position": n, "name": _words(rng, 4), "item": f"https://example.org/c/{n}"}
+            items.append(item)
+            total += 90
+            n += 1
+        graph = {"@context": "https://schema.org", "@type": "BreadcrumbList", "itemListElement": items}
+        return f'<script type="application/ld+json">{json.dumps(graph)}</script>'
+    if kind == "app_state":
+        rows = []
+        while total < size:
+            rows.append({"id": n, "slug": f"item-{n}", "label": _words(rng, 6), "score": rng.random()})
+            total += 110
+            n += 1
+        return f"<script>window.__APP_STATE__={json.dumps({'rows': rows})};</script>"
+    while total < size:
+        chunk = (
+            f'<div class="c-{n % 97}"><span>{_words(rng, 8)}</span>'
+            f'<a href="/p/{n}">{_words(rng, 3)}</a></div>\n'
+        )
+        parts.append(chunk)
+        total += len(chunk)
+        n += 1
+    return "".join(parts)
+
+
+def make_page(site: str, size: int, seed: int = 0) -> str:
+    """Deterministic synthetic page for ``site`` of about ``size`` characters."""
+    rng = random.Random(f"{site}:{size}:{seed}")
+    if site == "control_httpbin":
+        # httpbin answers with JSON, not HTML
+        pad = {f"X-Pad-{i}": _words(rng, 6) for i in range(max(1, size // 60))}
+        headers = {"Accept": "*/*", "Host": "httpbin.org", "User-Agent": "Mozilla/5.0 (bench)", **pad}
+        return json.dumps({"headers": headers}, indent=2)
+    content = _SITE_CONTENT[site]
+    head = [f"<title>{content['title']}</title>"]
+    head += [f'<meta property="{k}" content="{v}">' for k, v in content["meta"].items()]
+    if content["ld"] is not None:
+        head.append(f'<script type="application/ld+json">{json.dumps(content["ld"])}</script>')
+    shell = len("".join(head)) + len(content["body"]) + 64
+    padding = max(0, size - shell)
+    fill = {kind: _filler(kind, rng, int(padding * share)) for kind, share in NOISE_MIX}
+    return (
+        f"<!DOCTYPE html><html><head>{''.join(head)}{fill['ld_graph']}</head>"
+        f"<body>{content['body']}{fill['markup']}{fill['app_state']}</body></html>"
+    )
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _allocations(fn: Callable[[], Any]) -> Dict[str, int]:
+    tracemalloc.start()
+    try:
+        result = fn()
+        retained, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+    return {"peak_kb": peak // 1024, "retained_kb": retained // 1024}
+
+
+def bench_page(site: str, size_label: str, repeat: int) -> Dict[str, Any]:
+    """Timings and allocations for every extraction stage on one synthetic page."""
+    text = make_page(site, SIZES[size_label])
+    url = site_url(site)
+    expected = site_expected(site)
+    mb = len(text.encode()) / (1024 * 1024)
+    index = DocumentIndex(text)
+    extracted = extract(site, text, url)
+
+    stages: Dict[str, Callable[[], Any]] = {"index": lambda: DocumentIndex(text)}
+    for name, layer, _ in LAYERS:
+        stages[name] = lambda layer=layer: layer(site, text, url, index)
+    stages["extract"] = lambda: extract(site, text, url)
+    stages["classify"] = lambda: classify_page(text, extracted, expected, site=site, final_url=url)
+    stages["validate"] = lambda: validate_ground_truth(site, extracted)
+
+    results: Dict[str, Any] = {}
+    for name, fn in stages.items():
+        seconds = _best(fn, repeat)
+        results[name] = {
+            "time_s": round(seconds, 6),
+            "mb_per_s": round(mb / seconds, 2) if seconds > 0 else None,
+            **_allocations(fn),
+        }
+    return {"site": site, "size": size_label, "mb": round(mb, 3), "stages": results}
+
+
+def compare(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Stages slower than baseline by more than ``tolerance`` (a fraction), as report lines."""
+    base = {(r["site"], r["size"]): r["stages"] for r in baseline}
+    regressions = []
+    for row in current:
+        before = base.get((row["site"], row["size"]))
+        if not before:
+            continue
+        for stage, now in row["stages"].items():
+            old = before.get(stage)
+            # Sub-millisecond stages are too noisy to gate on
+            if not old or old["time_s"] < 0.001:
+                continue
+            ratio = now["time_s"] / old["time_s"]
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{row['site']} {row['size']} {stage}: {old['time_s']:.4f}s -> {now['time_s']:.4f}s (x{ratio:.2f})"
+                )
+    return regressions
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'site':<16} {'size':>6} {'stage':<10} {'time_s':>10} {'MB/s':>9} {'peak_kb':>9} {'kept_kb':>8}")
+    for row in rows:
+        for stage, r in row["stages"].items():
+            mbps = f"{r['mb_per_s']:.1f}" if r["mb_per_s"] is not None else "-"
+            print(
+                f"{row['site']:<16} {row['size']:>6} {stage:<10} {r['time_s']:>10.4f} {mbps:>9} "
+                f"{r['peak_kb']:>9} {r['retained_kb']:>8}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark extractor throughput on synthetic pages")
+    parser.add_argument("--sites", nargs="*", choices=sorted(GROUND_TRUTH), help="Sites to benchmark (default: all)")
+    parser.add_argument("--sizes", nargs="*", choices=list(SIZES), help="Page sizes (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best is kept (default: 3)")
+    parser.add_argument("--save", type=Path, help="Write results to this file as the new baseline")
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown vs baseline as a fraction (default: 0.25)")
+    args = parser.parse_args()
+
+    sites = args.sites or sorted(GROUND_TRUTH)
+    sizes = args.sizes or list(SIZES)
+    rows = []
+    for size_label in sizes:
+        for site in sites:
+            rows.append(bench_page(site, size_label, args.repeat))
+            print(f"done {site} {size_label}", file=sys.stderr, flush=True)
+    print_table(rows)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(rows, indent=2))
+        print(f"baseline saved to {args.save}", flush=True)
+    if args.baseline:
+        regressions = compare(rows, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nno regressions beyond {args.tolerance:.0%} vs {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
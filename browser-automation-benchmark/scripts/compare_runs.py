@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Compare benchmark runs against a baseline, with significance tests; exit 1 on regression.
+
+The first run is the baseline and every later run is compared with it, per
+(result set, tool, site). The result set is the configuration directory of
+a ``--compare-*`` run, or ``.``. Each timing phase is compared over
+successful attempts:
+
+    total       duration_s
+    navigation  navigation_s
+    wait        wait_s
+    extraction  extraction_s
+    setup       setup_s
+
+For each phase the report gives both medians, a bootstrap confidence
+interval for the difference of medians (candidate - baseline), and a
+two-sided Mann-Whitney U p-value. A phase regresses when its median is
+slower by more than ``--latency-threshold``, the p-value is below
+``--alpha``, and the whole interval lies above zero. Success rate regresses
+when it drops by more than ``--success-threshold`` percentage points and a
+two-proportion z-test gives p below ``--alpha``.
+
+NumPy, when installed, vectorizes the bootstrap and the ranking. Without
+it the same statistics are computed in pure Python, which is slower, and
+the bootstrap draws different (equally valid) resamples.
+
+    python3 scripts/compare_runs.py baseline-run new-run
+    python3 scripts/compare_runs.py runs/a runs/b runs/c --latency-threshold 0.1 --json diff.json
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Allow running directly: python3 scripts/compare_runs.py
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from attempt_sink import ATTEMPTS_JSONL, iter_attempts
+from reextract import find_result_sets, resolve_run
+
+try:
+    import numpy as np
+
+    BACKEND = "numpy"
+except ImportError:
+    np = None
+    BACKEND = "python"
+
+PHASES: Dict[str, str] = {
+    "total": "duration_s",
+    "navigation": "navigation_s",
+    "wait": "wait_s",
+    "extraction": "extraction_s",
+    "setup": "setup_s",
+}
+
+# Fewer successful samples than this on either side and a phase is reported but never flagged
+MIN_SAMPLES = 3
+
+Key = Tuple[str, str, str]
+
+
+def load_records(run_dir: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """Records per result set (``.`` or a configuration name).
+
+    They come from whichever of attempts.jsonl and attempts.json was written
+    last (a re-extract rewrites attempts.json; an interrupted run only has
+    the JSONL), else from the attempts' record.json files.
+    """
+    sets: Dict[str, List[Dict[str, Any]]] = {}
+    for art in find_result_sets(run_dir):
+        res = art.parent / "results"
+        name = str(art.parent.relative_to(run_dir))
+        jsonl, array = res / ATTEMPTS_JSONL, res / "attempts.json"
+        if jsonl.exists() and (not array.exists() or jsonl.stat().st_mtime >= array.stat().st_mtime):
+            records = list(iter_attempts(res))
+        elif array.exists():
+            records = json.loads(array.read_text())
+        else:
+            records = [json.loads(p.read_text()) for p in sorted(art.glob("*/record.json"))]
+        sets[name] = records
+    return sets
+
+
+def group_samples(run_dir: Path, which: str) -> Dict[Key, Dict[str, Any]]:
+    """Attempt counts and per-phase timings of successful attempts, per (result set, tool, site)."""
+    groups: Dict[Key, Dict[str, Any]] = {}
+    for set_name, records in load_records(run_dir).items():
+        for rec in records:
+            if which != "all" and rec.get("cold") != (which == "cold"):
+                continue
+            group = groups.setdefault(
+                (set_name, rec["tool"], rec["site"]),
+                {"attempts": 0, "success": 0, "phases": {phase: [] for phase in PHASES}},
+            )
+            group["attempts"] += 1
+            if rec.get("outcome") != "success":
+                continue
+            group["success"] += 1
+            for phase, field in PHASES.items():
+                if rec.get(field) is not None:
+                    group["phases"][phase].append(float(rec[field]))
+    return groups
+
+
+def _average_ranks(values: Sequence[float]) -> Tuple[List[float], List[int]]:
+    """1-based ranks with ties averaged, and the size of each group of ties."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties: List[int] = []
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        ties.append(j - i + 1)
+        i = j + 1
+    return ranks, ties
+
+
+def mann_whitney(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float]:
+    """U statistic of ``a`` and the two-sided p-value (normal approximation, tie and continuity corrected)."""
+    n1, n2 = len(a), len(b)
+    if np is not None:
+        _, inverse, counts = np.unique(np.concatenate([a, b]), return_inverse=True, return_counts=True)
+        starts = np.cumsum(counts) - counts
+        ranks = (starts + (counts + 1) / 2)[inverse]
+        rank_sum = float(ranks[:n1].sum())
+        tie_term = float((counts ** 3 - counts).sum())
+    else:
+        ranks, ties = _average_ranks(list(a) + list(b))
+        rank_sum = sum(ranks[:n1])
+        tie_term = float(sum(t ** 3 - t for t in ties))
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    var = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var <= 0:
+        return u, 1.0
+    z = max(abs(u - mean) - 0.5, 0) / math.sqrt(var)
+    return u, math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_median_diff(
+    a: Sequence[float], b: Sequence[float], n_boot: int, confidence: float, seed: int
+) -> Tuple[float, float]:
+    """Percentile bootstrap interval for ``median(b) - median(a)``."""
+    tail = (1 - confidence) / 2
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        xa, xb = np.asarray(a), np.asarray(b)
+        diffs = (np.median(xb[rng.integers(0, len(xb), (n_boot, len(xb)))], axis=1)
+                 - np.median(xa[rng.integers(0, len(xa), (n_boot, len(xa)))], axis=1))
+        low, high = np.quantile(diffs, [tail, 1 - tail])
+        return float(low), float(high)
+    rnd = random.Random(seed)
+    diffs = sorted(
+        statistics.median(rnd.choices(b, k=len(b))) - statistics.median(rnd.choices(a, k=len(a)))
+        for _ in range(n_boot)
+    )
+    # Same linear interpolation as numpy.quantile's default
+    def at(q: float) -> float:
+        pos = q * (len(diffs) - 1)
+        lo = math.floor(pos)
+        hi = min(lo + 1, len(diffs) - 1)
+        return diffs[lo] + (diffs[hi] - diffs[lo]) * (pos - lo)
+
+    return at(tail), at(1 - tail)
+
+
+def two_proportion_p(s1: int, n1: int, s2: int, n2: int) -> float:
+    """Two-sided p-value of a two-proportion z-test (pooled)."""
+    pooled = (s1 + s2) / (n1 + n2)
+    var = pooled * (1 - pooled) * (1 / n1 + 1 / n2)
+    if var <= 0:
+        return 1.0
+    z = abs(s2 / n2 - s1 / n1) / math.sqrt(var)
+    return math.erfc(z / math.sqrt(2))
+
+
+def compare_groups(
+    base: Dict[str, Any], cand: Dict[str, Any], args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Success-rate and per-phase comparison of one (result set, tool, site)."""
+    base_pct = 100 * base["success"] / base["attempts"]
+    cand_pct = 100 * cand["success"] / cand["attempts"]
+    success_p = two_proportion_p(base["success"], base["attempts"], cand["success"], cand["attempts"])
+    row: Dict[str, Any] = {
+        "success_pct": [round(base_pct, 2), round(cand_pct, 2)],
+        "success_diff_pct": round(cand_pct - base_pct, 2),
+        "success_p": round(success_p, 4),
+        "success_regression": base_pct - cand_pct > args.success_threshold and success_p < args.alpha,
+        "phases": {},
+    }
+    for phase in PHASES:
+        a, b = base["phases"][phase], cand["phases"][phase]
+        if not a or not b:
+            continue
+        med_a, med_b = statistics.median(a), statistics.median(b)
+        entry: Dict[str, Any] = {
+            "n": [len(a), len(b)],
+            "median_s": [round(med_a, 3), round(med_b, 3)],
+            "median_ratio": round(med_b / med_a, 3) if med_a > 0 else None,
+            "regression": False,
+        }
+        if len(a) >= MIN_SAMPLES and len(b) >= MIN_SAMPLES:
+            _, p = mann_whitney(a, b)
+            low, high = bootstrap_median_diff(a, b, args.bootstrap, args.confidence, args.seed)
+            entry.update(p=round(p, 4), ci_s=[round(low, 3), round(high, 3)])
+            entry["regression"] = (
+                med_b > med_a * (1 + args.latency_threshold) and p < args.alpha and low > 0
+            )
+        row["phases"][phase] = entry
+    return row
+
+
+def compare_runs(baseline: Path, candidate: Path, args: argparse.Namespace) -> Dict[Key, Dict[str, Any]]:
+    base_groups = group_samples(baseline, args.attempt_kind)
+    cand_groups = group_samples(candidate, args.attempt_kind)
+    return {
+        key: compare_groups(base_groups[key], cand_groups[key], args)
+        for key in sorted(base_groups.keys() & cand_groups.keys())
+    }
+
+
+def print_report(name: str, rows: Dict[Key, Dict[str, Any]]) -> List[str]:
+    """Print one candidate's comparison table; returns its regressions as report lines."""
+    print(f"\n== {name} ==")
+    print(f"{'set':<20} {'tool':<16} {'site':<16} {'phase':<11} {'base':>8} {'new':>8} {'ratio':>6} "
+          f"{'95% CI diff':>17} {'p':>7}")
+    regressions = []
+    for (set_name, tool, site), row in rows.items():
+        label = f"{set_name:<20} {tool:<16} {site:<16}"
+        base_pct, cand_pct = row["success_pct"]
+        flag = "  REGRESSION" if row["success_regression"] else ""
+        print(f"{label} {'success %':<11} {base_pct:>8.1f} {cand_pct:>8.1f} {'':>6} {'':>17} "
+              f"{row['success_p']:>7.3f}{flag}")
+        if row["success_regression"]:
+            regressions.append(f"{set_name} {tool} {site} success: {base_pct:.1f}% -> {cand_pct:.1f}%")
+        for phase, entry in row["phases"].items():
+            med_a, med_b = entry["median_s"]
+            ratio = f"x{entry['median_ratio']:.2f}" if entry["median_ratio"] is not None else "-"
+            ci = f"[{entry['ci_s'][0]:+.3f}, {entry['ci_s'][1]:+.3f}]" if "ci_s" in entry else "-"
+            p = f"{entry['p']:.3f}" if "p" in entry else "-"
+            flag = "  REGRESSION" if entry["regression"] else ""
+            print(f"{label} {phase:<11} {med_a:>8.3f} {med_b:>8.3f} {ratio:>6} {ci:>17} {p:>7}{flag}")
+            if entry["regression"]:
+                regressions.append(f"{set_name} {tool} {site} {phase}: {med_a:.3f}s -> {med_b:.3f}s ({ratio})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare benchmark runs against a baseline; exit 1 on regression")
+    parser.add_argument("runs", nargs="+", help="Run names under runs/ or paths; the first is the baseline")
+    parser.add_argument("--latency-threshold", type=float, default=0.10,
+                        help="Median slowdown that counts as a regression, as a fraction (default: 0.10)")
+    parser.add_argument("--success-threshold", type=float, default=10.0,
+                        help="Success-rate drop that counts as a regression, in percentage points (default: 10)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level (default: 0.05)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="Bootstrap confidence level (default: 0.95)")
+    parser.add_argument("--bootstrap", type=int, default=10000, help="Bootstrap resamples (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="Bootstrap random seed (default: 0)")
+    parser.add_argument("--attempt-kind", choices=["all", "cold", "warm"], default="all",
+                        help="Which attempts to compare (default: all)")
+    parser.add_argument("--json", type=Path, help="Also write the comparison to this file")
+    args = parser.parse_args()
+    if len(args.runs) < 2:
+        parser.error("need a baseline run and at least one run to compare")
+
+    baseline = resolve_run(args.runs[0])
+    print(f"baseline: {baseline} (statistics backend: {BACKEND})")
+    report: Dict[str, Any] = {"baseline": str(baseline), "runs": {}}
+    regressions: List[str] = []
+    for name in args.runs[1:]:
+        candidate = resolve_run(name)
+        rows = compare_runs(baseline, candidate, args)
+        regressions += [f"{candidate.name}: {line}" for line in print_report(str(candidate), rows)]
+        report["runs"][str(candidate)] = [
+            {"set": key[0], "tool": key[1], "site": key[2], **row} for key, row in rows.items()
+        ]
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(dict(report, regressions=regressions), indent=2))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
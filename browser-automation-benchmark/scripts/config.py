@@ -12,41 +12,52 @@ CAMOUFOX_BIN = Path.home() / ".cache" / "camoufox" / "camoufox-bin"
 PROFILES = BASE / ".profiles"
 COOKIES_DIR = BASE / "cookies"
 CONTROL_PAGE_DIR = BASE / "scripts" / "control_page"
+# Extraction reports keyed by page hash + extractor version (created on first write)
+EXTRACT_CACHE_DIR = BASE / ".cache" / "extract"
+# Per-page extraction time budget in seconds (safe matching mode); fields cut off are recorded as missing
+EXTRACT_BUDGET_S = 5.0
 
 for d in (RUNS_DIR, AB_SOCKET_DIR, RUNTIME_DIR, PROFILES):
     d.mkdir(parents=True, exist_ok=True)
 
 # ── Target sites ──────────────────────────────────────────────────────────
+# "ready": what adaptive readiness (readiness.py) waits for before capturing:
+# any of "selectors" matching, or with "json_ld" any JSON-LD block
 URLS: Dict[str, Dict[str, Any]] = {
     "x": {
         "page_type": "post",
         "url": "https://x.com/jack/status/20",
         "expected": ["post_text", "author_handle", "timestamp", "canonical_url"],
         "warmup_url": "https://x.com",
+        "ready": {"selectors": ['article [data-testid="tweetText"]']},
     },
     "reddit": {
         "page_type": "post",
         "url": "https://www.reddit.com/r/Python/comments/g53lxf/lad_wrote_a_python_script_to_download_alexa_voice/",
         "expected": ["post_title", "subreddit", "author", "canonical_url"],
         "warmup_url": "https://www.reddit.com",
+        "ready": {"selectors": ["shreddit-post"], "json_ld": True},
     },
     "linkedin": {
         "page_type": "company",
         "url": "https://www.linkedin.com/company/microsoft/",
         "expected": ["title_or_company", "location", "page_url", "key_metadata"],
         "warmup_url": "https://www.linkedin.com",
+        "ready": {"selectors": [], "json_ld": True},
     },
     "instagram": {
         "page_type": "profile",
         "url": "https://www.instagram.com/instagram/",
         "expected": ["username", "canonical_url"],
         "warmup_url": "https://www.instagram.com",
+        "ready": {"selectors": ['meta[property="og:title"]'], "json_ld": True},
     },
     "control_example": {
         "page_type": "control",
         "url": "https://example.com",
         "expected": ["title"],
         "warmup_url": None,
+        "ready": {"selectors": ["h1"]},
     },
 }
 
@@ -106,8 +117,9 @@ BLOCK_PAT = re.compile(
     re.I,
 )
 
-# Reddit-specific content-unavailable pattern (deleted/removed posts, not anti-bot)
-FORBIDDEN_PAT = re.compile(r"shreddit-forbidden", re.I)
+# Reddit-specific content-unavailable marker (deleted/removed posts, not anti-bot)
+FORBIDDEN_MARKER = "shreddit-forbidden"
+FORBIDDEN_PAT = re.compile(re.escape(FORBIDDEN_MARKER), re.I)
 
 # Soft-block indicators (page loaded but content degraded)
 SOFT_BLOCK_INDICATORS: Dict[str, Dict[str, Any]] = {
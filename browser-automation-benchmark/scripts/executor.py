@@ -0,0 +1,78 @@
+"""Run (tool, site) attempt chains concurrently under global, per-tool and per-site limits.
+
+A chain is every attempt of one tool on one site, run in order (cold
+first, then warm), so warm attempts still inherit the state the earlier
+ones left behind. Different chains run side by side: each attempt takes a
+slot of its site, a slot of its tool and a global slot, always in that
+order, so no two attempts can wait on each other's slots. The global slot
+comes last, so a chain waiting for a busy site or tool never holds one
+that a chain for another site could be using.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class ConcurrencyLimits:
+    """Caps on attempts running at once: overall, per tool and per site (None = no cap).
+
+    ``workers`` of 0 means one per CPU core.
+    """
+
+    def __init__(self, workers: int = 1, per_tool: Optional[int] = None, per_site: Optional[int] = None) -> None:
+        if workers < 0 or (per_tool is not None and per_tool < 1) or (per_site is not None and per_site < 1):
+            raise ValueError("concurrency limits must be positive (workers may be 0 for one per core)")
+        self.workers = workers or os.cpu_count() or 1
+        self.per_tool = per_tool
+        self.per_site = per_site
+        self._global = threading.Semaphore(self.workers)
+        self._tools: Dict[str, threading.Semaphore] = {}
+        self._sites: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def sequential(self) -> bool:
+        return self.workers == 1
+
+    def _semaphore(self, table: Dict[str, threading.Semaphore], key: str, cap: int) -> threading.Semaphore:
+        with self._lock:
+            if key not in table:
+                table[key] = threading.Semaphore(cap)
+            return table[key]
+
+    @contextmanager
+    def slot(self, tool: str, site: str) -> Iterator[None]:
+        """Hold one ``site``, one ``tool`` and one global slot for the duration of an attempt."""
+        held = []
+        if self.per_site is not None:
+            held.append(self._semaphore(self._sites, site, self.per_site))
+        if self.per_tool is not None:
+            held.append(self._semaphore(self._tools, tool, self.per_tool))
+        held.append(self._global)
+        for sem in held:
+            sem.acquire()
+        try:
+            yield
+        finally:
+            for sem in reversed(held):
+                sem.release()
+
+
+def run_chains(chains: Sequence[Callable[[], List[T]]], limits: ConcurrencyLimits) -> List[T]:
+    """Run every chain and concatenate their results in chain order.
+
+    Sequentially in the calling thread when only one attempt may run at a
+    time; otherwise each chain gets a thread and the attempts inside it
+    take slots from ``limits``. An exception from a chain is raised once
+    every chain has finished.
+    """
+    if limits.sequential or len(chains) <= 1:
+        return [item for chain in chains for item in chain()]
+    with ThreadPoolExecutor(max_workers=len(chains), thread_name_prefix="chain") as pool:
+        futures = [pool.submit(chain) for chain in chains]
+    return [item for future in futures for item in future.result()]
@@ -1,73 +1,155 @@
-"""Layered extraction: JSON-LD → Open Graph → regex fallback."""
+"""Layered extraction: JSON-LD → Open Graph → embedded app state → regex fallback."""
 
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Iterable, List, Optional, Union
 
+from .budget import SAFE_WINDOW, Budget
+from .cache import ExtractCache, cache_key
+from .document import DocumentIndex
+from .app_state import extract_app_state
 from .json_ld import extract_json_ld
+from .layers import LAYERS, can_fill
 from .opengraph import extract_opengraph
+from .pagebytes import Buffer, map_page
 from .regex_fallback import extract_regex
-from config import GROUND_TRUTH
+from .stream import StreamingExtractor, extract_stream
+from .timing import LayerTrace
+from .validation import validate_ground_truth, validate_records
 
 
-def extract(site: str, text: str, url: str) -> Dict[str, str]:
-    """Extract structured data using a layered approach.
+def extract_report(
+    site: str,
+    text: Union[str, Buffer],
+    url: str,
+    expected: Optional[Iterable[str]] = None,
+    budget_s: Optional[float] = None,
+    profile: bool = False,
+) -> Dict[str, Any]:
+    """Run the extraction layers and report which of them actually ran.
 
-    1. JSON-LD (structured, tool-agnostic)
-    2. Open Graph meta tags (fallback)
-    3. Site-specific regex (last resort)
+    With ``expected`` given, a layer is skipped when none of the expected
+    fields it can produce are still missing, so a page whose JSON-LD already
+    covers every expected field never reaches the Open Graph or regex layers.
+    Without it every layer runs, as ``extract`` always has.
 
-    Returns dict of field_name -> value for the site.
+    With ``budget_s`` (safe mode) extraction stops trying new layers and
+    fallback patterns once that many seconds have passed, and the page is
+    only tokenized and searched within its first ``budget.SAFE_WINDOW``
+    characters, tokenizing stopping at the deadline too. Fields left empty
+    because of the budget are listed in ``missing`` with the reason.
+
+    ``text`` may be the raw bytes of a capture, typically ``map_page``'s
+    mmap of ``page.html``, instead of its decoded text: the page is then
+    tokenized as bytes, only the tokens kept are decoded, and the full page
+    is decoded only if a fallback pattern has to search a non-ASCII page.
+    The report is the same as for the text ``read_text`` returns.
+
+    ``provenance`` names the layer that supplied each field. With
+    ``profile`` the report also carries where the time went: milliseconds
+    spent tokenizing the page, and per layer its milliseconds, characters
+    examined and per-pattern search times.
+
+    Returns:
+        {"fields": {field_name: value}, "layers_run": [layer_name, ...],
+         "missing": {field_name: reason}, "provenance": {field_name: layer_name},
+         "profile": {"index_ms": float, "index_chars": int,
+                     "layers": {layer_name: {"ms", "chars", "searches"}}}  # profile only
+        }
     """
-    # Layer 1: JSON-LD
-    fields = extract_json_ld(site, text, url)
+    wanted = list(expected) if expected is not None else None
+    fields: Dict[str, str] = {}
+    provenance: Dict[str, str] = {}
+    layers_run: List[str] = []
+    index: Optional[DocumentIndex] = None
+    budget = Budget(budget_s) if budget_s is not None else None
+    traces: Dict[str, LayerTrace] = {}
+    index_ms = 0.0
+
+    for name, layer, producible in LAYERS:
+        if not can_fill(site, fields, wanted, producible):
+            continue
+        if index is None:
+            started = time.perf_counter()
+            index = DocumentIndex(text, budget)
+            index_ms = (time.perf_counter() - started) * 1000
+        # Checked after the index too: tokenizing a large page can use up the budget
+        if budget is not None and budget.expired:
+            budget.cut(k for k in producible.get(site, ()) if not fields.get(k))
+            continue
+        layers_run.append(name)
+        trace = LayerTrace() if profile else None
+        decoded = index.decoded_chars
+        found = layer(site, text, url, index, budget, trace)
+        if trace is not None:
+            trace.chars += index.decoded_chars - decoded
+            trace.stop()
+            traces[name] = trace
+        for k, v in found.items():
+            if not fields.get(k):
+                fields[k] = v
+                provenance[k] = name
+
+    missing: Dict[str, str] = {}
+    if budget is not None:
+        missing = {
+            k: reason for k, reason in budget.missing.items()
+            if not fields.get(k) and (wanted is None or k in wanted)
+        }
+    report: Dict[str, Any] = {
+        "fields": fields, "layers_run": layers_run, "missing": missing, "provenance": provenance,
+    }
+    if profile:
+        report["profile"] = {
+            "index_ms": round(index_ms, 3),
+            "index_chars": len(text) if index is not None else 0,
+            "layers": {name: trace.as_dict() for name, trace in traces.items()},
+        }
+    return report
 
-    # Layer 2: Open Graph (fill gaps)
-    og = extract_opengraph(site, text, url)
-    for k, v in og.items():
-        if not fields.get(k):
-            fields[k] = v
 
-    # Layer 3: Regex fallback (fill remaining gaps)
-    rx = extract_regex(site, text, url)
-    for k, v in rx.items():
-        if not fields.get(k):
-            fields[k] = v
+def cached_extract_report(
+    site: str,
+    text: Union[str, Buffer],
+    url: str,
+    expected: Optional[Iterable[str]] = None,
+    cache: Optional[ExtractCache] = None,
+    budget_s: Optional[float] = None,
+    profile: bool = False,
+) -> Dict[str, Any]:
+    """``extract_report`` through an on-disk cache, plus ``"cached": bool``.
 
-    return fields
+    Identical page content for the same site, URL and expected fields is
+    extracted once per extractor version; later calls read the stored
+    report. Reports cut short by the time budget depend on machine load, so
+    they are not stored, and neither is a profile: a cache hit has no
+    ``profile``, since no extraction time was spent. Without a cache this
+    is ``extract_report``.
+    """
+    wanted = list(expected) if expected is not None else None
+    if cache is None:
+        return dict(extract_report(site, text, url, wanted, budget_s, profile), cached=False)
+    key = cache_key(site, text, url, wanted, SAFE_WINDOW if budget_s is not None else None)
+    report = cache.get(key)
+    if report is not None:
+        return dict(report, cached=True)
+    report = extract_report(site, text, url, wanted, budget_s, profile)
+    if not report["missing"]:
+        cache.put(key, {k: v for k, v in report.items() if k != "profile"})
+    return dict(report, cached=False)
 
 
-def validate_ground_truth(site: str, extracted: Dict[str, str]) -> Dict[str, Any]:
-    """Validate extracted values against known ground truth.
+def extract(site: str, text: str, url: str, expected: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Extract structured data using a layered approach.
 
-    Returns:
-        {
-            "checks": {field: {"expected": ..., "actual": ..., "pass": bool}},
-            "correctness_pct": float,
-        }
+    1. JSON-LD (structured, tool-agnostic)
+    2. Open Graph meta tags (fallback)
+    3. Embedded app-state JSON (window.__INITIAL_STATE__ and the like)
+    4. Site-specific regex (last resort)
+
+    Each layer only fills gaps left by the ones before it. All layers read
+    from one DocumentIndex, so the page is tokenized once. Passing the
+    site's expected fields lets layers that cannot add any of them be skipped.
+
+    Returns dict of field_name -> value for the site.
     """
-    truth = GROUND_TRUTH.get(site, {})
-    if not truth:
-        return {"checks": {}, "correctness_pct": None}
-
-    checks = {}
-    for key, expected_val in truth.items():
-        if key.endswith("_contains"):
-            field = key[: -len("_contains")]
-            actual = extracted.get(field, "")
-            passed = expected_val.lower() in actual.lower() if actual else False
-            checks[key] = {"expected": expected_val, "actual": actual[:200], "pass": passed}
-        elif key.endswith("_present"):
-            field = key[: -len("_present")]
-            actual = extracted.get(field, "")
-            passed = bool(actual)
-            checks[key] = {"expected": "non-empty", "actual": bool(actual), "pass": passed}
-        else:
-            actual = extracted.get(key, "")
-            passed = expected_val.lower() == actual.lower() if actual else False
-            checks[key] = {"expected": expected_val, "actual": actual[:200], "pass": passed}
-
-    total = len(checks)
-    passed = sum(1 for c in checks.values() if c["pass"])
-    return {
-        "checks": checks,
-        "correctness_pct": round(100 * passed / total, 2) if total else None,
-    }
+    return extract_report(site, text, url, expected)["fields"]
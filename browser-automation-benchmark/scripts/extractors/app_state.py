@@ -0,0 +1,32 @@
+"""Extract data from JSON application state embedded in the page (window.__INITIAL_STATE__, __NEXT_DATA__, ...)."""
+
+from typing import Dict, Optional, Union
+
+from .budget import Budget
+from .document import DocumentIndex
+from .pagebytes import Buffer
+from .registry import REGISTRY, Context, layer_fields
+from .timing import LayerTrace
+
+# site -> fields the app-state rules can produce (used to skip the layer when none are missing)
+FIELDS = layer_fields("app_state")
+
+
+def extract_app_state(
+    site: str,
+    text: Union[str, Buffer],
+    url: str,
+    index: Optional[DocumentIndex] = None,
+    budget: Optional[Budget] = None,
+    trace: Optional[LayerTrace] = None,
+) -> Dict[str, str]:
+    """Extract site-specific fields from embedded state objects, per the site's rules in rules.py.
+
+    Each rule group names a marker; only the JSON object right after its
+    first occurrence is sliced out and decoded.
+    """
+    rules = REGISTRY.get(site)
+    if not text or rules is None or not rules.app_state:
+        return {}
+
+    return rules.apply_app_state(Context(index or DocumentIndex(), text, url, budget, trace=trace))
@@ -0,0 +1,44 @@
+"""Wall-clock budget and search window for one page's extraction (safe matching mode)."""
+
+import time
+from typing import Dict, Iterable, Optional
+
+# Default allowance per page when the runners extract in safe mode
+BUDGET_S = 5.0
+# The document index and text patterns only cover this many leading characters of the page
+SAFE_WINDOW = 8 * 1024 * 1024
+
+TIME_BUDGET_REASON = "time-budget-exceeded"
+
+
+class Budget:
+    """Deadline shared by every layer of one extraction.
+
+    Python's ``re`` can't be interrupted mid-search, so the budget is checked
+    between the tokens of the document index, before each layer and before
+    each fallback pattern. Every fallback pattern is linear-time and
+    searches at most ``window`` characters, so a single search has a size
+    bound. The worst case is therefore the
+    budget plus one bounded search.
+    Fields left unfilled because their sources were never tried are
+    recorded in ``missing`` with a reason.
+    """
+
+    def __init__(self, seconds: float = BUDGET_S, window: Optional[int] = SAFE_WINDOW) -> None:
+        self.seconds = seconds
+        self.window = window
+        self.deadline = time.perf_counter() + seconds
+        self.missing: Dict[str, str] = {}
+
+    @property
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.deadline
+
+    def endpos(self, text: str) -> int:
+        """Search bound for ``text``."""
+        return len(text) if self.window is None else min(len(text), self.window)
+
+    def cut(self, fields: Iterable[str], reason: str = TIME_BUDGET_REASON) -> None:
+        """Note fields whose remaining sources were skipped."""
+        for name in fields:
+            self.missing.setdefault(name, reason)
@@ -0,0 +1,127 @@
+"""On-disk cache of extraction reports, keyed by page content and extractor version."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from .pagebytes import Buffer, decode, is_plain
+from config import EXTRACT_CACHE_DIR
+
+# Evict down to this fraction of the size bound, so eviction doesn't run on every write
+_EVICT_TO = 0.8
+MAX_BYTES = 256 * 1024 * 1024
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+_version: Optional[str] = None
+
+
+def extractor_version() -> str:
+    """Hash of the extractor package's sources; any code or rule change gives a new version."""
+    global _version
+    if _version is None:
+        digest = hashlib.sha256()
+        for path in sorted(_PACKAGE_DIR.glob("*.py")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+        _version = digest.hexdigest()[:16]
+    return _version
+
+
+def cache_key(
+    site: str,
+    text: Union[str, Buffer],
+    url: str,
+    expected: Optional[Iterable[str]] = None,
+    window: Optional[int] = None,
+) -> str:
+    """sha256 over the page content, site, final URL, expected fields, safe-mode window and extractor version.
+
+    The page is hashed as UTF-8 of its decoded text (``pagebytes.decode``,
+    which is what ``read_text(errors="ignore")`` returns), so the text the
+    runners extract and the raw capture reextract maps give the same key.
+    Plain raw pages are that already and are hashed without decoding.
+    """
+    digest = hashlib.sha256()
+    if isinstance(text, str):
+        data: Buffer = text.encode("utf-8", "surrogatepass")
+    else:
+        data = text if is_plain(text) else decode(text).encode("utf-8", "surrogatepass")
+    digest.update(hashlib.sha256(data or b"").digest())
+    exp = "\x1f".join(expected) if expected is not None else "\x00"
+    for part in (site, url or "", exp, str(window), extractor_version()):
+        digest.update(b"\x1e" + part.encode())
+    return digest.hexdigest()
+
+
+class ExtractCache:
+    """Extraction reports stored as one JSON file each under ``root``.
+
+    Reads refresh a file's mtime, so evicting oldest-mtime first is LRU.
+    Writes go through a temp file and ``os.replace``, so concurrent runs and
+    reextract's worker processes can share one directory. After every
+    ``max_bytes * (1 - _EVICT_TO)`` bytes written the directory is checked
+    and, when over ``max_bytes``, trimmed to ``_EVICT_TO`` of it.
+    """
+
+    def __init__(self, root: Path = EXTRACT_CACHE_DIR, max_bytes: int = MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._written = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            report = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return report
+
+    def put(self, key: str, report: Dict[str, Any]) -> None:
+        path = self._path(key)
+        data = json.dumps(report)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        self._written += len(data)
+        if self._written >= self.max_bytes * (1 - _EVICT_TO):
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache is under the bound; returns files removed."""
+        self._written = 0
+        entries = []
+        total = 0
+        for path in self.root.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        target = self.max_bytes * _EVICT_TO
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
@@ -0,0 +1,294 @@
+"""Single-pass document index shared by all extraction layers."""
+
+import re
+from typing import AbstractSet, Any, Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+from .budget import Budget
+from .jsonlib import loads
+from .pagebytes import Buffer, bytes_pattern, decode
+
+# Token openers. Each token's end is then found with plain searches for ">"
+# or its close tag, memoized per scan (see _Scan), so however malformed the
+# page, every character is looked at a bounded number of times. A single
+# regex with "(?P<title>.*?)</title>" in it rescans to the end of the page
+# for every opener that is never closed, which is quadratic.
+_OPEN_PAT = re.compile(r"<(?:(?P<ld>script)|(?P<meta>meta\s)|(?P<title>title)|(?P<shreddit>shreddit-post))", re.I)
+# After </head> only JSON-LD and <shreddit-post> are indexed: meta and <title>
+# belong to the head, and the body is usually most of the page
+_BODY_OPEN_PAT = re.compile(r"<(?:(?P<ld>script)|(?P<shreddit>shreddit-post))", re.I)
+_HEAD_END_PAT = re.compile(r"</head\s*>", re.I)
+_LD_TYPE_PAT = re.compile(r'type=["\']application/ld\+json["\']', re.I)
+_LD_CLOSE_PAT = re.compile(r"</script>", re.I)
+_TITLE_CLOSE_PAT = re.compile(r"</title>", re.I)
+# The rest of a <meta> tag up to its ">". Quoted values may hold anything; an
+# unquoted "<" starts another tag, so the attempt stops there instead of
+# running on to some ">" further down the page
+_META_REST_PAT = re.compile(r'(?:[^<>"\']|"[^"]*"|\'[^\']*\')*>')
+_GT_PAT = re.compile(r">")
+# A <meta> tag cut off by the end of the buffer (possibly inside a quoted value)
+_META_CUT_PAT = re.compile(r'(?:[^<>"\']|"[^"]*"|\'[^\']*\')*(?:"[^"]*|\'[^\']*)?')
+
+# The same patterns over raw page bytes (every token is delimited by ASCII
+# markup, so they find the same tokens; only the kept spans are decoded)
+_BYTES_PATTERNS = {
+    pat: bytes_pattern(pat)
+    for pat in (_OPEN_PAT, _BODY_OPEN_PAT, _HEAD_END_PAT, _LD_TYPE_PAT, _LD_CLOSE_PAT, _TITLE_CLOSE_PAT,
+                _META_REST_PAT, _GT_PAT)
+}
+
+# Attribute orders inside a single <meta> tag (property/name before content and vice versa)
+_META_KEY_FIRST = re.compile(
+    r'(?:property|name)=["\']([^"\']+)["\'][^>]*?content=["\']([^"\']*)["\']',
+    re.I | re.S,
+)
+_META_CONTENT_FIRST = re.compile(
+    r'content=["\']([^"\']*)["\'][^>]*?(?:property|name)=["\']([^"\']+)["\']',
+    re.I | re.S,
+)
+
+# Longest opener prefix that can be split across two chunks ("<shreddit-pos")
+_SPLIT_OPENER = 16
+
+# An "@type" value (string or array) containing a backslash escape
+_LD_TYPE_ESCAPED_PAT = re.compile(r'"@type"\s*:\s*(?:"[^"\\]*\\|\[[^\]\\]*\\)')
+
+
+class DocumentIndex:
+    """Tokens pulled from one linear scan of a page.
+
+    Build it from a whole page with ``DocumentIndex(text)``, or start empty
+    and ``feed()`` chunks as they are read; either way each character is
+    tokenized once (a token cut by a chunk boundary is rescanned with the
+    next chunk). ``DocumentIndex(data)`` with the raw bytes of a capture
+    (e.g. an mmap of ``page.html``) scans the bytes and decodes only the
+    tokens it keeps; offsets are then byte offsets.
+
+    Meta tags and <title> are only read from the head: once ``</head>`` is
+    seen, the rest of the page is scanned for JSON-LD and <shreddit-post>
+    alone. A page without ``</head>`` is treated as all head.
+
+    With a ``budget`` (safe mode) only the first ``budget.window``
+    characters are tokenized, and tokenizing stops at the budget's
+    deadline; the index then holds the tokens found before it.
+
+    Attributes:
+        text: the original page text or bytes (empty when built from chunks)
+        json_ld: raw bodies of <script type="application/ld+json"> blocks
+        meta: lowercased meta property/name -> content (head only)
+        title: inner text of the first <title> in the head, or None
+        shreddit_posts: (offset, tag) for every <shreddit-post ...> opening tag
+        head_end: offset of ``</head>``, or None while it hasn't been seen
+        decoded_chars: characters of JSON-LD decoded so far
+    """
+
+    def __init__(self, text: Union[str, Buffer] = "", budget: Optional[Budget] = None) -> None:
+        self.text = text or ""
+        self.json_ld: List[str] = []
+        self.meta: Dict[str, str] = {}
+        self.title: Optional[str] = None
+        self.shreddit_posts: List[Tuple[int, str]] = []
+        self.head_end: Optional[int] = None
+        self._blocks: Optional[List[Dict[str, Any]]] = None
+        self._decoded: Dict[int, List[Any]] = {}
+        self.decoded_chars = 0
+        self._pending = ""
+        self._offset = 0
+        if self.text:
+            self._consume(self.text, 0, budget)
+
+    def _consume(self, buf: Union[str, Buffer], base: int, budget: Optional[Budget] = None) -> int:
+        """Index every complete token in buf; return the end of the last one."""
+        end = 0
+        start = 0
+        scan = _Scan(buf, budget)
+        stop = len(buf) if budget is None else budget.endpos(buf)
+        if self.head_end is None:
+            close = scan.pattern(_HEAD_END_PAT).search(buf, 0, stop)
+            head_stop = close.start() if close else stop
+            for kind, at, value, end in scan.tokens(_OPEN_PAT, 0, head_stop):
+                self._take(kind, value, base + at)
+            if close is None:
+                return end
+            self.head_end = base + close.start()
+            start = end = close.end()
+        for kind, at, value, end in scan.tokens(_BODY_OPEN_PAT, start, stop):
+            self._take(kind, value, base + at)
+        return end
+
+    def _take(self, kind: str, value: Any, offset: int) -> None:
+        if not isinstance(value, str):
+            value = decode(value)
+        if kind == "ld":
+            self.json_ld.append(value)
+            self._blocks = None
+        elif kind == "meta":
+            tag = "<" + value
+            m = _META_KEY_FIRST.search(tag)
+            if m:
+                # Property-before-content tags win (last one on the page)
+                self.meta[m.group(1).lower()] = m.group(2)
+            m = _META_CONTENT_FIRST.search(tag)
+            if m:
+                # Reversed-order tags only fill gaps (first one on the page)
+                self.meta.setdefault(m.group(2).lower(), m.group(1))
+        elif kind == "title":
+            if self.title is None:
+                self.title = value
+        elif kind == "shreddit":
+            self.shreddit_posts.append((offset, "<" + value))
+
+    def feed(self, chunk: str, window: int) -> None:
+        """Index the complete tokens in the next chunk of a page.
+
+        Text after the last complete token is carried over only when it may
+        start a token still being read. A single token longer than ``window``
+        characters is dropped, so memory stays bounded by the window.
+        """
+        buf = self._pending + chunk
+        base = self._offset
+        cut = _resume_point(buf, self._consume(buf, base), self.head_end is not None)
+        if len(buf) - cut > window:
+            cut = len(buf) - _SPLIT_OPENER
+        self._pending = buf[cut:]
+        self._offset = base + cut
+
+    @property
+    def json_ld_blocks(self) -> List[Dict[str, Any]]:
+        """Decoded JSON-LD blocks (lists flattened), parsed once on first use."""
+        if self._blocks is None:
+            self._blocks = self.json_ld_blocks_for(None)
+        return self._blocks
+
+    def json_ld_blocks_for(self, types: Optional[AbstractSet[str]]) -> List[Dict[str, Any]]:
+        """Decoded JSON-LD blocks that may have an ``@type`` in ``types`` (None = all blocks).
+
+        A raw block is decoded only when one of the ``@type`` values written
+        anywhere in it is wanted, so large graphs of unrelated types
+        (breadcrumbs, product lists) are never parsed. Each block is decoded
+        at most once however many times this is called.
+        """
+        blocks: List[Dict[str, Any]] = []
+        for i, raw in enumerate(self.json_ld):
+            if types is not None and i not in self._decoded and not _may_have_type(raw, types):
+                continue
+            blocks.extend(self._decode(i, raw))
+        return blocks
+
+    def _decode(self, i: int, raw: str) -> List[Any]:
+        decoded = self._decoded.get(i)
+        if decoded is None:
+            self.decoded_chars += len(raw)
+            try:
+                data = loads(raw)
+            except ValueError:
+                data = []
+            decoded = self._decoded[i] = data if isinstance(data, list) else [data]
+        return decoded
+
+    @property
+    def html_title(self) -> str:
+        return (self.title or "").strip()
+
+
+def _may_have_type(raw: str, types: AbstractSet[str]) -> bool:
+    """Whether a raw JSON-LD block could hold an @type in ``types``, without decoding it.
+
+    True when a wanted type name appears as a JSON string anywhere in the
+    block, or when some @type value is written with escapes and can't be
+    read literally. Only false positives are possible, and those just cost
+    a decode.
+    """
+    if any(f'"{t}"' in raw for t in types):
+        return True
+    return _LD_TYPE_ESCAPED_PAT.search(raw) is not None
+
+
+class _Scan:
+    """Linear tokenizer over one buffer (text or bytes).
+
+    ``find`` remembers, per pattern, where its last search started and what
+    it found, so searching again from anywhere up to that match is free and
+    a close tag known to be missing is never looked for again. Since token
+    starts only move forward, each pattern is searched across the buffer at
+    most once per pass. With a budget, ``tokens`` stops at its deadline.
+    """
+
+    __slots__ = ("buf", "binary", "budget", "_last")
+
+    def __init__(self, buf: Union[str, Buffer], budget: Optional[Budget] = None) -> None:
+        self.buf = buf
+        self.binary = not isinstance(buf, str)
+        self.budget = budget
+        self._last: Dict[Pattern[str], Tuple[int, int, int]] = {}
+
+    def pattern(self, pat: Pattern[str]) -> Pattern[Any]:
+        return _BYTES_PATTERNS[pat] if self.binary else pat
+
+    def find(self, pat: Pattern[str], pos: int, endpos: Optional[int] = None) -> int:
+        """Start of the first match of ``pat`` in [pos, endpos), or -1."""
+        endpos = len(self.buf) if endpos is None else endpos
+        last = self._last.get(pat)
+        if last is not None and last[0] <= pos:
+            _, searched, at = last
+            if 0 <= at and pos <= at:
+                return at if at < endpos else -1
+            if at < 0 and endpos <= searched:
+                return -1
+        m = self.pattern(pat).search(self.buf, pos, endpos)
+        at = m.start() if m else -1
+        self._last[pat] = (pos, endpos, at)
+        return at
+
+    def tokens(self, opener: Pattern[str], pos: int, endpos: int) -> Iterator[Tuple[str, int, Any, int]]:
+        """(kind, start, value, end) of each complete token within [pos, endpos), in order."""
+        open_pat = self.pattern(opener)
+        while self.budget is None or not self.budget.expired:
+            m = open_pat.search(self.buf, pos, endpos)
+            if m is None:
+                return
+            kind = m.lastgroup
+            span = self._span(kind, m.start(), m.end(), endpos)
+            if span is None:
+                pos = m.start() + 1
+                continue
+            value_start, value_end, pos = span
+            yield kind, m.start(), self.buf[value_start:value_end], pos
+
+    def _span(self, kind: str, start: int, after: int, endpos: int) -> Optional[Tuple[int, int, int]]:
+        """(value start, value end, token end) of the token opened at ``start``, if it is complete."""
+        if kind == "meta":
+            rest = self.pattern(_META_REST_PAT).match(self.buf, after, endpos)
+            return (start + 1, rest.end(), rest.end()) if rest else None
+        gt = self.find(_GT_PAT, after)
+        if gt < 0 or gt >= endpos:
+            return None
+        if kind == "shreddit":
+            return start + 1, gt + 1, gt + 1
+        if kind == "ld":
+            if self.find(_LD_TYPE_PAT, after, gt) < 0:
+                return None
+            close_pat, close_len = _LD_CLOSE_PAT, len("</script>")
+        else:
+            close_pat, close_len = _TITLE_CLOSE_PAT, len("</title>")
+        close = self.find(close_pat, gt + 1)
+        if close < 0 or close + close_len > endpos:
+            return None
+        return gt + 1, close, close + close_len
+
+
+def _resume_point(buf: str, start: int, in_body: bool = False) -> int:
+    """Offset of the earliest token after ``start`` that is not complete yet."""
+    scan = _Scan(buf)
+    for m in (_BODY_OPEN_PAT if in_body else _OPEN_PAT).finditer(buf, start):
+        close = scan.find(_GT_PAT, m.end())
+        if close < 0:
+            return m.start()
+        # A complete <meta>/<shreddit-post> tag would already have matched, unless
+        # the ">" found is inside a <meta>'s quoted value that the buffer cuts off;
+        # a <title> or JSON-LD <script> that didn't is waiting for its close tag.
+        if m.lastgroup == "meta" and _META_CUT_PAT.fullmatch(buf, m.end()):
+            return m.start()
+        if m.lastgroup == "title" or (m.lastgroup == "ld" and scan.find(_LD_TYPE_PAT, m.end(), close) >= 0):
+            return m.start()
+    lt = buf.rfind("<", max(start, len(buf) - _SPLIT_OPENER))
+    return lt if lt >= 0 else len(buf)
@@ -0,0 +1,35 @@
+"""JSON decoding for the extractors: orjson or ujson when installed, else the stdlib."""
+
+import json
+from typing import Any, Callable, Optional
+
+_fast_loads: Optional[Callable[[str], Any]]
+try:
+    import orjson
+
+    _fast_loads = orjson.loads
+    BACKEND = "orjson"
+except ImportError:
+    try:
+        import ujson
+
+        _fast_loads = ujson.loads
+        BACKEND = "ujson"
+    except ImportError:
+        _fast_loads = None
+        BACKEND = "json"
+
+
+def loads(raw: str) -> Any:
+    """Decode a JSON document; raises ValueError when it isn't valid JSON.
+
+    Input the fast backend rejects is retried with the stdlib, which also
+    accepts NaN/Infinity and lone surrogates, so results never depend on
+    which backend is installed.
+    """
+    if _fast_loads is not None:
+        try:
+            return _fast_loads(raw)
+        except ValueError:
+            pass
+    return json.loads(raw)
@@ -0,0 +1,91 @@
+"""Locate and decode one embedded JSON object in a page without parsing anything around it."""
+
+import re
+from typing import Any, Optional, Tuple, Union
+
+from .jsonlib import loads
+from .pagebytes import Buffer, bytes_pattern, decode
+
+# Characters after a marker searched for the object's opening "{"
+# (covers "= " and the rest of a <script ...> tag)
+OPEN_WINDOW = 512
+
+# Nesting depth the single-regex match handles; deeper objects are walked brace by brace
+NESTED_DEPTH = 32
+
+_STRING = r'"(?:[^"\\]++|\\.)*+"'
+
+
+def _nested_pattern(depth: int) -> str:
+    """A balanced ``{...}`` nested at most ``depth`` deep; braces inside strings don't count.
+
+    Every repeat is possessive, so the match is linear: string bodies and
+    runs of other characters are consumed once and never backtracked into.
+    """
+    pattern = r"\{(?:[^{}\"]++|" + _STRING + r")*+\}"
+    for _ in range(depth - 1):
+        pattern = r"\{(?:[^{}\"]++|" + _STRING + "|" + pattern + r")*+\}"
+    return pattern
+
+
+_OBJECT_PAT = re.compile(_nested_pattern(NESTED_DEPTH), re.S)
+_OBJECT_PAT_B = bytes_pattern(_OBJECT_PAT)
+
+# Everything up to the next brace outside a string literal (for the brace walk)
+_SKIP_PAT = re.compile(r"(?:[^{}\"]++|" + _STRING + r")*+", re.S)
+_SKIP_PAT_B = bytes_pattern(_SKIP_PAT)
+
+
+def object_span(text: Union[str, Buffer], start: int) -> Optional[Tuple[int, int]]:
+    """(start, end) of the balanced ``{...}`` opening at ``start``.
+
+    Only braces outside JSON string literals count. None when the object
+    is not closed before the end of text.
+    """
+    binary = not isinstance(text, str)
+    m = (_OBJECT_PAT_B if binary else _OBJECT_PAT).match(text, start)
+    if m:
+        return start, m.end()
+    # Unclosed, or nested deeper than NESTED_DEPTH
+    skip = (_SKIP_PAT_B if binary else _SKIP_PAT).match
+    depth = 0
+    pos = start
+    while True:
+        pos = skip(text, pos).end()
+        brace = text[pos:pos + 1]
+        if brace in ("{", b"{"):
+            depth += 1
+        elif brace in ("}", b"}"):
+            depth -= 1
+        else:
+            # End of text, or an unterminated string literal
+            return None
+        pos += 1
+        if depth == 0:
+            return start, pos
+
+
+def load_object(text: Union[str, Buffer], marker: str) -> Tuple[Any, int]:
+    """The JSON object that follows the first ``marker`` in ``text``, and the characters decoded for it.
+
+    Only the object's own span is decoded (raw bytes included). The value
+    is None when the marker is absent, no ``{`` follows it within
+    ``OPEN_WINDOW`` characters, or the object is unclosed or not JSON.
+    """
+    binary = not isinstance(text, str)
+    needle = marker.encode() if binary else marker
+    at = text.find(needle)
+    if at < 0:
+        return None, 0
+    after = at + len(needle)
+    start = text.find(b"{" if binary else "{", after, after + OPEN_WINDOW)
+    span = object_span(text, start) if start >= 0 else None
+    if span is None:
+        return None, 0
+    blob = text[span[0]:span[1]]
+    if not isinstance(blob, str):
+        blob = decode(blob)
+    try:
+        return loads(blob), len(blob)
+    except ValueError:
+        return None, len(blob)
@@ -0,0 +1,29 @@
+"""Extraction layers in priority order, and when each one is worth running."""
+
+from typing import Dict, List, Optional, Tuple
+
+from . import app_state, json_ld, opengraph, regex_fallback
+
+# (name, extractor, site -> producible fields), in priority order
+LAYERS = [
+    ("json_ld", json_ld.extract_json_ld, json_ld.FIELDS),
+    ("opengraph", opengraph.extract_opengraph, opengraph.FIELDS),
+    ("app_state", app_state.extract_app_state, app_state.FIELDS),
+    ("regex", regex_fallback.extract_regex, regex_fallback.FIELDS),
+]
+
+
+def can_fill(
+    site: str,
+    fields: Dict[str, str],
+    expected: Optional[List[str]],
+    producible: Dict[str, Tuple[str, ...]],
+) -> bool:
+    """Whether a layer could add a still-missing expected field.
+
+    Always true without an expected-field list, so every layer runs.
+    """
+    if expected is None:
+        return True
+    site_fields = producible.get(site, ())
+    return any(k in site_fields for k in expected if not fields.get(k))
@@ -0,0 +1,65 @@
+"""Captured pages as raw bytes: mmap a file and decode only the spans that are used.
+
+Decoding here reproduces ``Path.read_text(errors="ignore")``: UTF-8 with
+undecodable bytes dropped and ``\\r\\n`` / ``\\r`` turned into ``\\n``, so a
+value decoded from the bytes equals the same value taken from the text.
+"""
+
+import mmap
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Pattern, Union
+
+# Raw page content: bytes, or a read-only mmap of the capture file
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+# is_plain() checks this many bytes at a time (bytes.isascii is a fast word
+# scan; a regex character class over the whole page is several times slower)
+_PLAIN_CHUNK = 1024 * 1024
+
+
+def decode(data: Buffer) -> str:
+    """``data`` as ``read_text(errors="ignore")`` would have returned it."""
+    text = str(data, "utf-8", "ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def decode_head(data: Buffer, chars: int) -> str:
+    """The first ``chars`` characters of ``decode(data)``, decoding only as much as that needs."""
+    size = chars * 4 + 1
+    while True:
+        head = decode(data[:size])
+        if len(head) > chars or size >= len(data):
+            return head[:chars]
+        size *= 2
+
+
+def is_plain(data: Buffer) -> bool:
+    """True for ASCII without ``\\r``, where ``decode`` is the identity on offsets.
+
+    On such a page a bytes pattern finds exactly what the same pattern
+    finds in the decoded text, at the same offsets.
+    """
+    for start in range(0, len(data), _PLAIN_CHUNK):
+        chunk = data[start:start + _PLAIN_CHUNK]
+        if not chunk.isascii() or b"\r" in chunk:
+            return False
+    return True
+
+
+def bytes_pattern(pattern: Pattern[str]) -> Pattern[bytes]:
+    """The same regex over bytes; ``pattern`` must be ASCII."""
+    return re.compile(pattern.pattern.encode("ascii"), pattern.flags & ~re.UNICODE)
+
+
+@contextmanager
+def map_page(path: Path) -> Iterator[Buffer]:
+    """Read-only mmap of a capture file; ``b""`` when it is missing or empty."""
+    if not path.exists() or path.stat().st_size == 0:
+        yield b""
+        return
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        yield data
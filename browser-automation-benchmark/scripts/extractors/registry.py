@@ -0,0 +1,444 @@
+"""Compile SITE_RULES once at import into matcher objects used by the layers."""
+
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Tuple, Union
+
+from .budget import Budget
+from .document import DocumentIndex
+from .jsonlib import loads
+from .jsonslice import load_object
+from .pagebytes import Buffer, bytes_pattern, decode, is_plain
+from .rules import SITE_RULES
+from .scanner import FirstMatchScanner
+from .timing import LayerTrace
+
+LAYER_KEYS = ("json_ld", "meta", "app_state", "regex")
+
+# Characters searched after an anchor when a rule gives no "window"
+ANCHOR_WINDOW = 64 * 1024
+
+
+class Context:
+    """What a source can read from: the page index, raw text, URL, current JSON-LD block or app state.
+
+    ``budget`` (safe mode) bounds how long and how far text patterns search.
+    When ``text`` is one segment of a longer page (streaming), ``offset`` is
+    where it starts and ``anchors`` carries anchor positions found in
+    earlier segments; both are in page coordinates. ``trace`` (profiling)
+    counts the characters and time text patterns spend.
+
+    ``text`` may be a page's raw bytes (an mmap of the capture): see
+    ``Context.text`` for how text patterns then search it.
+    """
+
+    __slots__ = ("index", "url", "budget", "offset", "anchors", "trace", "block", "_raw", "_text", "_body",
+                 "_states")
+
+    def __init__(
+        self,
+        index: DocumentIndex,
+        text: Union[str, Buffer] = "",
+        url: str = "",
+        budget: Optional[Budget] = None,
+        offset: int = 0,
+        anchors: Optional[Dict[str, int]] = None,
+        trace: Optional[LayerTrace] = None,
+    ) -> None:
+        self.index = index
+        self._raw = text
+        self._text: Union[str, Buffer, None] = None
+        self.url = url or ""
+        self.budget = budget
+        self.offset = offset
+        self.anchors: Dict[str, int] = {} if anchors is None else anchors
+        self.trace = trace
+        self.block: Any = None
+        self._body: Any = None
+        self._states: Dict[str, Any] = {}
+
+    @property
+    def text(self) -> Union[str, Buffer]:
+        """The page as text patterns search it.
+
+        Raw bytes are searched in place when they are plain (ASCII without
+        ``\r``): there bytes patterns match exactly what str patterns match
+        in the decoded text, at the same offsets. Any other raw page is
+        decoded once, on first use.
+        """
+        if self._text is None:
+            raw = self._raw
+            self._text = raw if isinstance(raw, str) or is_plain(raw) else decode(raw)
+        return self._text
+
+    @property
+    def decoded(self) -> str:
+        """The page as a str."""
+        text = self.text
+        return text if isinstance(text, str) else decode(text)
+
+    @property
+    def body(self) -> Any:
+        """The page text parsed as JSON (None when it isn't JSON)."""
+        if self._body is None:
+            text = self.decoded
+            if self.trace is not None:
+                self.trace.chars += len(text)
+            try:
+                self._body = loads(text)
+            except ValueError:
+                self._body = False
+        return self._body or None
+
+    def state(self, marker: str) -> Any:
+        """The JSON object that follows ``marker`` in the page (None when absent or not JSON).
+
+        Only the object's own span is decoded, once per marker.
+        """
+        if marker not in self._states:
+            value, chars = load_object(self._raw, marker)
+            if self.trace is not None:
+                self.trace.chars += chars
+            self._states[marker] = value
+        return self._states[marker]
+
+    def anchor_at(self, anchor: str) -> Optional[int]:
+        """Page offset of the first occurrence of ``anchor`` (None when not seen yet)."""
+        at = self.anchors.get(anchor)
+        if at is None:
+            text = self.text
+            pos = text.find(anchor if isinstance(text, str) else anchor.encode())
+            if pos >= 0:
+                at = self.anchors[anchor] = self.offset + pos
+        return at
+
+    def region(self, source: "Source") -> Optional[Tuple[int, int]]:
+        """(start, stop) of ``text`` a text source searches; None when there is nothing to search yet."""
+        start, stop = 0, len(self.text)
+        if self.budget is not None:
+            stop = self.budget.endpos(self.text)
+        if source.anchor is not None:
+            at = self.anchor_at(source.anchor)
+            if at is None:
+                return None
+            start = max(start, at - self.offset)
+            stop = min(stop, at + (source.window or ANCHOR_WINDOW) - self.offset)
+        elif source.window is not None:
+            stop = min(stop, source.window - self.offset)
+        return (start, stop) if start < stop else None
+
+
+def _walk(obj: Any, keys: Tuple[str, ...]) -> str:
+    """Traverse nested dicts/lists (lists step into their first item) to a scalar.
+
+    A ``"*"`` key tries every value of a dict (or item of a list) in order
+    and takes the first that yields a value for the rest of the path.
+    """
+    for i, key in enumerate(keys):
+        if key == "*":
+            items = obj.values() if isinstance(obj, dict) else obj if isinstance(obj, list) else ()
+            return next((value for value in (_walk(item, keys[i + 1:]) for item in items) if value), "")
+        if isinstance(obj, list):
+            obj = obj[0] if obj else None
+        obj = obj.get(key, "") if isinstance(obj, dict) else ""
+    if not obj or isinstance(obj, (dict, list)):
+        return ""
+    return str(obj)
+
+
+def _first_group(m: Optional["re.Match[Any]"]) -> str:
+    if not m:
+        return ""
+    value = m.group(1) if m.re.groups else m.group(0)
+    return value if value is None or isinstance(value, str) else decode(value)
+
+
+class Source:
+    """One place a field value can come from, plus its post-processing."""
+
+    __slots__ = ("kind", "arg", "pattern", "bpattern", "lstrip", "max_len", "format", "anchor", "window",
+                 "if_url")
+
+    def __init__(self, spec: Any) -> None:
+        if isinstance(spec, tuple):
+            spec = {"path": spec}
+        elif isinstance(spec, str):
+            spec = {"meta": spec}
+        kinds = [k for k in ("path", "meta", "title", "url", "tag", "json") if k in spec]
+        if len(kinds) > 1 or (not kinds and "pattern" not in spec):
+            raise ValueError(f"extraction rule source needs exactly one location: {spec!r}")
+        self.kind = kinds[0] if kinds else "text"
+        self.arg = spec.get(self.kind)
+        pattern = spec.get("pattern")
+        self.pattern: Optional[Pattern[str]] = re.compile(pattern, spec.get("flags", 0)) if pattern else None
+        # Page-text patterns also search raw page bytes (ASCII patterns only)
+        self.bpattern: Optional[Pattern[bytes]] = (
+            bytes_pattern(self.pattern)
+            if self.kind == "text" and self.pattern is not None and self.pattern.pattern.isascii() else None
+        )
+        self.lstrip: Optional[str] = spec.get("lstrip")
+        self.max_len: Optional[int] = spec.get("max_len")
+        self.format: Optional[str] = spec.get("format")
+        self.anchor: Optional[str] = spec.get("anchor")
+        self.window: Optional[int] = spec.get("window")
+        if (self.anchor is not None or self.window is not None) and self.kind != "text":
+            raise ValueError(f"anchor/window only apply to page-text patterns: {spec!r}")
+        self.if_url: Optional[str] = spec.get("if_url")
+        if self.if_url is not None and self.kind == "text":
+            raise ValueError(f"if_url doesn't apply to page-text patterns: {spec!r}")
+
+    def resolve(self, ctx: Context) -> str:
+        """Value for this source; text patterns normally go through FieldRules' scanner instead."""
+        if self.kind == "text":
+            region = ctx.region(self)
+            if region is None:
+                return ""
+            text, pattern = ctx.text, self.pattern
+            if not isinstance(text, str):
+                if self.bpattern is None:
+                    text = ctx.decoded
+                else:
+                    pattern = self.bpattern
+            return self.finish(_first_group(pattern.search(text, *region)))
+        return self.finish(self._locate(ctx))
+
+    def _locate(self, ctx: Context) -> str:
+        if self.if_url is not None and self.if_url not in ctx.url:
+            return ""
+        kind = self.kind
+        if kind == "tag":
+            # Indexed tags only; the pattern (if any) is searched per tag in document order
+            tags = [tag for _, tag in ctx.index.shreddit_posts]
+            if self.pattern is None:
+                return tags[0] if tags else ""
+            return next((_first_group(m) for m in map(self.pattern.search, tags) if m), "")
+        if kind == "path":
+            value = _walk(ctx.block, self.arg)
+        elif kind == "meta":
+            value = ctx.index.meta.get(self.arg, "")
+        elif kind == "title":
+            value = ctx.index.html_title
+        elif kind == "url":
+            value = ctx.url if self.arg in ctx.url else ""
+        else:
+            value = _walk(ctx.body, self.arg)
+        if value and self.pattern is not None:
+            value = _first_group(self.pattern.search(value))
+        return value
+
+    def finish(self, value: str) -> str:
+        """Apply lstrip / max_len / format to a located value."""
+        if not value:
+            return ""
+        if self.lstrip is not None:
+            value = value.lstrip(self.lstrip)
+        if self.max_len is not None:
+            value = value[: self.max_len]
+        if self.format is not None:
+            value = self.format.format(value)
+        return value
+
+
+class FieldRules:
+    """field -> ordered sources; first non-empty value per field wins.
+
+    Text-pattern sources of all fields share one FirstMatchScanner; each is
+    searched only up to its first hit, and only while no higher-priority
+    source of its field has produced a value.
+    """
+
+    def __init__(self, fields: Dict[str, List[Any]]) -> None:
+        self.fields: List[Tuple[str, List[Source]]] = [
+            (name, [Source(spec) for spec in specs]) for name, specs in fields.items()
+        ]
+        self.names: Tuple[str, ...] = tuple(name for name, _ in self.fields)
+        # scanner pattern index <-> (field position, source rank)
+        self._slots: Dict[Tuple[int, int], int] = {}
+        self._owners: List[Tuple[int, int]] = []
+        for fpos, (_, sources) in enumerate(self.fields):
+            for rank, source in enumerate(sources):
+                if source.kind == "text":
+                    self._slots[(fpos, rank)] = len(self._owners)
+                    self._owners.append((fpos, rank))
+        self.scanner = (
+            FirstMatchScanner(self.fields[f][1][r].pattern for f, r in self._owners) if self._owners else None
+        )
+        bpatterns = [self.fields[f][1][r].bpattern for f, r in self._owners]
+        # The same patterns over raw page bytes, when every one of them has a bytes form
+        self.bscanner = (
+            FirstMatchScanner(bpatterns) if self._owners and all(p is not None for p in bpatterns) else None
+        )
+
+    def _source(self, slot: int) -> Source:
+        fpos, rank = self._owners[slot]
+        return self.fields[fpos][1][rank]
+
+    def _value(self, ctx: Context, fpos: int, rank: int, hits: Dict[int, str]) -> str:
+        source = self.fields[fpos][1][rank]
+        if source.kind == "text":
+            return source.finish(hits.get(self._slots[(fpos, rank)], ""))
+        return source.resolve(ctx)
+
+    def scan(self, ctx: Context, out: Dict[str, str], hits: Optional[Dict[int, str]] = None,
+             final: bool = True) -> Dict[int, str]:
+        """First hits of the text patterns that could still decide a field missing from ``out``.
+
+        ``hits`` from earlier chunks of the same page are extended in place.
+        """
+        hits = {} if hits is None else hits
+        if self.scanner is None or not ctx.text:
+            return hits
+        wanted = []
+        for fpos, (name, sources) in enumerate(self.fields):
+            if out.get(name):
+                continue
+            for rank, source in enumerate(sources):
+                if source.kind != "text":
+                    if source.resolve(ctx):
+                        break
+                    continue
+                slot = self._slots[(fpos, rank)]
+                if slot not in hits:
+                    wanted.append(slot)
+                elif source.finish(hits[slot]):
+                    break
+
+        def settled(slot: int, value: str) -> List[int]:
+            fpos, rank = self._owners[slot]
+            if not self.fields[fpos][1][rank].finish(value):
+                return []
+            return [s for s, (f, r) in enumerate(self._owners) if f == fpos and r > rank]
+
+        searched = None
+        trace = ctx.trace
+        if trace is not None:
+            def searched(slot: int, chars: int, seconds: float) -> None:
+                fpos, rank = self._owners[slot]
+                trace.search(f"{self.fields[fpos][0]}[{rank}]", chars, seconds)
+
+        regions = {slot: ctx.region(self._source(slot)) for slot in wanted}
+        budget = ctx.budget
+        unsearched: List[int] = []
+        text, scanner = ctx.text, self.scanner
+        if not isinstance(text, str):
+            if self.bscanner is None:
+                text = ctx.decoded
+            else:
+                scanner = self.bscanner
+        hits.update(scanner.scan(
+            text, wanted, settled, final,
+            regions=regions,
+            deadline=budget.deadline if budget is not None else None,
+            unsearched=unsearched,
+            on_search=searched,
+        ))
+        if budget is not None:
+            budget.cut(self.fields[self._owners[slot][0]][0] for slot in unsearched)
+        return hits
+
+    def apply(self, ctx: Context, out: Dict[str, str], hits: Optional[Dict[int, str]] = None) -> None:
+        if hits is None:
+            hits = self.scan(ctx, out)
+        for fpos, (name, sources) in enumerate(self.fields):
+            if out.get(name):
+                continue
+            for rank in range(len(sources)):
+                value = self._value(ctx, fpos, rank, hits)
+                if value:
+                    out[name] = value
+                    break
+
+
+class JsonLdGroup:
+    """Field rules applied to every JSON-LD block whose @type is in ``types`` (None = any)."""
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        types = spec.get("types")
+        self.types = frozenset(types) if types is not None else None
+        self.rules = FieldRules(spec["fields"])
+
+    def matches(self, block: Any) -> bool:
+        if not isinstance(block, dict):
+            return False
+        if self.types is None:
+            return True
+        schema_type = block.get("@type", "")
+        if isinstance(schema_type, list):
+            return any(t in self.types for t in schema_type if isinstance(t, str))
+        return isinstance(schema_type, str) and schema_type in self.types
+
+
+class AppStateGroup:
+    """Field rules applied to the embedded JSON state object that follows ``marker``."""
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.marker: str = spec["marker"]
+        self.rules = FieldRules(spec["fields"])
+
+
+class SiteRules:
+    """All layers' compiled rules for one site."""
+
+    def __init__(self, site: str, spec: Dict[str, Any]) -> None:
+        unknown = set(spec) - set(LAYER_KEYS)
+        if unknown:
+            raise ValueError(f"unknown extraction layer(s) for {site}: {sorted(unknown)}")
+        self.site = site
+        self.json_ld = [JsonLdGroup(group) for group in spec.get("json_ld", [])]
+        # @type values any group can use; None when some group takes every type
+        self.json_ld_types: Optional[FrozenSet[str]] = (
+            None if any(g.types is None for g in self.json_ld)
+            else frozenset(t for g in self.json_ld for t in g.types)
+        )
+        self.meta = FieldRules(spec.get("meta", {}))
+        self.app_state = [AppStateGroup(group) for group in spec.get("app_state", [])]
+        self.regex = FieldRules(spec.get("regex", {}))
+
+    def layer_fields(self, layer: str) -> Tuple[str, ...]:
+        if layer in ("json_ld", "app_state"):
+            groups = getattr(self, layer)
+            return tuple(dict.fromkeys(name for group in groups for name in group.rules.names))
+        return getattr(self, layer).names
+
+    def apply_json_ld(self, ctx: Context) -> Dict[str, str]:
+        """Earlier groups win; within a group the first matching block with a value wins.
+
+        Blocks with no @type any group uses are not decoded at all.
+        """
+        out: Dict[str, str] = {}
+        blocks = ctx.index.json_ld_blocks_for(self.json_ld_types)
+        for group in self.json_ld:
+            for block in blocks:
+                if group.matches(block):
+                    ctx.block = block
+                    group.rules.apply(ctx, out)
+        ctx.block = None
+        return out
+
+    def apply_meta(self, ctx: Context) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        self.meta.apply(ctx, out)
+        return out
+
+    def apply_app_state(self, ctx: Context) -> Dict[str, str]:
+        """Earlier groups win; a group whose marker is missing or not followed by JSON is skipped."""
+        out: Dict[str, str] = {}
+        for group in self.app_state:
+            state = ctx.state(group.marker)
+            if state is not None:
+                ctx.block = state
+                group.rules.apply(ctx, out)
+        ctx.block = None
+        return out
+
+    def apply_regex(self, ctx: Context, hits: Optional[Dict[int, str]] = None) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        self.regex.apply(ctx, out, hits)
+        return out
+
+
+REGISTRY: Dict[str, SiteRules] = {site: SiteRules(site, spec) for site, spec in SITE_RULES.items()}
+
+
+def layer_fields(layer: str) -> Dict[str, Tuple[str, ...]]:
+    """site -> fields a layer can produce, for skipping layers in extract()."""
+    return {site: rules.layer_fields(layer) for site, rules in REGISTRY.items() if rules.layer_fields(layer)}
@@ -0,0 +1,263 @@
+"""Per-site extraction rules, one entry per site in config.URLS / CONTROL_SITES.
+
+Adding a site means adding an entry here; registry.py compiles everything
+once at import. Each layer maps field -> list of sources tried in order,
+first non-empty value wins.
+
+Sources:
+    ("a", "b")                      key path into the current JSON-LD block or app-state
+                                    object (lists step into their first item; "*" tries
+                                    each value/item in order, first with a value wins)
+    "og:title"                      meta property/name
+    {"title": True}                 stripped <title> text
+    {"url": "x.com"}                page URL when it contains the substring ("" = always)
+    {"pattern": r"...", "flags": re.I}
+                                    first match in the page text (group 1, or whole match)
+    {"tag": "shreddit-post"}        first indexed <shreddit-post> tag
+    {"json": ("a", "b")}            key path into the page body parsed as JSON
+
+App-state groups ("app_state" layer, between meta and regex) are
+{"marker": literal, "fields": {...}}: the JSON object right after the first
+occurrence of the marker (e.g. "window.__INITIAL_STATE__",
+'<script id="__NEXT_DATA__"', "window.__APOLLO_STATE__") is sliced out and
+decoded, and the fields' key paths read from it. A marker missing from the
+page, or followed by something that isn't JSON, skips its group.
+
+Modifiers on any dict source ({"path": (...)} is the dict form of a JSON-LD path):
+    "pattern" (on non-text sources)  keep the first match within the value
+    "lstrip"                         characters stripped from the left
+    "max_len"                        truncate
+    "format"                         str.format template applied last
+    "if_url": "x.com"                (not on page-text patterns) empty unless the page URL
+                                     contains the substring
+
+Search windows, on page-text patterns only:
+    "anchor": "<shreddit-post"       search from the first occurrence of this literal
+                                     (the pattern is skipped when the page lacks it)
+    "window": 20000                  characters searched, from the anchor or else the
+                                     page start (default after an anchor: 64K)
+"""
+
+import re
+from typing import Any, Dict
+
+_R_SUB = r"r/([A-Za-z0-9_]+)"
+_R_TIMESTAMP = r"(?<!\d)\d+\s+(?:hours?|days?|minutes?)\s+ago|\d{4}-\d{2}-\d{2}T[^\s\"]+"
+# Pages without a <shreddit-post> (older layouts) fall back to searching this much from the start
+_R_PAGE_WINDOW = 1024 * 1024
+_X_TITLE_TEXT = r':\s*["“](.+?)["”]\s*/\s*X'
+_X_TITLE_AUTHOR = r"^(\w+)\s+on\s+X:"
+
+SITE_RULES: Dict[str, Dict[str, Any]] = {
+    "x": {
+        "json_ld": [
+            {
+                # Twitter/X uses SocialMediaPosting or Article
+                "types": ("SocialMediaPosting", "Article", "NewsArticle", "BlogPosting"),
+                "fields": {
+                    "post_text": [("articleBody",), ("text",)],
+                    "author_handle": [
+                        {"path": ("author", "additionalName"), "lstrip": "@"},
+                        {"path": ("author", "name"), "lstrip": "@"},
+                    ],
+                    "timestamp": [("datePublished",), ("dateCreated",)],
+                    "canonical_url": [("url",)],
+                },
+            },
+            {"types": ("WebPage",), "fields": {"canonical_url": [("url",)]}},
+        ],
+        "meta": {
+            # og:description, else the <title> pattern: 'author on X: "tweet text" / X'
+            "post_text": ["og:description", "twitter:description", {"title": True, "pattern": _X_TITLE_TEXT}],
+            "author_handle": [
+                {"meta": "twitter:creator", "lstrip": "@"},
+                {"title": True, "pattern": _X_TITLE_AUTHOR},
+            ],
+            # Only for x.com URLs, og:url included
+            "canonical_url": [{"meta": "og:url", "if_url": "x.com"}, {"url": "x.com"}],
+        },
+        "app_state": [
+            {
+                "marker": "window.__INITIAL_STATE__",
+                "fields": {
+                    "post_text": [
+                        ("entities", "tweets", "entities", "*", "full_text"),
+                        ("entities", "tweets", "entities", "*", "text"),
+                    ],
+                    "author_handle": [("entities", "users", "entities", "*", "screen_name")],
+                    "timestamp": [("entities", "tweets", "entities", "*", "created_at")],
+                },
+            },
+        ],
+        "regex": {
+            # JSON blob first, then <title> pattern, then a free-text line near an @mention
+            "post_text": [
+                {"pattern": r'"text":"([^"]{10,280})"'},
+                {"title": True, "pattern": _X_TITLE_TEXT},
+                {"pattern": r"\n(.{20,280})\n.*?@"},
+            ],
+            "author_handle": [
+                {"title": True, "pattern": _X_TITLE_AUTHOR, "flags": re.I},
+                {"pattern": r"@([A-Za-z0-9_]{1,15})"},
+            ],
+            # "3:50 PM · Mar 21, 2006": the gap to the year is bounded so a long line of clock
+            # times without a year can't make the search quadratic
+            "timestamp": [{"pattern": r"\d{1,2}:\d{2}\s?(?:AM|PM)?.{0,40}?\d{4}|\d{4}-\d{2}-\d{2}T[^\s\"]+"}],
+            "canonical_url": [{"url": "x.com"}],
+        },
+    },
+    "reddit": {
+        "json_ld": [
+            {
+                "types": ("DiscussionForumPosting", "Article", "SocialMediaPosting", "Comment"),
+                "fields": {
+                    "post_title": [("headline",), ("name",)],
+                    "post_body": [
+                        {"path": ("articleBody",), "max_len": 300},
+                        {"path": ("text",), "max_len": 300},
+                    ],
+                    "author": [
+                        {"path": ("author", "name"), "lstrip": "u/"},
+                        {"path": ("author", "url"), "pattern": r"([^/]*)$", "lstrip": "u/"},
+                    ],
+                    "timestamp": [("datePublished",), ("dateCreated",)],
+                    "canonical_url": [("url",)],
+                    # Subreddit from the forum URL, else from the post URL
+                    "subreddit": [
+                        {"path": ("isPartOf", "url"), "pattern": _R_SUB},
+                        {"path": ("url",), "pattern": _R_SUB},
+                    ],
+                },
+            },
+        ],
+        "meta": {
+            "post_title": ["og:title", "twitter:title", {"title": True}],
+            "post_body": ["og:description", "twitter:description"],
+            "canonical_url": ["og:url", {"url": "reddit.com"}],
+            "subreddit": [{"meta": "og:url", "pattern": _R_SUB}],
+        },
+        "app_state": [
+            {
+                # Server-rendered redux store: posts keyed by fullname ("t3_...")
+                "marker": "window.___r",
+                "fields": {
+                    "post_title": [("posts", "models", "*", "title")],
+                    "author": [("posts", "models", "*", "author")],
+                    "subreddit": [{"path": ("posts", "models", "*", "permalink"), "pattern": _R_SUB}],
+                    "canonical_url": [("posts", "models", "*", "permalink")],
+                },
+            },
+        ],
+        "regex": {
+            "post_title": [{"title": True}],
+            "post_body": [{"tag": "shreddit-post", "max_len": 300}],
+            "subreddit": [{"pattern": _R_SUB}],
+            # Prefer author attr on <shreddit-post> (more reliable than first u/ on page, which may be an ad)
+            # Handle both raw quotes and escaped quotes (\\") from JSON-embedded HTML
+            "author": [
+                {"tag": "shreddit-post", "pattern": r'\bauthor="([^"]+)"', "flags": re.I},
+                {"tag": "shreddit-post", "pattern": r'\bauthor=\\"([^\\]+)\\"', "flags": re.I},
+                # Text fallbacks search from the post onwards, skipping the header and ads above it
+                {"pattern": r'aria-label="Author:\s*([^"]+)"', "flags": re.I, "anchor": "<shreddit-post"},
+                {"pattern": r"u/([A-Za-z0-9_\-]+)", "anchor": "<shreddit-post"},
+                {"pattern": r'aria-label="Author:\s*([^"]+)"', "flags": re.I, "window": _R_PAGE_WINDOW},
+                {"pattern": r"u/([A-Za-z0-9_\-]+)", "window": _R_PAGE_WINDOW},
+            ],
+            # (?<!\d): only try a digit run from its start; same first match, linear on long runs
+            "timestamp": [
+                {"pattern": _R_TIMESTAMP, "anchor": "<shreddit-post"},
+                {"pattern": _R_TIMESTAMP, "window": _R_PAGE_WINDOW},
+            ],
+            "canonical_url": [{"url": "reddit.com"}],
+        },
+    },
+    "linkedin": {
+        "json_ld": [
+            {
+                "types": ("Organization", "Corporation", "Company"),
+                "fields": {
+                    "title_or_company": [("name",)],
+                    "location": [("address", "addressLocality"), ("address", "addressRegion")],
+                    "page_url": [("url",)],
+                    "key_metadata": [
+                        {"path": ("numberOfEmployees", "value"), "format": "{} employees"},
+                        ("numberOfEmployees",),
+                    ],
+                },
+            },
+        ],
+        "meta": {
+            "title_or_company": ["og:title", "twitter:title", {"title": True}],
+            "page_url": ["og:url", {"url": "linkedin.com"}],
+        },
+        "regex": {
+            "title_or_company": [{"pattern": r"Microsoft|Company|LinkedIn", "flags": re.I}],
+            "location": [{"pattern": r"Redmond|United States|Toronto|Remote", "flags": re.I}],
+            "page_url": [{"url": "linkedin.com"}],
+            "key_metadata": [{"pattern": r"(?<!\d)\d+[+,]?\s+employees|Information Technology", "flags": re.I}],
+        },
+    },
+    "instagram": {
+        # Instagram profile pages don't reliably expose timestamps
+        "json_ld": [
+            {
+                "types": ("ProfilePage", "Person", "Organization"),
+                "fields": {
+                    "username": [("alternateName",), ("name",), ("mainEntity", "alternateName")],
+                    "canonical_url": [("url",)],
+                },
+            },
+        ],
+        "meta": {
+            "username": ["og:title", "twitter:title"],
+            "canonical_url": ["og:url", {"url": "instagram.com"}],
+        },
+        "app_state": [
+            {
+                "marker": "window._sharedData",
+                "fields": {"username": [("entry_data", "ProfilePage", "graphql", "user", "username")]},
+            },
+        ],
+        "regex": {
+            "username": [{"pattern": r"instagram", "flags": re.I}],
+            "canonical_url": [{"url": "instagram.com"}],
+        },
+    },
+    "control_example": {
+        "json_ld": [{"types": None, "fields": {"title": [("name",)]}}],
+        "meta": {"title": ["og:title", {"title": True}]},
+        "regex": {"title": [{"title": True}]},
+    },
+    "control_httpbin": {
+        # httpbin returns JSON, not HTML with meta tags
+        "regex": {
+            "user_agent": [
+                {"json": ("headers", "User-Agent")},
+                {"pattern": r'"User-Agent":\s*"([^"]+)"'},
+            ],
+        },
+    },
+    "control_local": {
+        "json_ld": [
+            {
+                "types": None,
+                "fields": {
+                    "post_text": [("articleBody",), ("text",)],
+                    "author_handle": [("author", "name")],
+                    "timestamp": [("datePublished",)],
+                    "canonical_url": [("url",)],
+                },
+            },
+        ],
+        "meta": {
+            "post_text": ["og:description"],
+            "canonical_url": ["og:url"],
+        },
+        "regex": {
+            "post_text": [{"pattern": r'"articleBody":\s*"([^"]+)"'}],
+            "author_handle": [{"pattern": r'"name":\s*"([^"]+)"'}],
+            "timestamp": [{"pattern": r'"datePublished":\s*"([^"]+)"'}],
+            "canonical_url": [{"url": ""}],
+        },
+    },
+}
@@ -0,0 +1,87 @@
+"""First match of many patterns, each search stopping at its first hit."""
+
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from .pagebytes import decode
+
+
+class FirstMatchScanner:
+    """The first match of each of a site's fallback patterns.
+
+    Each wanted pattern is searched on its own with ``pattern.search``, which
+    stops at the first hit instead of collecting every match in the page.
+    Patterns are tried in index order (the order their sources were declared
+    in), and ``on_hit`` lets the caller drop patterns whose answer no longer
+    matters, so lower-priority alternatives of a settled field are never
+    searched at all.
+
+    Joining the patterns into one alternation of named groups was measured
+    and rejected: CPython's engine tries every alternative at every position
+    and loses the literal/charset prefix that lets a lone ``search`` skip
+    ahead, so the combined scan is slower than the separate ones.
+    """
+
+    def __init__(self, patterns: Iterable[Pattern[Any]]) -> None:
+        self.patterns: List[Pattern[Any]] = list(patterns)
+
+    def scan(
+        self,
+        text: Any,
+        wanted: Optional[Iterable[int]] = None,
+        on_hit: Optional[Callable[[int, str], Iterable[int]]] = None,
+        final: bool = True,
+        regions: Optional[Dict[int, Optional[Tuple[int, int]]]] = None,
+        deadline: Optional[float] = None,
+        unsearched: Optional[List[int]] = None,
+        on_search: Optional[Callable[[int, int, float], None]] = None,
+    ) -> Dict[int, str]:
+        """Map pattern index -> value of its first match (patterns without a match are absent).
+
+        The value is the pattern's first group, or the whole match when it
+        has none. Bytes patterns search bytes; their values are decoded.
+
+        Args:
+            wanted: pattern indexes to look for (default: all)
+            on_hit: called with (index, value) on every hit; returns indexes
+                that no longer need looking for (e.g. lower-priority
+                alternatives for a field that is now settled)
+            final: False when more text will follow; a match touching the
+                end of ``text`` might still grow, so it is left unresolved
+            regions: pattern index -> (start, stop) of ``text`` to search;
+                None skips the pattern for now (it stays unresolved).
+                Patterns not listed search the whole text.
+            deadline: ``time.perf_counter()`` value after which no further
+                pattern is searched; those skipped are appended to
+                ``unsearched``
+            on_search: called with (index, characters examined, seconds)
+                after every search, for profiling
+        """
+        pending = sorted(range(len(self.patterns)) if wanted is None else set(wanted))
+        skip = set()
+        hits: Dict[int, str] = {}
+        end = len(text)
+        for n, i in enumerate(pending):
+            if i in skip:
+                continue
+            region = regions.get(i, (0, end)) if regions is not None else (0, end)
+            if region is None:
+                continue
+            if deadline is not None and time.perf_counter() >= deadline:
+                if unsearched is not None:
+                    unsearched.extend(j for j in pending[n:] if j not in skip)
+                break
+            started = time.perf_counter() if on_search is not None else 0.0
+            m: Optional["re.Match[Any]"] = self.patterns[i].search(text, *region)
+            if on_search is not None:
+                on_search(i, (m.end() if m else region[1]) - region[0], time.perf_counter() - started)
+            if m is None or (not final and m.end() == end):
+                continue
+            value = (m.group(1) if m.re.groups else m.group(0)) or ""
+            if not isinstance(value, str):
+                value = decode(value)
+            hits[i] = value
+            if on_hit is not None:
+                skip.update(on_hit(i, value))
+        return hits
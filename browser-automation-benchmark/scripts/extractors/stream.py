@@ -0,0 +1,192 @@
+"""Streaming extraction: read a page in chunks and stop once every expected field is found."""
+
+import codecs
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .document import DocumentIndex
+from .layers import LAYERS, can_fill
+from .registry import REGISTRY, Context
+
+CHUNK_SIZE = 256 * 1024
+# Upper bound on text held for a token cut by a chunk boundary
+WINDOW = 4 * 1024 * 1024
+
+
+def iter_chunks(source: Union[str, Path, IO[Any]], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield decoded text chunks from a path or a readable binary/text stream (file, pipe, socket.makefile).
+
+    Text is decoded as ``Path.read_text(errors="ignore")`` would: undecodable
+    bytes are dropped and ``\\r\\n`` / ``\\r`` become ``\\n``, a trailing ``\\r``
+    being held back until the next chunk shows whether a ``\\n`` follows.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as fh:
+            yield from iter_chunks(fh, chunk_size)
+        return
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    carry = ""
+    while True:
+        data = source.read(chunk_size)
+        if not data:
+            break
+        text = carry + (decoder.decode(data) if isinstance(data, bytes) else data)
+        carry = "\r" if text.endswith("\r") else ""
+        text = _newlines(text[:-1] if carry else text)
+        if text:
+            yield text
+    tail = _newlines(carry + decoder.decode(b"", final=True))
+    if tail:
+        yield tail
+
+
+def _newlines(text: str) -> str:
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+class StreamingExtractor:
+    """Incremental counterpart of extract() for a page that arrives in chunks.
+
+    JSON-LD and Open Graph read from a DocumentIndex fed chunk by chunk. The
+    app-state and regex layers search the page read so far (its last
+    ``window`` characters once it is longer), so a match is never lost
+    because it started chunks before the one that completes it. They search
+    again once the text added since their last search is at least half of
+    what is held, which keeps the work linear in the page size; the regex
+    layer keeps each pattern's first hit. When the page ends before every
+    expected field is found and it fit in the window, the last search
+    starts over on the whole page, so the result equals extract()'s.
+    Memory is bounded by twice ``window`` plus the indexed tokens,
+    independent of page size.
+    """
+
+    def __init__(
+        self,
+        site: str,
+        url: str,
+        expected: Optional[Iterable[str]] = None,
+        window: int = WINDOW,
+    ) -> None:
+        self.site = site
+        self.url = url
+        self.expected = list(expected) if expected is not None else None
+        self.window = window
+        self.index = DocumentIndex()
+        self.fields: Dict[str, str] = {}
+        self.layers_run: List[str] = []
+        self.chars_read = 0
+        self._regex_hits: Dict[int, str] = {}
+        # App-state values per field, kept when a later search no longer holds their blob
+        self._state_hits: Dict[str, str] = {}
+        # Page offsets of rule anchors seen so far (for windowed fallback patterns)
+        self._anchors: Dict[str, int] = {}
+        # The page text the app-state and regex layers search, as chunks (the
+        # oldest dropped once the rest still holds ``window`` characters)
+        self._chunks: List[str] = []
+        self._held = 0
+        self._trimmed = False
+        # Characters held that those layers haven't searched yet
+        self._unsearched = 0
+        # Last values of the layers that search the text, reused between searches
+        self._found: Dict[str, Dict[str, str]] = {}
+
+    @property
+    def complete(self) -> bool:
+        """True once every expected field has a value (never without an expected list)."""
+        return self.expected is not None and all(self.fields.get(k) for k in self.expected)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume the next chunk; returns ``complete``."""
+        if not chunk:
+            return self.complete
+        self.chars_read += len(chunk)
+        self.index.feed(chunk, self.window)
+        self._chunks.append(chunk)
+        self._held += len(chunk)
+        while self._held - len(self._chunks[0]) >= self.window:
+            self._held -= len(self._chunks.pop(0))
+            self._trimmed = True
+        self._unsearched += len(chunk)
+        self._evaluate(final=False)
+        return self.complete
+
+    def close(self) -> Dict[str, Any]:
+        """Signal end of input (resolves fallback matches that ran up to the last chunk's end)."""
+        if self._chunks and not self.complete:
+            if not self._trimmed:
+                # The whole page is held: search it from the start, as extract() does
+                self._regex_hits = {}
+            self._evaluate(final=True)
+        return self.result()
+
+    def _evaluate(self, final: bool) -> None:
+        search = final or 2 * self._unsearched >= self._held
+        text = "".join(self._chunks) if search else ""
+        if search:
+            self._unsearched = 0
+        fields: Dict[str, str] = {}
+        for name, layer, producible in LAYERS:
+            if not can_fill(self.site, fields, self.expected, producible):
+                continue
+            if name not in self.layers_run:
+                self.layers_run.append(name)
+            if name == "regex" and search:
+                rules = REGISTRY.get(self.site)
+                if rules is None:
+                    continue
+                ctx = Context(self.index, text, self.url, offset=self.chars_read - len(text), anchors=self._anchors)
+                rules.regex.scan(ctx, fields, self._regex_hits, final)
+                self._found[name] = rules.apply_regex(ctx, self._regex_hits)
+            elif name == "app_state" and search:
+                state = layer(self.site, text, self.url, self.index)
+                if self._trimmed:
+                    # Blobs found before the start of the text held stay as they were
+                    state = dict(state, **{k: v for k, v in self._state_hits.items() if v and not state.get(k)})
+                self._state_hits = state
+                self._found[name] = state
+            elif name not in ("regex", "app_state"):
+                # Only the index is read; the text just has to be non-empty
+                self._found[name] = layer(self.site, self._chunks[-1], self.url, self.index)
+            for k, v in self._found.get(name, {}).items():
+                if not fields.get(k):
+                    fields[k] = v
+        self.fields = fields
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "fields": dict(self.fields),
+            "layers_run": list(self.layers_run),
+            "chars_read": self.chars_read,
+            "complete": self.complete,
+        }
+
+
+def extract_stream(
+    site: str,
+    source: Union[str, Path, IO[Any]],
+    url: str,
+    expected: Optional[Iterable[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+    window: int = WINDOW,
+) -> Dict[str, Any]:
+    """Extract from a page file or stream, reading only as far as needed.
+
+    Reading stops as soon as every expected field has a value, so a field
+    that a later part of the page would have supplied from a higher-priority
+    layer keeps the value found first. Pages that fit in one chunk give the
+    same fields as ``extract``.
+
+    Returns:
+        {"fields": {...}, "layers_run": [...], "chars_read": int, "complete": bool}
+    """
+    extractor = StreamingExtractor(site, url, expected, window)
+    chunks = iter_chunks(source, chunk_size)
+    try:
+        for chunk in chunks:
+            if extractor.feed(chunk):
+                return extractor.result()
+    finally:
+        chunks.close()
+    return extractor.close()
@@ -0,0 +1,36 @@
+"""Per-layer counters for extraction profiles (``extract_report(profile=True)``)."""
+
+import time
+from typing import Any, Dict
+
+
+class LayerTrace:
+    """Time and characters one extraction layer spent on a page.
+
+    ``chars`` counts characters the layer actually examined: JSON decoded,
+    plus the stretch of text each fallback pattern searched before it hit
+    or gave up. ``searches`` maps a fallback source, written
+    ``field[rank]``, to the milliseconds its search took, so a slow pattern
+    can be told apart from a slow layer.
+    """
+
+    __slots__ = ("chars", "searches", "_start", "ms")
+
+    def __init__(self) -> None:
+        self.chars = 0
+        self.searches: Dict[str, float] = {}
+        self.ms = 0.0
+        self._start = time.perf_counter()
+
+    def search(self, label: str, chars: int, seconds: float) -> None:
+        self.chars += chars
+        self.searches[label] = self.searches.get(label, 0.0) + seconds * 1000
+
+    def stop(self) -> None:
+        self.ms = (time.perf_counter() - self._start) * 1000
+
+    def as_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"ms": round(self.ms, 3), "chars": self.chars}
+        if self.searches:
+            out["searches"] = {k: round(v, 3) for k, v in self.searches.items()}
+        return out
@@ -0,0 +1,101 @@
+"""Ground-truth validation, with GROUND_TRUTH compiled once at import."""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from config import GROUND_TRUTH
+
+
+class Check:
+    """One GROUND_TRUTH entry: ``<field>_contains``, ``<field>_present`` or an exact ``<field>``."""
+
+    __slots__ = ("key", "field", "mode", "expected", "_needle")
+
+    def __init__(self, key: str, expected: Any) -> None:
+        self.key = key
+        if key.endswith("_contains"):
+            self.field, self.mode = key[: -len("_contains")], "contains"
+        elif key.endswith("_present"):
+            self.field, self.mode = key[: -len("_present")], "present"
+        else:
+            self.field, self.mode = key, "equals"
+        self.expected = expected
+        self._needle = expected.lower() if self.mode != "present" else None
+
+    def run(self, actual: str) -> Dict[str, Any]:
+        if self.mode == "present":
+            return {"expected": "non-empty", "actual": bool(actual), "pass": bool(actual)}
+        if not actual:
+            passed = False
+        elif self.mode == "contains":
+            passed = self._needle in actual.lower()
+        else:
+            passed = self._needle == actual.lower()
+        return {"expected": self.expected, "actual": actual[:200], "pass": passed}
+
+
+class Validator:
+    """A site's compiled checks.
+
+    Results are memoized on the values of the fields the checks read, so
+    attempts that extracted the same values run the checks once. Each call
+    returns its own copy, so a record's ``ground_truth`` can be changed
+    without touching other records.
+    """
+
+    # Distinct extracted-value combinations remembered per site
+    MEMO_SIZE = 1024
+
+    def __init__(self, truth: Dict[str, Any]) -> None:
+        self.checks = [Check(key, value) for key, value in truth.items()]
+        self.fields: Tuple[str, ...] = tuple(dict.fromkeys(c.field for c in self.checks))
+        self._memo: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+    def validate(self, extracted: Dict[str, str]) -> Dict[str, Any]:
+        values = tuple(extracted.get(field, "") for field in self.fields)
+        result = self._memo.get(values)
+        if result is None:
+            checks = {c.key: c.run(extracted.get(c.field, "")) for c in self.checks}
+            total = len(checks)
+            passed = sum(1 for c in checks.values() if c["pass"])
+            result = {
+                "checks": checks,
+                "correctness_pct": round(100 * passed / total, 2) if total else None,
+            }
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[values] = result
+        return dict(result, checks={key: dict(check) for key, check in result["checks"].items()})
+
+
+VALIDATORS: Dict[str, Validator] = {site: Validator(truth) for site, truth in GROUND_TRUTH.items() if truth}
+
+_NO_TRUTH: Dict[str, Any] = {"checks": {}, "correctness_pct": None}
+
+
+def validate_ground_truth(site: str, extracted: Dict[str, str]) -> Dict[str, Any]:
+    """Validate extracted values against known ground truth.
+
+    Returns:
+        {
+            "checks": {field: {"expected": ..., "actual": ..., "pass": bool}},
+            "correctness_pct": float,
+        }
+    """
+    validator = VALIDATORS.get(site)
+    if validator is None:
+        return dict(_NO_TRUTH, checks={})
+    return validator.validate(extracted)
+
+
+def validate_records(records: Iterable[Dict[str, Any]], only_missing: bool = False) -> List[Dict[str, Any]]:
+    """Validate every record's ``extracted`` against its site's ground truth, storing ``ground_truth``.
+
+    With ``only_missing`` records that already carry ``ground_truth`` keep
+    it. Returns the records.
+    """
+    out = list(records)
+    for rec in out:
+        if only_missing and rec.get("ground_truth") is not None:
+            continue
+        rec["ground_truth"] = validate_ground_truth(rec["site"], rec.get("extracted") or {})
+    return out
@@ -0,0 +1,61 @@
+"""Adaptive page readiness: stop waiting once a page shows what its expected fields come from.
+
+Every tool runs the same in-page check (``readiness_script``): an
+expression whose promise resolves as soon as one of the site's
+``ready`` selectors matches (or, with ``"json_ld": True``, a JSON-LD
+block is present), or once the maximum wait has passed. It resolves to
+``{"ready": bool, "waited_ms": int}``. The fixed mode keeps the old
+6-second waits.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from config import URLS
+
+# The wait every runner used before adaptive readiness (and still uses in fixed mode)
+FIXED_WAIT_MS = 6000
+# Default cap on an adaptive wait
+MAX_WAIT_MS = 6000
+# How often the in-page check looks again
+POLL_MS = 100
+
+WAIT_MODES = ("fixed", "adaptive")
+
+_SCRIPT = """(({selectors, jsonLd, maxMs, pollMs}) => new Promise((resolve) => {
+  const start = performance.now();
+  const ready = () =>
+    (jsonLd && document.querySelector('script[type="application/ld+json"]') !== null)
+    || selectors.some((s) => document.querySelector(s) !== null);
+  const poll = () => {
+    const waited = Math.round(performance.now() - start);
+    if (ready()) resolve({ready: true, waited_ms: waited});
+    else if (waited >= maxMs) resolve({ready: false, waited_ms: waited});
+    else setTimeout(poll, pollMs);
+  };
+  poll();
+}))(%s)"""
+
+
+def readiness_script(site: str, max_wait_ms: int = MAX_WAIT_MS) -> str:
+    """The in-page readiness check for a site, as one JavaScript expression."""
+    spec = URLS.get(site, {}).get("ready") or {}
+    args = {
+        "selectors": list(spec.get("selectors", ())),
+        "jsonLd": bool(spec.get("json_ld")),
+        "maxMs": max_wait_ms,
+        "pollMs": POLL_MS,
+    }
+    return _SCRIPT % json.dumps(args)
+
+
+def parse_readiness(value: Any) -> Optional[Dict[str, Any]]:
+    """``{"ready", "wait_s"}`` from the check's result (or its JSON text); None when it isn't one."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if not isinstance(value, dict) or "waited_ms" not in value:
+        return None
+    return {"ready": bool(value.get("ready")), "wait_s": round(value["waited_ms"] / 1000, 3)}
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Re-run extraction, validation and classification over a finished run's saved artifacts.
+
+No browser is started: each attempt's ``page.html`` (or ``snapshot.txt``)
+and ``url.txt`` are read back from ``artifacts/<run_id>/``, and its
+``record.json``, the sibling ``results/attempts.json``,
+``results/attempts.jsonl`` and ``results/summary.json`` are rewritten. Attempts are spread over a process
+pool, one artifact directory per task. Pages are memory-mapped and
+extracted as raw bytes, so a worker never holds a large capture decoded.
+
+Records that ended in an error (setup, startup, runtime) keep their outcome;
+only their extracted fields and ground truth are refreshed, as in the
+runners' exception paths. mode_comparison.json / stealth_comparison.json
+are not rebuilt.
+
+    python3 scripts/reextract.py my-test
+    python3 scripts/reextract.py runs/2025-01-01_120000 --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running directly: python3 scripts/reextract.py
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from config import EXTRACT_BUDGET_S, RUNS_DIR
+
+from attempt_sink import iter_attempts, write_attempts_jsonl
+from extractors import ExtractCache, cached_extract_report, validate_ground_truth
+from extractors.pagebytes import map_page
+from run_benchmark import classify_page, json_dump, read_text, remediation_for, summarize
+
+# Records carry these classification keys; an errored record keeps them as recorded
+_CLASSIFIED = ("outcome", "failure_category", "failure_reason", "failure_stage")
+# Keys reextract_attempt sets or drops; attempts.json must not bring their old values back
+EXTRACTION_KEYS = frozenset({
+    "extracted", "extraction_layers", "extraction_cached", "extraction_provenance", "extraction_profile",
+    "extraction_missing", "block_signals", "remediation", "ground_truth", *_CLASSIFIED,
+})
+
+# Per worker process; cleared via --no-cache
+_CACHE: Optional[ExtractCache] = None
+
+
+def _init_worker(use_cache: bool) -> None:
+    global _CACHE
+    _CACHE = ExtractCache() if use_cache else None
+
+
+def reextract_attempt(adir: Path) -> Optional[Dict[str, Any]]:
+    """Refresh one attempt's record.json in place; None when the directory has no record."""
+    record_path = adir / "record.json"
+    if not record_path.exists():
+        return None
+    rec: Dict[str, Any] = json.loads(record_path.read_text())
+    site = rec["site"]
+    expected = rec["expected"]
+    page = adir / "page.html"
+    if not page.exists() or page.stat().st_size == 0:
+        page = adir / "snapshot.txt"
+    final_url = read_text(adir / "url.txt").strip() or rec.get("final_url", "")
+
+    with map_page(page) as data:
+        report = cached_extract_report(
+            site, data, final_url, expected=expected, cache=_CACHE, budget_s=EXTRACT_BUDGET_S, profile=True
+        )
+        classified = None if rec.get("error") else classify_page(
+            data, report["fields"], expected, site=site, final_url=final_url
+        )
+    rec["extracted"] = report["fields"]
+    rec["extraction_layers"] = report["layers_run"]
+    rec["extraction_cached"] = report["cached"]
+    rec["extraction_provenance"] = report["provenance"]
+    if "profile" in report:
+        rec["extraction_profile"] = report["profile"]
+    else:
+        rec.pop("extraction_profile", None)
+    if report["missing"]:
+        rec["extraction_missing"] = report["missing"]
+    else:
+        rec.pop("extraction_missing", None)
+    if classified is not None:
+        for key in _CLASSIFIED:
+            rec[key] = classified[key]
+        rec["block_signals"] = classified.get("block_signals", [])
+        rec["remediation"] = remediation_for(rec["tool"], rec["failure_reason"])
+    rec["ground_truth"] = (
+        classified["ground_truth"] if classified is not None else validate_ground_truth(site, report["fields"])
+    )
+    json_dump(record_path, rec)
+    return rec
+
+
+def find_result_sets(run_dir: Path) -> List[Path]:
+    """Every ``artifacts/`` directory in a run (one per mode for --compare-* runs)."""
+    return sorted(p for p in [run_dir / "artifacts", *run_dir.glob("*/artifacts")] if p.is_dir())
+
+
+def resolve_run(name: str) -> Path:
+    path = Path(name)
+    if path.is_dir():
+        return path
+    if (RUNS_DIR / name).is_dir():
+        return RUNS_DIR / name
+    raise SystemExit(f"run not found: {name} (looked in . and {RUNS_DIR})")
+
+
+def _ordered(records: List[Dict[str, Any]], previous: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """New records in the order of the previous attempts.json, carrying over its extra keys (e.g. mode).
+
+    Only keys outside ``EXTRACTION_KEYS`` are carried over, so a field the
+    re-extraction no longer produces stays dropped.
+    """
+    by_id = {rec["run_id"]: rec for rec in records}
+    ordered = []
+    for old in previous:
+        rec = by_id.pop(old.get("run_id"), None)
+        if rec is None:
+            continue
+        for key in old.keys() - EXTRACTION_KEYS:
+            rec.setdefault(key, old[key])
+        ordered.append(rec)
+    # Attempts missing from attempts.json (e.g. an interrupted run) go last
+    ordered.extend(sorted(by_id.values(), key=lambda r: (r["tool"], r["site"], r["attempt"])))
+    return ordered
+
+
+def reextract_run(run_dir: Path, workers: Optional[int] = None, use_cache: bool = True) -> Dict[str, int]:
+    """Re-extract every attempt under run_dir and rewrite its results; returns attempts per result set."""
+    art_dirs = find_result_sets(run_dir)
+    jobs = [(art, adir) for art in art_dirs for adir in sorted(art.iterdir()) if adir.is_dir()]
+    workers = workers or os.cpu_count() or 1
+    # A few tasks per worker per batch keeps every core busy without paying IPC per directory
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    fresh: Dict[Path, List[Dict[str, Any]]] = {art: [] for art in art_dirs}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(use_cache,)) as pool:
+        for (art, _), rec in zip(jobs, pool.map(reextract_attempt, [adir for _, adir in jobs], chunksize=chunksize)):
+            if rec is not None:
+                fresh[art].append(rec)
+
+    counts: Dict[str, int] = {}
+    for art, records in fresh.items():
+        if not records:
+            continue
+        res = art.parent / "results"
+        res.mkdir(parents=True, exist_ok=True)
+        attempts_path = res / "attempts.json"
+        # An interrupted run may only have its JSONL
+        previous = json.loads(attempts_path.read_text()) if attempts_path.exists() else list(iter_attempts(res))
+        records = _ordered(records, previous)
+        json_dump(attempts_path, records)
+        # compare_runs reads the JSONL too, so it must not keep the old extraction
+        write_attempts_jsonl(res, records)
+        json_dump(res / "summary.json", summarize(records))
+        counts[str(art.parent.relative_to(run_dir))] = len(records)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-run extraction over a finished run's saved pages")
+    parser.add_argument("run", help="Run name under runs/, or a path to a run directory")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--no-cache", action="store_true", default=False,
+                        help="Always run extraction instead of reusing cached results for identical pages")
+    args = parser.parse_args()
+
+    run_dir = resolve_run(args.run)
+    counts = reextract_run(run_dir, args.workers, use_cache=not args.no_cache)
+    if not counts:
+        print(f"no artifacts with record.json under {run_dir}", flush=True)
+        return
+    for result_set, n in counts.items():
+        print(f"re-extracted {result_set}: attempts={n}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
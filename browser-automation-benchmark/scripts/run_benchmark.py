@@ -1,18 +1,18 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import importlib.util
 import json
 import os
 import re
 import shutil
-import statistics
 import subprocess
 import sys
 import time
-from collections import Counter
+import zlib
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 # Allow running directly: python3 scripts/run_benchmark.py
 BASE = Path(__file__).resolve().parents[1]
@@ -28,16 +28,22 @@ from config import (
     URLS,
     COOKIES_RAW,
     BLOCK_PAT,
-    FORBIDDEN_PAT,
     SOFT_BLOCK_INDICATORS,
     LOGIN_REDIRECT_PAT,
-    SETUP_PATTERNS,
-    STARTUP_PATTERNS,
-    TIMEOUT_PATTERNS,
     GROUND_TRUTH,
+    EXTRACT_BUDGET_S,
 )
 
-from extractors import extract, validate_ground_truth
+import attempt_log
+import readiness
+from aggregate import SummaryAggregator
+from attempt_sink import AttemptSink
+from executor import ConcurrencyLimits, run_chains
+from extractors import ExtractCache, cached_extract_report, extract, validate_ground_truth, validate_records
+from extractors.pagebytes import Buffer
+from runners.agent_daemon import DaemonClient
+from runners.pool import WorkerPool
+from signals import RUNTIME_FAILURES, scanner_for
 
 # Per-run output directories, set in main()
 ART: Path = RUNS_DIR
@@ -49,6 +55,48 @@ HEADLESS: bool = True
 # Cookie skip flag, set via --no-cookies or during --compare-stealth
 NO_COOKIES: bool = False
 
+# Extraction report cache, cleared via --no-extract-cache
+EXTRACT_CACHE: Optional[ExtractCache] = ExtractCache()
+
+# Concurrent attempt limits, set in main() from --workers/--per-tool/--per-site (default: one at a time)
+LIMITS: ConcurrencyLimits = ConcurrencyLimits()
+
+# Persistent camofox/Scrapling browser workers, enabled via --persistent-workers
+WORKER_POOL: Optional[WorkerPool] = None
+
+# Send agent-browser steps over the daemon socket (disabled via --no-daemon-client)
+DAEMON_CLIENT: bool = True
+
+# Warm camofox attempts on a persistent worker keep the previous attempt's context (--reuse-context)
+REUSE_CONTEXT: bool = False
+
+# Page wait before capture: "fixed" (6 s) or "adaptive" (until the site's readiness check passes,
+# at most MAX_WAIT_MS), set via --wait-mode/--max-wait-ms
+WAIT_MODE: str = "fixed"
+MAX_WAIT_MS: int = readiness.MAX_WAIT_MS
+
+# Seconds between a chain's attempts, set via --attempt-gap
+ATTEMPT_GAP_S: float = 2.0
+
+# Skip attempts that already have a record.json in the run directory (--resume)
+RESUME: bool = False
+
+
+def ready_script_for(site: str) -> Optional[str]:
+    """The site's readiness check in adaptive mode; None for the fixed wait."""
+    return readiness.readiness_script(site, MAX_WAIT_MS) if WAIT_MODE == "adaptive" else None
+
+
+def parse_timing(stdout: str) -> Dict[str, Any]:
+    """The ``__TIMING__`` line a camofox/Scrapling run printed ({} when there is none)."""
+    for line in (stdout or "").splitlines():
+        if line.startswith("__TIMING__"):
+            try:
+                return json.loads(line[len("__TIMING__"):])
+            except (json.JSONDecodeError, ValueError):
+                pass
+    return {}
+
 
 def parse_cookies(site: str) -> List[Dict[str, Any]]:
     if NO_COOKIES:
@@ -115,10 +163,12 @@ def read_text(path: Path) -> str:
 
 
 def append_log(path: Path, label: str, content: str) -> None:
-    existing = path.read_text(errors="ignore") if path.exists() else ""
-    existing += f"\n===== {label} =====\n"
-    existing += content if content.endswith("\n") else f"{content}\n"
-    path.write_text(existing)
+    """Append a section to the attempt log in ``path``'s directory; the file name names the stream.
+
+    ``append_log(adir / "stderr.log", ...)`` logs to stream "stderr" of
+    ``adir/log.jsonl``: see attempt_log.py.
+    """
+    attempt_log.open_log(path.parent).write(path.stem, label, content)
 
 
 def remediation_for(tool: str, reason: str) -> List[str]:
@@ -202,41 +252,45 @@ def preflight(verbose: bool = True) -> Dict[str, Any]:
 
 
 def classify_runtime_failure(tool: str, stdout: str, stderr: str, error: str) -> Dict[str, str]:
-    blob = "\n".join(x for x in [stdout, stderr, error] if x)
-    for pattern, category, reason, stage in SETUP_PATTERNS:
-        if pattern.search(blob):
-            return {"failure_category": category, "failure_reason": reason, "failure_stage": stage}
-    for pattern, category, reason, stage in STARTUP_PATTERNS:
-        if pattern.search(blob):
-            return {"failure_category": category, "failure_reason": reason, "failure_stage": stage}
-    for pattern, category, reason, stage in TIMEOUT_PATTERNS:
-        if pattern.search(blob):
-            return {"failure_category": category, "failure_reason": reason, "failure_stage": stage}
-    if BLOCK_PAT.search(blob):
-        return {"failure_category": "site", "failure_reason": "anti-bot-challenge", "failure_stage": "page"}
+    # Only the head and tail of each stream are searched (see signals.FailureClassifier)
+    classified = RUNTIME_FAILURES.classify(stdout, stderr, error)
+    if classified is not None:
+        return classified
     return {"failure_category": "unknown", "failure_reason": "unclassified-error", "failure_stage": "unknown"}
 
 
-def classify_page(text: str, extracted: Dict[str, str], expected: List[str],
-                   site: str = "", final_url: str = "") -> Dict[str, str]:
-    t = (text or "")[:30000]
+def classify_page(text: Union[str, Buffer], extracted: Dict[str, str], expected: List[str],
+                   site: str = "", final_url: str = "",
+                   ground_truth: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Outcome and failure classification of a captured page, plus its ``ground_truth``.
+
+    Ground truth is validated once here (or taken from ``ground_truth``)
+    and returned for build_record to store, instead of being recomputed.
+    """
+    gt = ground_truth if ground_truth is not None else validate_ground_truth(site, extracted)
+    result: Dict[str, Any] = _classify_page(text, extracted, expected, site, final_url, gt)
+    result["ground_truth"] = gt
+    return result
+
+
+def _classify_page(text: Union[str, Buffer], extracted: Dict[str, str], expected: List[str],
+                   site: str, final_url: str, gt: Dict[str, Any]) -> Dict[str, Any]:
+    # text may be the raw bytes of page.html (reextract maps it); only its head is decoded
+    signals = scanner_for(site).scan(text)
+    t = signals["head"]
 
     # Always compute block signals for transparency
-    full_text = text or ""
     block_signals: List[str] = []
-    if BLOCK_PAT.search(t):
+    if signals["block"]:
         block_signals.append("block_pattern_in_html")
-    if FORBIDDEN_PAT.search(full_text):
+    if signals["forbidden"]:
         block_signals.append("content_forbidden")
     if site and site in SOFT_BLOCK_INDICATORS:
         indicators = SOFT_BLOCK_INDICATORS[site]
         page_size = len(t)
         min_size = indicators.get("min_page_size", 0)
-        required = indicators.get("required_elements", [])
-        if page_size < min_size and required:
-            missing_elements = [el for el in required if el.lower() not in t.lower()]
-            if missing_elements:
-                block_signals.append("soft_block_indicators")
+        if page_size < min_size and signals["missing"]:
+            block_signals.append("soft_block_indicators")
 
     # 1. Login redirect (URL-based, always fatal)
     if final_url and LOGIN_REDIRECT_PAT.search(final_url):
@@ -254,7 +308,6 @@ def classify_page(text: str, extracted: Dict[str, str], expected: List[str],
     #    misclassified as success.
     found = sum(1 for key in expected if extracted.get(key))
     if found == len(expected) and found > 0:
-        gt = validate_ground_truth(site, extracted)
         correctness = gt.get("correctness_pct")
         if correctness is not None and correctness < 50:
             return {
@@ -296,7 +349,6 @@ def classify_page(text: str, extracted: Dict[str, str], expected: List[str],
     # 5. Partial extraction — also check ground truth for garbage data from
     #    blocked pages that managed to extract some fields (e.g. from URL or meta).
     if found > 0:
-        gt = validate_ground_truth(site, extracted)
         correctness = gt.get("correctness_pct")
         if correctness is not None and correctness < 50:
             return {
@@ -348,12 +400,21 @@ def build_record(
     failure_stage: str = "",
     remediation: Optional[List[str]] = None,
     navigation_s: Optional[float] = None,
+    wait_s: Optional[float] = None,
+    wait_ready: Optional[bool] = None,
     extraction_s: Optional[float] = None,
     setup_s: Optional[float] = None,
     step_timings: Optional[Dict[str, float]] = None,
     block_signals: Optional[List[str]] = None,
+    extraction_layers: Optional[List[str]] = None,
+    extraction_cached: Optional[bool] = None,
+    extraction_missing: Optional[Dict[str, str]] = None,
+    extraction_provenance: Optional[Dict[str, str]] = None,
+    extraction_profile: Optional[Dict[str, Any]] = None,
+    ground_truth: Optional[Dict[str, Any]] = None,
+    worker_reused: Optional[bool] = None,
 ) -> Dict[str, Any]:
-    gt = validate_ground_truth(site, extracted)
+    gt = ground_truth if ground_truth is not None else validate_ground_truth(site, extracted)
     rec: Dict[str, Any] = {
         "tool": tool,
         "site": site,
@@ -380,12 +441,29 @@ def build_record(
     }
     if navigation_s is not None:
         rec["navigation_s"] = round(navigation_s, 3)
+    if wait_s is not None:
+        rec["wait_s"] = round(wait_s, 3)
+        rec["wait_mode"] = WAIT_MODE
+    if wait_ready is not None:
+        rec["wait_ready"] = wait_ready
     if extraction_s is not None:
         rec["extraction_s"] = round(extraction_s, 3)
+    if extraction_layers is not None:
+        rec["extraction_layers"] = extraction_layers
+    if extraction_cached is not None:
+        rec["extraction_cached"] = extraction_cached
+    if extraction_missing:
+        rec["extraction_missing"] = extraction_missing
+    if extraction_provenance is not None:
+        rec["extraction_provenance"] = extraction_provenance
+    if extraction_profile is not None:
+        rec["extraction_profile"] = extraction_profile
     if setup_s is not None:
         rec["setup_s"] = round(setup_s, 3)
     if step_timings is not None:
         rec["step_timings"] = {k: round(v, 3) for k, v in step_timings.items()}
+    if worker_reused is not None:
+        rec["worker_reused"] = worker_reused
     return rec
 
 
@@ -424,6 +502,12 @@ def run_logged(
             "elapsed_s": round(time.time() - started, 3),
             "command": command_str,
         }
+    log_result(label, adir, result)
+    return result
+
+
+def log_result(label: str, adir: Path, result: Dict[str, Any]) -> None:
+    """Append a run_logged-style result to the attempt's stdout/stderr/commands logs."""
     append_log(adir / "stdout.log", label, result["stdout"])
     append_log(adir / "stderr.log", label, result["stderr"])
     append_log(
@@ -439,7 +523,8 @@ def run_logged(
             indent=2,
         ),
     )
-    return result
+    # Step boundary
+    attempt_log.open_log(adir).flush()
 
 
 def setup_failure_record(
@@ -471,7 +556,26 @@ def setup_failure_record(
     )
 
 
-def best_effort_agent_capture(session: str, adir: Path, env: Dict[str, str]) -> Dict[str, str]:
+def run_agent_step(
+    label: str,
+    command: List[str],
+    adir: Path,
+    timeout: int,
+    env: Dict[str, str],
+    daemon: Optional[DaemonClient] = None,
+) -> Dict[str, Any]:
+    """run_logged for an agent-browser command, sent over the session's daemon connection when there is one."""
+    if daemon is not None:
+        result = daemon.run(command, timeout)
+        if result is not None:
+            log_result(label, adir, result)
+            return result
+    return run_logged(label, command, adir, timeout=timeout, env=env)
+
+
+def best_effort_agent_capture(
+    session: str, adir: Path, env: Dict[str, str], daemon: Optional[DaemonClient] = None
+) -> Dict[str, str]:
     title = ""
     final_url = ""
     for label, command, target in [
@@ -480,7 +584,7 @@ def best_effort_agent_capture(session: str, adir: Path, env: Dict[str, str]) ->
         ("capture-shot", ["agent-browser", "--session", session, "screenshot", str(adir / "screen.png")], None),
         ("capture-html", ["agent-browser", "--session", session, "eval", "document.documentElement.outerHTML"], adir / "page.html"),
     ]:
-        result = run_logged(label, command, adir, timeout=20, env=env)
+        result = run_agent_step(label, command, adir, 20, env, daemon)
         if target and result["returncode"] == 0 and result["stdout"]:
             stdout = result["stdout"]
             if label == "capture-html":
@@ -507,7 +611,9 @@ def run_agent_browser(site: str, cfg: Dict[str, Any], attempt: int, cold: bool,
         json_dump(adir / "record.json", rec)
         return rec
 
-    session = f"ab{site[0]}{attempt}{'c' if cold else 'w'}"
+    # Unique per site and attempt, so concurrent attempts never share a daemon session; kept short
+    # because the daemon rejects long session names (the site's initial alone collides across sites)
+    session = f"ab{site[0]}{zlib.crc32(site.encode()) & 0xffff:04x}{attempt}{'c' if cold else 'w'}"
     env = os.environ.copy()
     env["AGENT_BROWSER_SOCKET_DIR"] = str(AB_SOCKET_DIR)
     env["XDG_RUNTIME_DIR"] = str(RUNTIME_DIR)
@@ -532,15 +638,25 @@ def run_agent_browser(site: str, cfg: Dict[str, Any], attempt: int, cold: bool,
     failure_stage = "unknown"
     rec: Optional[Dict[str, Any]] = None
     step_timings: Dict[str, float] = {}
+    # Connection to the session's daemon, opened once prime-state has started it
+    daemon: Optional[DaemonClient] = None
 
     headed_flag = [] if HEADLESS else ["--headed"]
     if HEADLESS and cold:
         run_logged("close-pre", ["agent-browser", "--session", session, "close"], adir, timeout=10, env=env)
+    ready_script = ready_script_for(site)
+    if ready_script:
+        # Resolves once the page is ready (or MAX_WAIT_MS has passed), reporting how long it waited
+        wait_step = (["agent-browser", "--session", session, "eval", ready_script], MAX_WAIT_MS // 1000 + 15)
+    else:
+        wait_step = (["agent-browser", "--session", session, "wait", str(readiness.FIXED_WAIT_MS)], 15)
+    # Set from the readiness check's own report when it ran
+    wait_report: Optional[Dict[str, Any]] = None
     steps = [
         ("prime-state", ["agent-browser"] + headed_flag + ["--session", session, "--state", str(state_path), "open", "about:blank"], 30),
         ("cookies", ["agent-browser", "--session", session, "--json", "cookies"], 15),
         ("open", ["agent-browser"] + headed_flag + ["--session", session, "open", cfg["url"]], 45),
-        ("wait", ["agent-browser", "--session", session, "wait", "6000"], 15),
+        ("wait",) + wait_step,
         ("title", ["agent-browser", "--session", session, "get", "title"], 15),
         ("url", ["agent-browser", "--session", session, "get", "url"], 15),
         ("html", ["agent-browser", "--session", session, "eval", "document.documentElement.outerHTML"], 25),
@@ -549,7 +665,7 @@ def run_agent_browser(site: str, cfg: Dict[str, Any], attempt: int, cold: bool,
 
     try:
         for label, command, timeout in steps:
-            result = run_logged(label, command, adir, timeout=timeout, env=env)
+            result = run_agent_step(label, command, adir, timeout, env, daemon)
             step_timings[label] = result["elapsed_s"]
             if result["timeout"]:
                 first_error = f"{label} timed out after {timeout}s"
@@ -569,7 +685,9 @@ def run_agent_browser(site: str, cfg: Dict[str, Any], attempt: int, cold: bool,
                 failure_stage = classified["failure_stage"] or label
                 # If html step fails, try snapshot as fallback
                 if label == "html":
-                    snap_result = run_logged("snapshot-fallback", ["agent-browser", "--session", session, "snapshot"], adir, timeout=30, env=env)
+                    snap_result = run_agent_step(
+                        "snapshot-fallback", ["agent-browser", "--session", session, "snapshot"], adir, 30, env, daemon
+                    )
                     step_timings["snapshot-fallback"] = snap_result["elapsed_s"]
                     if snap_result["returncode"] == 0 and snap_result["stdout"]:
                         (adir / "snapshot.txt").write_text(snap_result["stdout"])
@@ -579,12 +697,16 @@ def run_agent_browser(site: str, cfg: Dict[str, Any], attempt: int, cold: bool,
                         failure_stage = ""
                         continue
                 break
+            if label == "prime-state" and DAEMON_CLIENT:
+                daemon = DaemonClient.connect(session, AB_SOCKET_DIR)
             if label == "cookies":
                 append_log(adir / "stdout.log", "cookie-check", result["stdout"])
             elif label == "title":
                 (adir / "title.txt").write_text(result["stdout"])
             elif label == "url":
                 (adir / "url.txt").write_text(result["stdout"])
+            elif label == "wait" and ready_script:
+                wait_report = readiness.parse_readiness(result["stdout"])
             elif label == "html":
                 html_out = result["stdout"]
                 try:
@@ -596,15 +718,21 @@ def run_agent_browser(site: str, cfg: Dict[str, Any], attempt: int, cold: bool,
         # Compute timing breakdown
         setup_s = step_timings.get("prime-state", 0) + step_timings.get("cookies", 0)
         navigation_s = step_timings.get("open", 0) + step_timings.get("wait", 0)
+        wait_s = wait_report["wait_s"] if wait_report else step_timings.get("wait")
 
-        capture = best_effort_agent_capture(session, adir, env)
+        capture = best_effort_agent_capture(session, adir, env, daemon)
         title = capture["title"]
         final_url = capture["final_url"]
         text = read_text(adir / "page.html") or read_text(adir / "snapshot.txt")
         extract_start = time.time()
-        extracted = extract(site, text, final_url)
+        report = cached_extract_report(
+            site, text, final_url, expected=cfg["expected"], cache=EXTRACT_CACHE, budget_s=EXTRACT_BUDGET_S,
+            profile=True,
+        )
+        extracted = report["fields"]
         extraction_s = time.time() - extract_start
         block_signals: List[str] = []
+        ground_truth: Optional[Dict[str, Any]] = None
         if not first_error:
             classified = classify_page(text, extracted, cfg["expected"], site=site, final_url=final_url)
             outcome = classified["outcome"]
@@ -612,6 +740,7 @@ def run_agent_browser(site: str, cfg: Dict[str, Any], attempt: int, cold: bool,
             failure_reason = classified["failure_reason"]
             failure_stage = classified["failure_stage"]
             block_signals = classified.get("block_signals", [])
+            ground_truth = classified["ground_truth"]
         elif failure_category == "site" and BLOCK_PAT.search(text):
             outcome = "blocked/challenged"
         elif failure_category == "timeout":
@@ -636,18 +765,26 @@ def run_agent_browser(site: str, cfg: Dict[str, Any], attempt: int, cold: bool,
             failure_stage=failure_stage,
             remediation=remediation_for("agent-browser", failure_reason),
             navigation_s=navigation_s,
+            wait_s=wait_s,
+            wait_ready=wait_report["ready"] if wait_report else None,
             extraction_s=extraction_s,
             setup_s=setup_s,
             step_timings=step_timings,
             block_signals=block_signals,
+            extraction_layers=report["layers_run"],
+            extraction_cached=report["cached"],
+            extraction_missing=report["missing"],
+            extraction_provenance=report["provenance"],
+            extraction_profile=report.get("profile"),
+            ground_truth=ground_truth,
         )
     except Exception as exc:
         append_log(adir / "stderr.log", "agent-browser-exception", repr(exc))
-        capture = best_effort_agent_capture(session, adir, env)
+        capture = best_effort_agent_capture(session, adir, env, daemon)
         title = capture["title"]
         final_url = capture["final_url"]
         text = read_text(adir / "page.html") or read_text(adir / "snapshot.txt")
-        extracted = extract(site, text, final_url)
+        extracted = extract(site, text, final_url, expected=cfg["expected"])
         classified = classify_runtime_failure("agent-browser", "", "", str(exc))
         rec = build_record(
             tool="agent-browser",
@@ -669,7 +806,9 @@ def run_agent_browser(site: str, cfg: Dict[str, Any], attempt: int, cold: bool,
             step_timings=step_timings,
         )
     finally:
-        run_logged("close", ["agent-browser", "--session", session, "close"], adir, timeout=15, env=env)
+        run_agent_step("close", ["agent-browser", "--session", session, "close"], adir, 15, env, daemon)
+        if daemon is not None:
+            daemon.close()
     json_dump(adir / "record.json", rec)
     return rec
 
@@ -678,6 +817,15 @@ def run_inline_python(label: str, script: str, adir: Path, timeout: int) -> Dict
     return run_logged(label, [sys.executable, "-c", script], adir, timeout=timeout, env=os.environ.copy())
 
 
+def run_worker_job(label: str, tool: str, site: str, job: Dict[str, Any], adir: Path, timeout: int) -> Dict[str, Any]:
+    """run_inline_python's counterpart on the chain's persistent worker (same result keys, plus
+    ``launch_s`` and ``reused``)."""
+    assert WORKER_POOL is not None
+    result = WORKER_POOL.run(tool, site, HEADLESS, job, timeout)
+    log_result(label, adir, result)
+    return result
+
+
 def run_camoufox(site: str, cfg: Dict[str, Any], attempt: int, cold: bool, checks: Dict[str, Any]) -> Dict[str, Any]:
     run_id = f"camofox-browser_{site}_{attempt}_{'cold' if cold else 'warm'}"
     adir = ART / run_id
@@ -702,6 +850,7 @@ def run_camoufox(site: str, cfg: Dict[str, Any], attempt: int, cold: bool, check
         cookies,
         extra={"state_path": str(state_path), "import_mode": "context.add_cookies"},
     )
+    ready_script = ready_script_for(site)
     script = f"""
 from pathlib import Path
 import json
@@ -710,6 +859,7 @@ import time as _time
 from camoufox.sync_api import Camoufox
 
 url = {cfg['url']!r}
+ready_script = {ready_script!r}
 cookies = {cookies!r}
 state_path = Path({str(state_path)!r})
 out = Path({str(adir)!r})
@@ -730,9 +880,16 @@ with Camoufox(headless=headless, humanize=not headless) as browser:
     if cookies:
         context.add_cookies(cookies)
     page = context.new_page()
+    _wait = {{}}
     try:
         page.goto(url, wait_until="domcontentloaded", timeout=45000)
-        page.wait_for_timeout(6000)
+        _wait_start = _time.time()
+        if ready_script:
+            _ready = page.evaluate(ready_script)
+            _wait["ready"] = bool(_ready.get("ready")) if isinstance(_ready, dict) else None
+        else:
+            page.wait_for_timeout({readiness.FIXED_WAIT_MS})
+        _wait["wait_s"] = round(_time.time() - _wait_start, 3)
     finally:
         _nav_end = _time.time()
         try:
@@ -756,27 +913,38 @@ with Camoufox(headless=headless, humanize=not headless) as browser:
         except Exception:
             pass
         context.close()
-print("__TIMING__" + json.dumps({{"navigation_s": round(_nav_end - _nav_start, 3)}}))
+print("__TIMING__" + json.dumps({{"navigation_s": round(_nav_end - _nav_start, 3), **_wait}}))
 """
-    result = run_inline_python("camoufox", script, adir, timeout=85)
+    if WORKER_POOL is not None:
+        job = {
+            "url": cfg["url"],
+            "out": str(adir),
+            "cookies": cookies,
+            "cookie_summary": cookie_log_summary(cookies),
+            "state_path": str(state_path),
+            "fresh": cold,
+            "reuse_context": REUSE_CONTEXT,
+            "ready_script": ready_script,
+        }
+        result = run_worker_job("camoufox", "camofox-browser", site, job, adir, timeout=85)
+    else:
+        result = run_inline_python("camoufox", script, adir, timeout=85)
 
-    # Parse timing from subprocess output
-    camo_navigation_s = None
-    for line in (result.get("stdout") or "").splitlines():
-        if line.startswith("__TIMING__"):
-            try:
-                camo_navigation_s = json.loads(line[len("__TIMING__"):]).get("navigation_s")
-            except (json.JSONDecodeError, ValueError):
-                pass
+    timing = parse_timing(result.get("stdout"))
 
     text = read_text(adir / "page.html")
     final_url = read_text(adir / "url.txt").strip()
     title = read_text(adir / "title.txt").strip()
     extract_start = time.time()
-    extracted = extract(site, text, final_url)
+    report = cached_extract_report(
+        site, text, final_url, expected=cfg["expected"], cache=EXTRACT_CACHE, budget_s=EXTRACT_BUDGET_S,
+        profile=True,
+    )
+    extracted = report["fields"]
     extraction_s = time.time() - extract_start
 
     block_signals: List[str] = []
+    ground_truth: Optional[Dict[str, Any]] = None
     if result["timeout"]:
         outcome = "timeout"
         failure_category = "timeout"
@@ -797,6 +965,7 @@ print("__TIMING__" + json.dumps({{"navigation_s": round(_nav_end - _nav_start, 3
         failure_reason = classified["failure_reason"]
         failure_stage = classified["failure_stage"]
         block_signals = classified.get("block_signals", [])
+        ground_truth = classified["ground_truth"]
         error = ""
 
     rec = build_record(
@@ -816,9 +985,19 @@ print("__TIMING__" + json.dumps({{"navigation_s": round(_nav_end - _nav_start, 3
         failure_reason=failure_reason,
         failure_stage=failure_stage,
         remediation=remediation_for("camofox-browser", failure_reason),
-        navigation_s=camo_navigation_s,
+        navigation_s=timing.get("navigation_s"),
+        wait_s=timing.get("wait_s"),
+        wait_ready=timing.get("ready"),
         extraction_s=extraction_s,
+        setup_s=result.get("launch_s"),
         block_signals=block_signals,
+        extraction_layers=report["layers_run"],
+        extraction_cached=report["cached"],
+        extraction_missing=report["missing"],
+        extraction_provenance=report["provenance"],
+        extraction_profile=report.get("profile"),
+        ground_truth=ground_truth,
+        worker_reused=result.get("reused"),
     )
     json_dump(adir / "record.json", rec)
     return rec
@@ -837,7 +1016,11 @@ def run_scrapling(site: str, cfg: Dict[str, Any], attempt: int, cold: bool, chec
         json_dump(adir / "record.json", rec)
         return rec
 
-    profile = BASE / ".profiles" / f"scrap-{site}-{'cold' if cold else 'warm'}-{attempt}"
+    if WORKER_POOL is not None:
+        # One profile per chain: warm attempts keep the session the cold attempt opened on it
+        profile = BASE / ".profiles" / f"scrap-{site}-worker"
+    else:
+        profile = BASE / ".profiles" / f"scrap-{site}-{'cold' if cold else 'warm'}-{attempt}"
     lock_file = profile / "SingletonLock"
     if lock_file.exists():
         try:
@@ -853,6 +1036,7 @@ def run_scrapling(site: str, cfg: Dict[str, Any], attempt: int, cold: bool, chec
         cookies,
         extra={"profile": str(profile), "import_mode": "StealthySession(cookies=...)"},
     )
+    ready_script = ready_script_for(site)
     script = f"""
 import json
 import time as _time
@@ -860,6 +1044,7 @@ from pathlib import Path
 from scrapling.fetchers import StealthySession
 
 url = {cfg['url']!r}
+ready_script = {ready_script!r}
 profile = {str(profile)!r}
 out = Path({str(adir)!r})
 cookies = {cookies!r}
@@ -873,11 +1058,18 @@ print(json.dumps({{
 }}))
 
 captured_html = ""
+_wait = {{}}
 
 def page_action(page):
     global captured_html
     try:
-        page.wait_for_timeout(6000)
+        _wait_start = _time.time()
+        if ready_script:
+            _ready = page.evaluate(ready_script)
+            _wait["ready"] = bool(_ready.get("ready")) if isinstance(_ready, dict) else None
+        else:
+            page.wait_for_timeout({readiness.FIXED_WAIT_MS})
+        _wait["wait_s"] = round(_time.time() - _wait_start, 3)
     finally:
         try:
             captured_html = page.content()
@@ -890,8 +1082,9 @@ def page_action(page):
 
 _nav_start = _time.time()
 with StealthySession(user_data_dir=profile, cookies=cookies) as session:
-    response = session.fetch(url, headless={HEADLESS!r}, timeout=45000, wait=6000,
-                             page_action=page_action)
+    # The adaptive check replaces Scrapling's own post-load wait as well
+    response = session.fetch(url, headless={HEADLESS!r}, timeout=45000,
+                             wait=0 if ready_script else {readiness.FIXED_WAIT_MS}, page_action=page_action)
     _nav_end = _time.time()
     # Try multiple ways to get HTML content
     html = response.text or ""
@@ -906,26 +1099,36 @@ with StealthySession(user_data_dir=profile, cookies=cookies) as session:
         html = captured_html
     (out / "page.html").write_text(html)
     (out / "url.txt").write_text(getattr(response, "url", url))
-print("__TIMING__" + json.dumps({{"navigation_s": round(_nav_end - _nav_start, 3)}}))
+print("__TIMING__" + json.dumps({{"navigation_s": round(_nav_end - _nav_start, 3), **_wait}}))
 """
-    result = run_inline_python("scrapling", script, adir, timeout=90)
+    if WORKER_POOL is not None:
+        job = {
+            "url": cfg["url"],
+            "out": str(adir),
+            "cookies": cookies,
+            "cookie_summary": cookie_log_summary(cookies),
+            "profile": str(profile),
+            "fresh": cold,
+            "ready_script": ready_script,
+        }
+        result = run_worker_job("scrapling", "Scrapling", site, job, adir, timeout=90)
+    else:
+        result = run_inline_python("scrapling", script, adir, timeout=90)
 
-    # Parse timing from subprocess output
-    scrap_navigation_s = None
-    for line in (result.get("stdout") or "").splitlines():
-        if line.startswith("__TIMING__"):
-            try:
-                scrap_navigation_s = json.loads(line[len("__TIMING__"):]).get("navigation_s")
-            except (json.JSONDecodeError, ValueError):
-                pass
+    timing = parse_timing(result.get("stdout"))
 
     text = read_text(adir / "page.html")
     final_url = read_text(adir / "url.txt").strip()
     extract_start = time.time()
-    extracted = extract(site, text, final_url)
+    report = cached_extract_report(
+        site, text, final_url, expected=cfg["expected"], cache=EXTRACT_CACHE, budget_s=EXTRACT_BUDGET_S,
+        profile=True,
+    )
+    extracted = report["fields"]
     extraction_s = time.time() - extract_start
 
     block_signals: List[str] = []
+    ground_truth: Optional[Dict[str, Any]] = None
     if result["timeout"]:
         outcome = "timeout"
         failure_category = "timeout"
@@ -946,6 +1149,7 @@ print("__TIMING__" + json.dumps({{"navigation_s": round(_nav_end - _nav_start, 3
         failure_reason = classified["failure_reason"]
         failure_stage = classified["failure_stage"]
         block_signals = classified.get("block_signals", [])
+        ground_truth = classified["ground_truth"]
         error = ""
 
     rec = build_record(
@@ -965,102 +1169,96 @@ print("__TIMING__" + json.dumps({{"navigation_s": round(_nav_end - _nav_start, 3
         failure_reason=failure_reason,
         failure_stage=failure_stage,
         remediation=remediation_for("Scrapling", failure_reason),
-        navigation_s=scrap_navigation_s,
+        navigation_s=timing.get("navigation_s"),
+        wait_s=timing.get("wait_s"),
+        wait_ready=timing.get("ready"),
         extraction_s=extraction_s,
+        setup_s=result.get("launch_s"),
         block_signals=block_signals,
+        extraction_layers=report["layers_run"],
+        extraction_cached=report["cached"],
+        extraction_missing=report["missing"],
+        extraction_provenance=report["provenance"],
+        extraction_profile=report.get("profile"),
+        ground_truth=ground_truth,
+        worker_reused=result.get("reused"),
     )
     json_dump(adir / "record.json", rec)
     return rec
 
 
-def timing_stats(values: List[float]) -> Optional[Dict[str, float]]:
-    """Compute descriptive statistics for a list of timing values."""
-    if not values:
-        return None
-    s: Dict[str, float] = {
-        "mean": round(statistics.mean(values), 3),
-        "median": round(statistics.median(values), 3),
-        "min": round(min(values), 3),
-        "max": round(max(values), 3),
-    }
-    if len(values) >= 2:
-        s["stdev"] = round(statistics.stdev(values), 3)
-        q = statistics.quantiles(values, n=4)
-        s["iqr"] = round(q[2] - q[0], 3)
-        s["p95"] = round(statistics.quantiles(values, n=20)[-1], 3)
-    return s
+def summarize(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    aggregator = SummaryAggregator()
+    # Records saved without ground truth (older runs) are validated in one batch
+    for record in validate_records(records, only_missing=True):
+        aggregator.add(record)
+    return aggregator.summary()
 
 
-def summarize(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    grouped: Dict[Any, List[Dict[str, Any]]] = {}
-    for record in records:
-        grouped.setdefault((record["tool"], record["site"]), []).append(record)
+def load_completed(
+    art: Path,
+    sink: AttemptSink,
+    tool_order: List[str],
+    site_order: List[str],
+    n_attempts: int,
+) -> Set[Tuple[str, str, int]]:
+    """Feed the attempts already recorded under ``art`` to ``sink``; returns their (tool, site, attempt) keys.
+
+    Only records of the requested tools, sites and attempt numbers count. A
+    record.json that is missing or unreadable (an attempt cut short) means
+    the attempt runs again.
+    """
+    completed: Set[Tuple[str, str, int]] = set()
+    if not art.is_dir():
+        return completed
+    for record_path in sorted(art.glob("*/record.json")):
+        try:
+            rec = json.loads(record_path.read_text())
+            key = (rec["tool"], rec["site"], int(rec["attempt"]))
+        except (OSError, ValueError, TypeError, KeyError):
+            continue
+        if "outcome" not in rec or key in completed or key[0] not in tool_order or key[1] not in site_order or key[2] > n_attempts:
+            continue
+        sink.add(validate_records([rec], only_missing=True)[0])
+        completed.add(key)
+    return completed
 
-    summary = []
-    for (tool, site), rows in grouped.items():
-        succ = [x for x in rows if x["outcome"] == "success"]
-        partial = [x for x in rows if x["outcome"] == "partial"]
-        blocked = [x for x in rows if x["outcome"] == "blocked/challenged"]
-        timeout = [x for x in rows if x["outcome"] == "timeout"]
-        crash = [x for x in rows if x["outcome"] == "crash/error"]
-
-        # Timing stats from all non-crash runs
-        all_times = [x["duration_s"] for x in rows if x["outcome"] not in ("crash/error",)]
-        succ_times = [x["duration_s"] for x in succ]
-        nav_times = [x["navigation_s"] for x in rows if x.get("navigation_s") is not None]
-        extract_times = [x["extraction_s"] for x in rows if x.get("extraction_s") is not None]
-
-        completeness = []
-        gt_correctness_all = []
-        gt_correctness_success = []
-        for row in rows:
-            expected = len(row["expected"])
-            got = sum(1 for field in row["expected"] if row["extracted"].get(field))
-            completeness.append(100 * got / expected if expected else 0)
-            gt = row.get("ground_truth", {})
-            gt_pct = gt.get("correctness_pct")
-            if gt_pct is not None:
-                gt_correctness_all.append(gt_pct)
-                if row["outcome"] == "success":
-                    gt_correctness_success.append(gt_pct)
-
-        failure_reasons = Counter(row.get("failure_reason") for row in rows if row.get("failure_reason"))
-        setup_failures = sum(1 for row in rows if row.get("failure_category") == "setup")
-        startup_failures = sum(1 for row in rows if row.get("failure_category") == "startup")
-        site_failures = sum(1 for row in rows if row.get("failure_category") == "site")
-        extraction_failures = sum(1 for row in rows if row.get("failure_category") == "extraction")
-        stability = max(0, 100 - (len(timeout) + len(crash)) * 8)
 
-        summary.append(
-            {
-                "tool": tool,
-                "site": site,
-                "attempts": len(rows),
-                "success": len(succ),
-                "partial": len(partial),
-                "blocked": len(blocked),
-                "timeout": len(timeout),
-                "crash": len(crash),
-                "success_rate": f"{len(succ)}/{len(rows)}",
-                "success_rate_pct": round(100 * len(succ) / len(rows), 2),
-                "block_rate_pct": round(100 * len(blocked) / len(rows), 2),
-                "partial_rate_pct": round(100 * len(partial) / len(rows), 2),
-                "timing_total": timing_stats(all_times),
-                "timing_success": timing_stats(succ_times),
-                "timing_navigation": timing_stats(nav_times),
-                "timing_extraction": timing_stats(extract_times),
-                "data_completeness_pct": round(sum(completeness) / len(completeness), 2),
-                "correctness_pct": round(sum(gt_correctness_all) / len(gt_correctness_all), 2) if gt_correctness_all else None,
-                "correctness_success_only_pct": round(sum(gt_correctness_success) / len(gt_correctness_success), 2) if gt_correctness_success else None,
-                "stability_score": round(stability, 2),
-                "setup_failures": setup_failures,
-                "startup_failures": startup_failures,
-                "site_failures": site_failures,
-                "extraction_failures": extraction_failures,
-                "failure_reasons": dict(failure_reasons),
-            }
-        )
-    return summary
+def _run_chain(
+    tool: str,
+    site: str,
+    n_attempts: int,
+    fn: Any,
+    checks: Dict[str, Any],
+    sink: AttemptSink,
+    completed: Set[Tuple[str, str, int]],
+) -> List[str]:
+    """Every attempt of one tool on one site not in ``completed``, cold first, each under a LIMITS slot.
+
+    Records go to ``sink``; returns the run ids of the attempts it ran.
+    """
+    run_ids: List[str] = []
+    cfg = URLS[site]
+    try:
+        for attempt in range(1, n_attempts + 1):
+            if (tool, site, attempt) in completed:
+                continue
+            cold = (attempt == 1)
+            with LIMITS.slot(tool, site):
+                rec = fn(site, cfg, attempt, cold, checks)
+            attempt_log.close_log(Path(rec["artifact_dir"]))
+            sink.add(rec)
+            run_ids.append(rec["run_id"])
+            # One write per line, so lines from concurrent chains don't interleave
+            print(f"done {tool} {site} attempt={attempt}/{n_attempts} cold={cold} outcome={rec['outcome']}\n",
+                  end="", flush=True)
+            if attempt < n_attempts and ATTEMPT_GAP_S > 0:
+                time.sleep(ATTEMPT_GAP_S)
+    finally:
+        # The chain's browser worker (if any) can serve the tool's next chain
+        if WORKER_POOL is not None:
+            WORKER_POOL.release(tool, site)
+    return run_ids
 
 
 def _run_benchmark_loop(
@@ -1069,19 +1267,32 @@ def _run_benchmark_loop(
     n_attempts: int,
     fn_by_tool: Dict[str, Any],
     checks: Dict[str, Any],
+    extra: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
-    records: List[Dict[str, Any]] = []
-    for tool in tool_order:
-        for site in site_order:
-            cfg = URLS[site]
-            for attempt in range(1, n_attempts + 1):
-                cold = (attempt == 1)
-                rec = fn_by_tool[tool](site, cfg, attempt, cold, checks)
-                records.append(rec)
-                print(f"done {tool} {site} attempt={attempt}/{n_attempts} cold={cold} outcome={rec['outcome']}", flush=True)
-                if attempt < n_attempts:
-                    time.sleep(2)
-    return records
+    """Run every (tool, site) chain, concurrently within LIMITS, and return the summary.
+
+    Records (with ``extra`` keys added) stream to RES as they finish: see
+    attempt_sink.AttemptSink.
+    """
+    sink = AttemptSink(RES, extra, tool_order, site_order)
+    completed = load_completed(ART, sink, tool_order, site_order, n_attempts) if RESUME else set()
+    if RESUME:
+        print(f"Resuming: {len(completed)} attempts already recorded in {ART}", flush=True)
+    chains = [
+        functools.partial(_run_chain, tool, site, n_attempts, fn_by_tool[tool], checks, sink, completed)
+        for tool in tool_order
+        for site in site_order
+    ]
+    try:
+        run_chains(chains, LIMITS)
+    finally:
+        sink.close()
+        # Logs of attempts cut short by an exception
+        attempt_log.close_all()
+        # Workers were launched for this loop's headless setting
+        if WORKER_POOL is not None:
+            WORKER_POOL.close()
+    return sink.summary()
 
 
 def _run_mode_comparison(
@@ -1105,13 +1316,8 @@ def _run_mode_comparison(
         RES = mode_res
         print(f"\n== Running in {mode} mode ==", flush=True)
 
-        records = _run_benchmark_loop(tool_order, site_order, n_attempts, fn_by_tool, checks)
-        for rec in records:
-            rec["mode"] = mode
-        json_dump(mode_res / "attempts.json", records)
-        summary = summarize(records)
-        json_dump(mode_res / "summary.json", summary)
-        mode_results[mode] = {"records": records, "summary": summary}
+        summary = _run_benchmark_loop(tool_order, site_order, n_attempts, fn_by_tool, checks, {"mode": mode})
+        mode_results[mode] = {"summary": summary}
 
     # Build comparison
     comparison: List[Dict[str, Any]] = []
@@ -1178,13 +1384,10 @@ def _run_stealth_comparison(
         label = f"{'headless' if headless else 'headed'}, {'no cookies' if no_cookies else 'with cookies'}"
         print(f"\n== Running: {label} ==", flush=True)
 
-        records = _run_benchmark_loop(tool_order, site_order, n_attempts, fn_by_tool, checks)
-        for rec in records:
-            rec["mode"] = config_name
-        json_dump(mode_res / "attempts.json", records)
-        summary = summarize(records)
-        json_dump(mode_res / "summary.json", summary)
-        mode_results[config_name] = {"records": records, "summary": summary}
+        summary = _run_benchmark_loop(
+            tool_order, site_order, n_attempts, fn_by_tool, checks, {"mode": config_name}
+        )
+        mode_results[config_name] = {"summary": summary}
 
     # Build and save comparison report
     comparison = _build_stealth_comparison(mode_results)
@@ -1229,14 +1432,13 @@ def _build_stealth_comparison(mode_results: Dict[str, Any]) -> Dict[str, Any]:
     # Aggregate per-tool across all sites
     per_tool: Dict[str, Dict[str, Dict[str, int]]] = {}
     for config_name, data in mode_results.items():
-        for rec in data["records"]:
-            tool = rec["tool"]
-            per_tool.setdefault(tool, {}).setdefault(config_name, {"total": 0, "success": 0, "blocked": 0})
-            per_tool[tool][config_name]["total"] += 1
-            if rec["outcome"] == "success":
-                per_tool[tool][config_name]["success"] += 1
-            elif rec["outcome"] == "blocked/challenged":
-                per_tool[tool][config_name]["blocked"] += 1
+        for s in data["summary"]:
+            counts = per_tool.setdefault(s["tool"], {}).setdefault(
+                config_name, {"total": 0, "success": 0, "blocked": 0}
+            )
+            counts["total"] += s["attempts"]
+            counts["success"] += s["success"]
+            counts["blocked"] += s["blocked"]
 
     tool_summary: List[Dict[str, Any]] = []
     for tool, modes in sorted(per_tool.items()):
@@ -1257,12 +1459,17 @@ def _build_stealth_comparison(mode_results: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def main() -> None:
-    global ART, RES, HEADLESS, NO_COOKIES
+    global ART, RES, HEADLESS, NO_COOKIES, EXTRACT_CACHE, LIMITS, WORKER_POOL, REUSE_CONTEXT, DAEMON_CLIENT
+    global WAIT_MODE, MAX_WAIT_MS, ATTEMPT_GAP_S, RESUME
 
     parser = argparse.ArgumentParser(description="Run browser automation benchmark")
     parser.add_argument("--tools", nargs="*", choices=["agent-browser", "camofox-browser", "Scrapling"])
     parser.add_argument("--sites", nargs="*", choices=sorted(URLS))
     parser.add_argument("--name", help="Custom name for this run (default: timestamp)")
+    parser.add_argument("--resume", metavar="NAME",
+                        help="Finish an interrupted run under runs/NAME: attempts with a record.json are "
+                             "skipped, the rest run, and summaries and comparison reports are rebuilt "
+                             "(pass the same mode, tool, site and attempt flags as the original run)")
     parser.add_argument("--attempts", type=int, default=5,
                         help="Number of attempts per tool/site combination (default: 5)")
     parser.add_argument("--headless", action="store_true", default=False,
@@ -1273,12 +1480,69 @@ def main() -> None:
                         help="Skip cookie loading/injection for all tools")
     parser.add_argument("--compare-stealth", action="store_true", default=False,
                         help="Run 4 configurations (headed/headless x cookies/no-cookies) and compare")
+    parser.add_argument("--no-extract-cache", action="store_true", default=False,
+                        help="Always run extraction instead of reusing cached results for identical pages")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Attempts run at once across tool/site chains; 0 = one per CPU core (default: 1)")
+    parser.add_argument("--per-tool", type=int, default=None,
+                        help="Max concurrent attempts of any one tool (default: no cap beyond --workers)")
+    parser.add_argument("--per-site", type=int, default=1,
+                        help="Max concurrent attempts against any one site (default: 1)")
+    parser.add_argument("--compress-logs", action="store_true", default=False,
+                        help="Write each attempt's log as log.jsonl.gz instead of log.jsonl")
+    parser.add_argument("--no-daemon-client", action="store_true", default=False,
+                        help="Run every agent-browser step through the CLI instead of the daemon socket")
+    parser.add_argument("--persistent-workers", action="store_true", default=False,
+                        help="Run camofox/Scrapling attempts on long-lived browser workers instead of one "
+                             "process per attempt (cold attempts still get a fresh context)")
+    parser.add_argument("--reuse-context", action="store_true", default=False,
+                        help="With --persistent-workers, warm camofox attempts keep the previous attempt's context")
+    parser.add_argument("--wait-mode", choices=readiness.WAIT_MODES, default="fixed",
+                        help="Page wait before capture: a fixed 6 s, or adaptive (until the site's ready "
+                             "selector or JSON-LD appears, at most --max-wait-ms) (default: fixed)")
+    parser.add_argument("--max-wait-ms", type=int, default=readiness.MAX_WAIT_MS,
+                        help=f"Longest adaptive wait in ms (default: {readiness.MAX_WAIT_MS})")
+    parser.add_argument("--attempt-gap", type=float, default=2.0,
+                        help="Seconds between a chain's attempts (default: 2)")
     args = parser.parse_args()
 
     if args.compare_stealth and args.compare_modes:
         parser.error("--compare-stealth and --compare-modes are mutually exclusive")
+    if args.resume and args.name:
+        parser.error("--resume and --name are mutually exclusive (--resume takes the run's name)")
 
     global NO_COOKIES
+    if args.no_extract_cache:
+        EXTRACT_CACHE = None
+
+    try:
+        LIMITS = ConcurrencyLimits(args.workers, args.per_tool, args.per_site)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if not LIMITS.sequential:
+        print(f"Running up to {LIMITS.workers} attempts at once", flush=True)
+
+    if args.no_daemon_client:
+        DAEMON_CLIENT = False
+
+    if args.compress_logs:
+        attempt_log.COMPRESS = True
+
+    if args.max_wait_ms < 0 or args.attempt_gap < 0:
+        parser.error("--max-wait-ms and --attempt-gap must be >= 0")
+    WAIT_MODE = args.wait_mode
+    MAX_WAIT_MS = args.max_wait_ms
+    ATTEMPT_GAP_S = args.attempt_gap
+    if WAIT_MODE == "adaptive":
+        print(f"Waiting for page readiness (at most {MAX_WAIT_MS} ms)", flush=True)
+
+    if args.reuse_context and not args.persistent_workers:
+        parser.error("--reuse-context requires --persistent-workers")
+    if args.persistent_workers:
+        WORKER_POOL = WorkerPool(cwd=BASE)
+        REUSE_CONTEXT = args.reuse_context
+        print("Running camofox/Scrapling on persistent browser workers", flush=True)
+
     if args.no_cookies:
         NO_COOKIES = True
         print("Running without cookies (--no-cookies flag)", flush=True)
@@ -1319,8 +1583,12 @@ def main() -> None:
             HEADLESS = True
             print("WARNING: No display detected, falling back to headless mode", flush=True)
 
-    run_name = args.name or datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    run_name = args.resume or args.name or datetime.now().strftime("%Y-%m-%d_%H%M%S")
     run_dir = RUNS_DIR / run_name
+    if args.resume:
+        if not run_dir.is_dir():
+            parser.error(f"no run to resume: {run_dir}")
+        RESUME = True
     ART = run_dir / "artifacts"
     RES = run_dir / "results"
     ART.mkdir(parents=True, exist_ok=True)
@@ -1344,11 +1612,9 @@ def main() -> None:
     elif args.compare_modes:
         _run_mode_comparison(tool_order, site_order, n_attempts, fn_by_tool, checks, run_dir)
     else:
-        records = _run_benchmark_loop(tool_order, site_order, n_attempts, fn_by_tool, checks)
-        json_dump(RES / "attempts.json", records)
-        summary = summarize(records)
-        json_dump(RES / "summary.json", summary)
-        print(f"completed benchmark, attempts={len(records)}, run={run_name}", flush=True)
+        summary = _run_benchmark_loop(tool_order, site_order, n_attempts, fn_by_tool, checks)
+        attempts = sum(s["attempts"] for s in summary)
+        print(f"completed benchmark, attempts={attempts}, run={run_name}", flush=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""Talk to a running agent-browser daemon over its Unix socket instead of spawning the CLI per step.
+
+The CLI starts one daemon per ``--session`` and forwards each command to it
+as a JSON request on ``<AGENT_BROWSER_SOCKET_DIR>/<session>.sock``. A
+``DaemonClient`` keeps one connection to that socket and sends the same
+requests itself, so a step costs a round trip instead of a Node start-up
+and a fresh connection.
+
+``DaemonClient.run`` takes the agent-browser command line a step would
+have run and returns a ``run_logged``-style result whose ``stdout`` is
+what the CLI prints for that command, so callers parse both the same way.
+It returns None for commands it has no request for, and once the daemon
+rejects a request as unknown (or replies without the field a command
+prints) it returns None for everything: the caller then runs the CLI, as
+before. tests/test_agent_daemon.py compares both paths against an
+installed agent-browser.
+"""
+
+import itertools
+import json
+import re
+import socket
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Seconds allowed to connect to the socket
+CONNECT_TIMEOUT = 5
+# Largest single reply line accepted (page HTML comes back through eval)
+MAX_REPLY = 256 * 1024 * 1024
+
+# A daemon error meaning "no such request" (older or newer protocol) rather than a failed step
+_UNSUPPORTED_PAT = re.compile(r"unknown (?:action|command)|invalid (?:action|command)|not supported", re.I)
+
+# CLI options that take a value and don't change a command's meaning once the daemon runs
+_VALUE_OPTIONS = {"--session", "--state"}
+_FLAG_OPTIONS = {"--headed", "--json"}
+
+
+def _words(data: Dict[str, Any], key: str) -> str:
+    value = data.get(key)
+    if value is None:
+        raise KeyError(key)
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+# CLI command (positional words) -> (request builder, stdout formatter from the reply data).
+# Only commands whose stdout is one reply field, or is ignored, are listed: a formatter raises
+# KeyError when that field is missing, so a daemon speaking another protocol falls back to the
+# CLI. open, cookies and screenshot print summaries this client can't reproduce, so the CLI runs them.
+_COMMANDS: Dict[Tuple[str, ...], Tuple[Callable[[List[str]], Dict[str, Any]], Callable[[Any], str]]] = {
+    ("wait",): (lambda a: {"action": "wait", "timeout": int(a[0])}, lambda d: ""),
+    ("get", "title"): (lambda a: {"action": "title"}, lambda d: _words(d, "title")),
+    ("get", "url"): (lambda a: {"action": "url"}, lambda d: _words(d, "url")),
+    ("eval",): (lambda a: {"action": "evaluate", "script": a[0]}, lambda d: json.dumps(d["result"])),
+    ("snapshot",): (lambda a: {"action": "snapshot"}, lambda d: _words(d, "snapshot")),
+    ("close",): (lambda a: {"action": "close"}, lambda d: ""),
+}
+
+
+def parse_command(command: List[str]) -> Optional[Tuple[Tuple[str, ...], List[str]]]:
+    """(command words, arguments) of an ``agent-browser ...`` command line; None for anything else."""
+    if not command or Path(command[0]).name != "agent-browser":
+        return None
+    words: List[str] = []
+    args = iter(command[1:])
+    for arg in args:
+        if arg in _VALUE_OPTIONS:
+            next(args, None)
+        elif arg in _FLAG_OPTIONS:
+            continue
+        elif arg.startswith("--"):
+            # An option this client doesn't know may change what the command does
+            return None
+        else:
+            words.append(arg)
+    for size in (2, 1):
+        key = tuple(words[:size])
+        if key in _COMMANDS:
+            return key, words[size:]
+    return None
+
+
+class DaemonClient:
+    """One connection to a session's daemon; ``run`` sends a CLI command's request over it."""
+
+    def __init__(self, session: str, socket_dir: Path) -> None:
+        self.session = session
+        self.path = Path(socket_dir) / f"{session}.sock"
+        self.supported = True
+        self._ids = itertools.count(1)
+        self._open()
+
+    def _open(self) -> None:
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(CONNECT_TIMEOUT)
+        self._sock.connect(str(self.path))
+        self._reader = self._sock.makefile("rb")
+        # Set after a timed-out read, which leaves the reader unusable
+        self._stale = False
+
+    @classmethod
+    def connect(cls, session: str, socket_dir: Path) -> Optional["DaemonClient"]:
+        """A client for the session's running daemon, or None when its socket can't be reached."""
+        try:
+            return cls(session, socket_dir)
+        except OSError:
+            return None
+
+    def request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one request and return its reply (replies to abandoned earlier requests are skipped).
+
+        Raises TimeoutError when no reply arrives in time, OSError when the
+        connection breaks.
+        """
+        if self._stale:
+            self.close()
+            self._open()
+        req_id = str(next(self._ids))
+        self._sock.settimeout(timeout)
+        self._sock.sendall((json.dumps(dict(payload, id=req_id)) + "\n").encode())
+        deadline = time.monotonic() + timeout
+        while True:
+            self._sock.settimeout(max(deadline - time.monotonic(), 0.001))
+            try:
+                line = self._reader.readline(MAX_REPLY)
+            except socket.timeout as exc:
+                self._stale = True
+                raise TimeoutError(f"no reply to {payload.get('action')} within {timeout}s") from exc
+            if not line:
+                raise ConnectionError("agent-browser daemon closed the connection")
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(reply, dict) and str(reply.get("id")) == req_id:
+                return reply
+
+    def run(self, command: List[str], timeout: float) -> Optional[Dict[str, Any]]:
+        """The ``run_logged`` result of ``command`` run through the daemon; None to run the CLI instead."""
+        parsed = parse_command(command) if self.supported else None
+        if parsed is None:
+            return None
+        key, args = parsed
+        build, render = _COMMANDS[key]
+        try:
+            payload = build(args)
+        except (IndexError, ValueError):
+            return None
+        started = time.time()
+        result: Dict[str, Any] = {
+            "returncode": 0, "stdout": "", "stderr": "", "timeout": False,
+            "command": f"{self.path} <- {json.dumps(payload)[:200]}",
+        }
+        try:
+            reply = self.request(payload, timeout)
+        except TimeoutError:
+            result.update(returncode=None, timeout=True)
+        except OSError:
+            # The daemon went away (or never spoke this protocol): the CLI takes over
+            self.supported = False
+            return None
+        else:
+            if reply.get("success"):
+                try:
+                    result["stdout"] = render(reply.get("data") or {})
+                except KeyError:
+                    self.supported = False
+                    return None
+            else:
+                error = str(reply.get("error") or f"agent-browser {key[0]} failed")
+                if _UNSUPPORTED_PAT.search(error):
+                    self.supported = False
+                    return None
+                result.update(returncode=1, stderr=error)
+        result["elapsed_s"] = round(time.time() - started, 3)
+        return result
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+            self._sock.close()
+        except OSError:
+            pass
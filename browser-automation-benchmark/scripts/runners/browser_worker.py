@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Long-lived browser worker for camofox-browser and Scrapling attempts.
+
+Started by ``runners.pool.BrowserWorker`` as ``browser_worker.py <tool>
+[--headless]``. The worker imports its tool once, keeps the browser open and
+runs navigation jobs read from stdin, one JSON object per line:
+
+    -> {"op": "fetch", "url", "out", "cookies", "cookie_summary", "fresh",
+        "reuse_context", "ready_script", "state_path" | "profile"}
+    <- {"returncode", "stdout", "stderr", "launch_s", "reused"}
+    -> {"op": "close"}
+
+Once the tool is imported (and, for camofox, the browser launched) it
+prints ``{"ready": true, "launch_s": ...}``, or ``{"ready": false,
+"error": ...}`` and exits. A job does what the per-attempt inline script
+in run_benchmark.py does, and its reply carries what that script would
+have printed (including the ``__TIMING__`` line) and any traceback, so
+replies parse exactly like a one-shot run. ``launch_s`` is the time the
+job spent on a fresh context or session; ``reused`` says whether it ran
+in the previous job's browser state.
+
+A ``fresh`` job (a cold attempt) always gets a new context (camofox) or a
+new session on a wiped profile (Scrapling). Other jobs reuse the browser;
+camofox gives them a new context unless ``reuse_context`` is set.
+
+A job with a ``ready_script`` (readiness.py) waits until that in-page
+check resolves instead of the fixed wait.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO
+
+# Navigation settings shared with the inline scripts in run_benchmark.py
+NAV_TIMEOUT_MS = 45000
+WAIT_MS = 6000
+
+
+def wait_ready(page: Any, ready_script: Optional[str]) -> Dict[str, Any]:
+    """Wait for the page (fixed, or until its readiness check resolves): ``{"wait_s", "ready"}``."""
+    started = time.time()
+    ready = None
+    if ready_script:
+        result = page.evaluate(ready_script)
+        ready = bool(result.get("ready")) if isinstance(result, dict) else None
+    else:
+        page.wait_for_timeout(WAIT_MS)
+    return {"wait_s": round(time.time() - started, 3), "ready": ready}
+
+
+class CamoufoxWorker:
+    """One Camoufox browser; a context per job, or one reused across warm jobs."""
+
+    def __init__(self, headless: bool) -> None:
+        from camoufox.sync_api import Camoufox
+
+        os.environ["MOZ_ENABLE_WAYLAND"] = "0"
+        self._manager = Camoufox(headless=headless, humanize=not headless)
+        self.browser = self._manager.__enter__()
+        self.context: Any = None
+
+    def _close_context(self) -> None:
+        if self.context is not None:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+            self.context = None
+
+    def fetch(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        out = Path(job["out"])
+        state_path = Path(job["state_path"])
+        cookies = job["cookies"]
+        print(json.dumps({
+            "tool": "camofox-browser",
+            "cookie_count": len(cookies),
+            "cookies": job["cookie_summary"],
+            "state_path": str(state_path),
+            "import_mode": "context.add_cookies",
+        }))
+        reused = self.context is not None and job["reuse_context"] and not job["fresh"]
+        started = time.time()
+        if not reused:
+            self._close_context()
+            self.context = self.browser.new_context()
+            if cookies:
+                self.context.add_cookies(cookies)
+        launch_s = time.time() - started
+
+        context = self.context
+        page = context.new_page()
+        _nav_start = time.time()
+        waited: Dict[str, Any] = {}
+        try:
+            page.goto(job["url"], wait_until="domcontentloaded", timeout=NAV_TIMEOUT_MS)
+            waited = wait_ready(page, job.get("ready_script"))
+        finally:
+            _nav_end = time.time()
+            try:
+                (out / "url.txt").write_text(page.url)
+            except Exception:
+                pass
+            try:
+                (out / "title.txt").write_text(page.title())
+            except Exception:
+                pass
+            try:
+                (out / "page.html").write_text(page.content())
+            except Exception:
+                pass
+            try:
+                page.screenshot(path=str(out / "screen.png"), full_page=True)
+            except Exception:
+                pass
+            try:
+                context.storage_state(path=str(state_path))
+            except Exception:
+                pass
+            try:
+                page.close()
+            except Exception:
+                pass
+            if not job["reuse_context"]:
+                self._close_context()
+        print("__TIMING__" + json.dumps({"navigation_s": round(_nav_end - _nav_start, 3), **waited}))
+        return {"launch_s": launch_s, "reused": reused}
+
+    def close(self) -> None:
+        self._close_context()
+        self._manager.__exit__(None, None, None)
+
+
+class ScraplingWorker:
+    """One StealthySession (a persistent browser profile), reopened on a wiped profile for fresh jobs."""
+
+    def __init__(self, headless: bool) -> None:
+        from scrapling.fetchers import StealthySession
+
+        self._session_cls = StealthySession
+        self.headless = headless
+        self.session: Any = None
+        self.profile: Optional[str] = None
+
+    def _close_session(self) -> None:
+        if self.session is not None:
+            try:
+                self.session.__exit__(None, None, None)
+            except Exception:
+                pass
+            self.session = None
+
+    def fetch(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        out = Path(job["out"])
+        url = job["url"]
+        profile = job["profile"]
+        cookies = job["cookies"]
+        print(json.dumps({
+            "tool": "Scrapling",
+            "cookie_count": len(cookies),
+            "cookies": job["cookie_summary"],
+            "profile": profile,
+            "import_mode": "StealthySession(cookies=...)",
+        }))
+        reused = self.session is not None and not job["fresh"] and profile == self.profile
+        started = time.time()
+        if not reused:
+            self._close_session()
+            if job["fresh"]:
+                shutil.rmtree(profile, ignore_errors=True)
+            Path(profile).mkdir(parents=True, exist_ok=True)
+            session = self._session_cls(user_data_dir=profile, cookies=cookies)
+            self.session = session.__enter__()
+            self.profile = profile
+        launch_s = time.time() - started
+
+        captured = {"html": ""}
+        ready_script = job.get("ready_script")
+        waited: Dict[str, Any] = {}
+
+        def page_action(page: Any) -> None:
+            try:
+                waited.update(wait_ready(page, ready_script))
+            finally:
+                try:
+                    captured["html"] = page.content()
+                except Exception:
+                    pass
+                try:
+                    page.screenshot(path=str(out / "screen.png"), full_page=True)
+                except Exception:
+                    pass
+
+        _nav_start = time.time()
+        # The adaptive check replaces Scrapling's own post-load wait as well
+        response = self.session.fetch(url, headless=self.headless, timeout=NAV_TIMEOUT_MS,
+                                      wait=0 if ready_script else WAIT_MS, page_action=page_action)
+        _nav_end = time.time()
+        # Try multiple ways to get HTML content
+        html = response.text or ""
+        if not html:
+            html = getattr(response, "html", "") or ""
+        if not html:
+            html = getattr(response, "body", b"")
+            if isinstance(html, bytes):
+                html = html.decode("utf-8", errors="ignore")
+        # Use page_action capture as fallback
+        if not html and captured["html"]:
+            html = captured["html"]
+        (out / "page.html").write_text(html)
+        (out / "url.txt").write_text(getattr(response, "url", url))
+        print("__TIMING__" + json.dumps({"navigation_s": round(_nav_end - _nav_start, 3), **waited}))
+        return {"launch_s": launch_s, "reused": reused}
+
+    def close(self) -> None:
+        self._close_session()
+
+
+WORKERS = {"camofox-browser": CamoufoxWorker, "Scrapling": ScraplingWorker}
+
+
+def send(channel: TextIO, payload: Dict[str, Any]) -> None:
+    channel.write(json.dumps(payload) + "\n")
+    channel.flush()
+
+
+def run_job(worker: Any, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one job, returning what it printed and how it ended in the shape of a subprocess result."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    reply: Dict[str, Any] = {"returncode": 0, "launch_s": 0.0, "reused": False}
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            reply.update(worker.fetch(job))
+        except Exception:
+            traceback.print_exc()
+            reply["returncode"] = 1
+    reply["stdout"] = stdout.getvalue()
+    reply["stderr"] = stderr.getvalue()
+    return reply
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Persistent browser worker (spoken to over stdin/stdout)")
+    parser.add_argument("tool", choices=sorted(WORKERS))
+    parser.add_argument("--headless", action="store_true", default=False)
+    args = parser.parse_args()
+
+    # Replies get the real stdout; anything else printed (by the tool, or by
+    # the browser it launches) goes to stderr so it can't corrupt the stream
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    started = time.time()
+    try:
+        worker = WORKERS[args.tool](args.headless)
+    except Exception:
+        send(channel, {"ready": False, "error": traceback.format_exc()})
+        sys.exit(1)
+    send(channel, {"ready": True, "launch_s": round(time.time() - started, 3)})
+
+    try:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            if job.get("op") == "close":
+                break
+            send(channel, run_job(worker, job))
+    finally:
+        worker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Persistent browser workers (runners/browser_worker.py) and the pool that leases them to attempt chains."""
+
+import json
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+WORKER_SCRIPT = Path(__file__).with_name("browser_worker.py")
+
+# Seconds a worker gets to import its tool and launch the browser
+STARTUP_TIMEOUT = 120
+# Seconds a worker gets to exit after "close" before it is killed
+CLOSE_TIMEOUT = 15
+# Worker stderr lines kept between jobs (attached to the next reply)
+STDERR_LINES = 2000
+
+
+class WorkerError(RuntimeError):
+    """A worker failed to start or stopped answering."""
+
+
+class BrowserWorker:
+    """One worker process: newline-delimited JSON jobs in, replies out, stderr collected per job."""
+
+    def __init__(self, tool: str, headless: bool, cwd: Optional[Path] = None) -> None:
+        self.tool = tool
+        self.headless = headless
+        # Whether the last read gave up waiting (rather than the worker exiting)
+        self.timed_out = False
+        started = time.time()
+        command = [sys.executable, str(WORKER_SCRIPT), tool] + (["--headless"] if headless else [])
+        self.command = " ".join(command)
+        self.proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=str(cwd) if cwd is not None else None,
+        )
+        self._replies: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr: Deque[str] = deque(maxlen=STDERR_LINES)
+        self._stderr_lock = threading.Lock()
+        threading.Thread(target=self._pump_replies, daemon=True).start()
+        self._stderr_pump = threading.Thread(target=self._pump_stderr, daemon=True)
+        self._stderr_pump.start()
+        ready = self._read(STARTUP_TIMEOUT)
+        if not ready or not ready.get("ready"):
+            self.kill()
+            detail = (ready or {}).get("error") or self.drain_stderr() or "no reply"
+            raise WorkerError(f"{tool} worker failed to start: {detail.strip()}")
+        # Process start, tool import and (camofox) browser launch, as seen from here
+        self.launch_s = time.time() - started
+
+    def _pump_replies(self) -> None:
+        assert self.proc.stdout is not None
+        for line in self.proc.stdout:
+            self._replies.put(line)
+        self._replies.put(None)
+
+    def _pump_stderr(self) -> None:
+        assert self.proc.stderr is not None
+        for line in self.proc.stderr:
+            with self._stderr_lock:
+                self._stderr.append(line)
+
+    def _read(self, timeout: float) -> Optional[Dict[str, Any]]:
+        self.timed_out = False
+        try:
+            line = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            self.timed_out = True
+            return None
+        if line is None:
+            return None
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def drain_stderr(self) -> str:
+        with self._stderr_lock:
+            lines = list(self._stderr)
+            self._stderr.clear()
+        return "".join(lines)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def request(self, job: Dict[str, Any], timeout: float) -> Optional[Dict[str, Any]]:
+        """Send a job and wait for its reply; None (and the worker killed) on timeout or exit."""
+        assert self.proc.stdin is not None
+        try:
+            self.proc.stdin.write(json.dumps(job) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return None
+        reply = self._read(timeout)
+        if reply is None:
+            self.kill()
+        return reply
+
+    def kill(self) -> None:
+        if self.alive:
+            self.proc.kill()
+        self.proc.wait()
+        # Let the last stderr lines in before anyone drains them
+        self._stderr_pump.join(timeout=1)
+
+    def close(self) -> None:
+        if not self.alive:
+            return
+        try:
+            assert self.proc.stdin is not None
+            self.proc.stdin.write(json.dumps({"op": "close"}) + "\n")
+            self.proc.stdin.flush()
+            self.proc.wait(timeout=CLOSE_TIMEOUT)
+        except (BrokenPipeError, OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+
+class WorkerPool:
+    """Workers per tool, leased to one (tool, site) chain at a time.
+
+    A chain's attempts all run on the worker it leased, so warm attempts
+    reuse the browser the cold attempt left open. A released worker goes
+    back to its tool's idle list and serves later chains (whose first,
+    cold attempt asks it for a fresh context). Workers that time out or die
+    are dropped, and the next attempt starts a new one.
+    """
+
+    def __init__(self, cwd: Optional[Path] = None) -> None:
+        self.cwd = cwd
+        self._idle: Dict[Tuple[str, bool], List[BrowserWorker]] = {}
+        self._leased: Dict[Tuple[str, str], BrowserWorker] = {}
+        self._lock = threading.Lock()
+
+    def run(self, tool: str, site: str, headless: bool, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Run a job on the chain's worker, as a run_logged-style result plus ``launch_s`` and ``reused``.
+
+        ``launch_s`` adds the worker's own start-up when this attempt had to
+        start one; ``reused`` is true when the job ran in the browser state
+        an earlier attempt left.
+        """
+        started = time.time()
+        launch_s = 0.0
+        result: Dict[str, Any] = {
+            "returncode": None, "stdout": "", "stderr": "", "timeout": False, "launch_s": 0.0, "reused": False,
+        }
+        try:
+            worker, started_new = self._lease(tool, site, headless)
+        except WorkerError as exc:
+            result.update(returncode=1, stderr=str(exc), elapsed_s=round(time.time() - started, 3),
+                          command=f"{tool} worker")
+            return result
+        if started_new:
+            launch_s = worker.launch_s
+        reply = worker.request(dict(job, op="fetch"), timeout)
+        result["command"] = f"{worker.command} <- fetch {job.get('url', '')}"
+        stderr = worker.drain_stderr()
+        if reply is None:
+            self._drop(tool, site)
+            result.update(timeout=worker.timed_out, stderr=stderr)
+            if not worker.timed_out:
+                result["returncode"] = worker.proc.returncode
+        else:
+            result.update(
+                returncode=reply["returncode"],
+                stdout=reply["stdout"],
+                stderr=reply["stderr"] + stderr,
+                launch_s=launch_s + reply["launch_s"],
+                reused=reply["reused"],
+            )
+        result["elapsed_s"] = round(time.time() - started, 3)
+        return result
+
+    def _lease(self, tool: str, site: str, headless: bool) -> Tuple[BrowserWorker, bool]:
+        with self._lock:
+            worker = self._leased.get((tool, site))
+            if worker is not None and worker.alive and worker.headless == headless:
+                return worker, False
+            if worker is not None:
+                # Leased with the other headless setting: back to its idle list, not leaked
+                del self._leased[(tool, site)]
+                if worker.alive:
+                    self._idle.setdefault((worker.tool, worker.headless), []).append(worker)
+            idle = self._idle.get((tool, headless), [])
+            while idle:
+                worker = idle.pop()
+                if worker.alive:
+                    self._leased[(tool, site)] = worker
+                    return worker, False
+        worker = BrowserWorker(tool, headless, self.cwd)
+        with self._lock:
+            self._leased[(tool, site)] = worker
+        return worker, True
+
+    def _drop(self, tool: str, site: str) -> None:
+        with self._lock:
+            worker = self._leased.pop((tool, site), None)
+        if worker is not None:
+            worker.kill()
+
+    def release(self, tool: str, site: str) -> None:
+        """End a chain's lease; its worker becomes idle for the tool's next chain."""
+        with self._lock:
+            worker = self._leased.pop((tool, site), None)
+            if worker is not None and worker.alive:
+                self._idle.setdefault((worker.tool, worker.headless), []).append(worker)
+
+    def close(self) -> None:
+        """Stop every worker, idle or leased."""
+        with self._lock:
+            workers = list(self._leased.values()) + [w for ws in self._idle.values() for w in ws]
+            self._leased.clear()
+            self._idle.clear()
+        for worker in workers:
+            worker.close()
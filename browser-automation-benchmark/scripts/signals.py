@@ -0,0 +1,176 @@
+"""Block and failure signals, from lowercase copies of bounded windows of the text.
+
+classify_page() looks for block phrases (BLOCK_PAT) and a site's
+soft-block required elements in the first ``HEAD_CHARS`` characters, and
+for the forbidden marker anywhere in the page. The head is lowercased once
+and every head check reads that copy; the marker search over the whole
+page needs no copy at all.
+
+classify_runtime_failure() tries the failure rules in priority order over
+the head and tail of each output stream only, so a tool that printed a
+whole page on stdout is classified as fast as one that printed a line.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple, Union
+
+from config import BLOCK_PAT, FORBIDDEN_MARKER, SETUP_PATTERNS, SOFT_BLOCK_INDICATORS, STARTUP_PATTERNS, TIMEOUT_PATTERNS
+from extractors.pagebytes import Buffer, bytes_pattern, decode_head
+
+# Block phrases and soft-block elements are only looked for this far into the page
+HEAD_CHARS = 30000
+
+# Failure rules search this much of the start and of the end of each output
+# stream (errors are printed first or, for tracebacks, last)
+RUNTIME_HEAD_CHARS = 16 * 1024
+RUNTIME_TAIL_CHARS = 64 * 1024
+
+# Escapes whose meaning lowercasing would change (\S -> \s, \D -> \d, ...)
+_UPPER_ESCAPE_PAT = re.compile(r"\\[A-Z]")
+
+
+def lowered(pattern: Pattern[str]) -> Optional[Pattern[str]]:
+    """A re.I ``pattern`` rewritten to match lowercased text case-sensitively.
+
+    Without re.I the engine skips ahead on a pattern's literal prefix or
+    its alternatives' first characters instead of trying every position,
+    which is several times faster. None for patterns that are not re.I or
+    contain an uppercase escape; those must search the original text.
+    """
+    if not pattern.flags & re.I or _UPPER_ESCAPE_PAT.search(pattern.pattern):
+        return None
+    return re.compile(pattern.pattern.lower(), pattern.flags & ~re.I)
+
+
+# BLOCK_PAT against the lowercased head (None: search the head with BLOCK_PAT itself)
+_BLOCK_LOWER_PAT = lowered(BLOCK_PAT)
+
+
+def caseless_literal(literal: str) -> Pattern[str]:
+    """Case-insensitive search for ``literal``, led by its first character that has no case.
+
+    Matches wherever ``re.compile(re.escape(literal), re.I)`` does (use it
+    for whether, not where): a search led by a plain character such as the
+    "-" in "shreddit-forbidden" skips ahead with the engine's literal scan,
+    while re.I on the whole literal tries every position of the page.
+    """
+    for i, ch in enumerate(literal):
+        if ch.lower() == ch.upper():
+            before, after = literal[: i + 1], literal[i + 1:]
+            return re.compile(
+                re.escape(ch)
+                + (f"(?<=(?i:{re.escape(before)}))" if i else "")
+                + (f"(?=(?i:{re.escape(after)}))" if after else "")
+            )
+    return re.compile(re.escape(literal), re.I)
+
+
+_FORBIDDEN_FINDER = caseless_literal(FORBIDDEN_MARKER)
+_FORBIDDEN_FINDER_B = bytes_pattern(_FORBIDDEN_FINDER)
+
+
+class SignalScanner:
+    """Block phrases, the forbidden marker and a site's required elements in one page.
+
+    Required elements are lowercased once here, so checking them is a
+    substring test per element against the already lowercased head.
+    """
+
+    def __init__(self, required: Iterable[str] = ()) -> None:
+        self.required = [(el, el.lower()) for el in required]
+
+    def scan(self, page: Union[str, Buffer]) -> Dict[str, Any]:
+        """Signals found in ``page``, which may be raw bytes (only its head is decoded).
+
+        Returns:
+            {"head": first HEAD_CHARS characters, "block": bool,
+             "forbidden": bool, "missing": [required elements not in the head]}
+        """
+        page = page or ""
+        if isinstance(page, str):
+            head = page[:HEAD_CHARS]
+            forbidden = _FORBIDDEN_FINDER.search(page) is not None
+        else:
+            head = decode_head(page, HEAD_CHARS)
+            forbidden = _FORBIDDEN_FINDER_B.search(page) is not None
+        low = head.lower()
+        block = _BLOCK_LOWER_PAT.search(low) if _BLOCK_LOWER_PAT is not None else BLOCK_PAT.search(head)
+        return {
+            "head": head,
+            "block": block is not None,
+            "forbidden": forbidden,
+            "missing": [el for el, el_low in self.required if el_low not in low],
+        }
+
+
+_SCANNERS: Dict[str, SignalScanner] = {
+    site: SignalScanner(indicators.get("required_elements", ()))
+    for site, indicators in SOFT_BLOCK_INDICATORS.items()
+}
+_DEFAULT_SCANNER = SignalScanner()
+
+
+def scanner_for(site: str) -> SignalScanner:
+    return _SCANNERS.get(site, _DEFAULT_SCANNER)
+
+
+class FailureClassifier:
+    """Prioritized failure rules over bounded windows of a process's output.
+
+    Rules are ``(pattern, category, reason, stage)`` tried in order; the
+    first rule whose pattern occurs in any stream wins. Each stream is cut
+    to its first ``head`` and last ``tail`` characters and lowercased once,
+    and re.I rules search those copies case-sensitively. The rules only
+    match within a line, so searching the streams one by one finds what
+    searching them joined by newlines would, and streams that fit in the
+    windows are classified exactly as a full scan would classify them.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[Pattern[str], str, str, str]],
+        head: int = RUNTIME_HEAD_CHARS,
+        tail: int = RUNTIME_TAIL_CHARS,
+    ) -> None:
+        # (pattern, searches the lowercased windows, category, reason, stage)
+        self.rules: List[Tuple[Pattern[str], bool, str, str, str]] = []
+        for pattern, category, reason, stage in rules:
+            low = lowered(pattern)
+            self.rules.append((low or pattern, low is not None, category, reason, stage))
+        self.head = head
+        self.tail = tail
+
+    def windows(self, streams: Iterable[str]) -> List[str]:
+        """Head and tail of every non-empty stream (the whole stream when it fits)."""
+        out: List[str] = []
+        for text in streams:
+            if not text:
+                continue
+            if len(text) <= self.head + self.tail:
+                out.append(text)
+            else:
+                out.append(text[: self.head])
+                out.append(text[-self.tail:])
+        return out
+
+    def classify(self, *streams: str) -> Optional[Dict[str, str]]:
+        """The first matching rule's failure fields, or None."""
+        windows = self.windows(streams)
+        lower: Optional[List[str]] = None
+        for pattern, on_lower, category, reason, stage in self.rules:
+            if on_lower and lower is None:
+                lower = [w.lower() for w in windows]
+            if any(pattern.search(w) for w in (lower if on_lower else windows)):
+                return {"failure_category": category, "failure_reason": reason, "failure_stage": stage}
+        return None
+
+
+# Setup, then startup, then timeout errors; a block page in the output comes last
+RUNTIME_FAILURES = FailureClassifier(
+    [
+        *SETUP_PATTERNS,
+        *STARTUP_PATTERNS,
+        *TIMEOUT_PATTERNS,
+        (BLOCK_PAT, "site", "anti-bot-challenge", "page"),
+    ]
+)
@@ -0,0 +1,85 @@
+"""DaemonClient prints what the agent-browser CLI prints, and leaves commands it can't reproduce to the CLI."""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from runners.agent_daemon import DaemonClient
+
+PAGE = "data:text/html,<title>Daemon check</title><p>hello</p>"
+# Commands both paths run on PAGE; their stdout must match
+COMPARED = [["get", "title"], ["get", "url"], ["eval", "document.title"], ["eval", "({a: 1, b: [2]})"], ["snapshot"]]
+
+
+def _serve(path, replies):
+    """A one-connection daemon answering each request with replies[action]."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+
+    def run():
+        conn, _ = server.accept()
+        with conn, conn.makefile("rb") as reader:
+            for line in reader:
+                request = json.loads(line)
+                reply = dict(replies[request["action"]], id=request["id"])
+                conn.sendall((json.dumps(reply) + "\n").encode())
+        server.close()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def test_commands_without_a_verified_output_run_through_the_cli():
+    socket_dir = Path(tempfile.mkdtemp(prefix="ab"))
+    _serve(socket_dir / "s.sock", {
+        "title": {"success": True, "data": {"title": "A title"}},
+        "url": {"success": True, "data": {}},
+    })
+    daemon = DaemonClient("s", socket_dir)
+    try:
+        for words in (["open", "https://example.com"], ["--json", "cookies"], ["screenshot", "shot.png"]):
+            assert daemon.run(["agent-browser", "--session", "s"] + words, 5) is None
+        assert daemon.run(["agent-browser", "--session", "s", "get", "title"], 5)["stdout"] == "A title"
+        # A reply without the printed field means another protocol: the CLI takes over from here
+        assert daemon.run(["agent-browser", "--session", "s", "get", "url"], 5) is None
+        assert daemon.run(["agent-browser", "--session", "s", "get", "title"], 5) is None
+    finally:
+        daemon.close()
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+@pytest.mark.skipif(shutil.which("agent-browser") is None, reason="agent-browser is not installed")
+def test_daemon_output_matches_the_cli():
+    socket_dir = Path(tempfile.mkdtemp(prefix="ab"))
+    env = dict(os.environ, AGENT_BROWSER_SOCKET_DIR=str(socket_dir))
+    version = subprocess.run(["agent-browser", "--version"], capture_output=True, text=True).stdout.strip()
+
+    def cli(*words):
+        done = subprocess.run(
+            ["agent-browser", "--session", "abcheck", *words], capture_output=True, text=True, env=env, timeout=60
+        )
+        assert done.returncode == 0, done.stderr
+        return done.stdout
+
+    cli("open", PAGE)
+    daemon = DaemonClient.connect("abcheck", socket_dir)
+    assert daemon is not None, f"no daemon socket in {socket_dir}"
+    try:
+        for words in COMPARED:
+            result = daemon.run(["agent-browser", "--session", "abcheck", *words], 30)
+            assert result is not None and result["returncode"] == 0, f"{words} on agent-browser {version}: {result}"
+            assert result["stdout"].strip() == cli(*words).strip(), f"{words} on agent-browser {version}"
+    finally:
+        daemon.close()
+        cli("close")
+        shutil.rmtree(socket_dir, ignore_errors=True)
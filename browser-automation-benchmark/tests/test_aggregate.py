@@ -0,0 +1,168 @@
+"""The online summary matches the batch statistics: exactly up to EXACT_LIMIT values, within the sketch's error past it."""
+
+import random
+import statistics
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from aggregate import EXACT_LIMIT, SKETCH_ACCURACY, QuantileSketch, SummaryAggregator, TimingStats, timing_stats
+from run_benchmark import summarize
+
+OUTCOMES = ["success", "success", "partial", "blocked/challenged", "timeout", "crash/error"]
+
+
+def _values(n, seed=0):
+    rng = random.Random(seed)
+    # Spread over several orders of magnitude, with ties and zeros
+    return [round(rng.lognormvariate(0, 1.5), rng.choice((1, 3, 6))) for _ in range(n)]
+
+
+def _records(n, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        outcome = rng.choice(OUTCOMES)
+        record = {
+            "tool": rng.choice(["playwright", "agent-browser"]),
+            "site": rng.choice(["x", "reddit"]),
+            "attempt": i,
+            "outcome": outcome,
+            "duration_s": round(rng.uniform(0.5, 30), 3),
+            "expected": ["a", "b", "c"],
+            "extracted": {field: "v" for field in "abc" if rng.random() < 0.6},
+            "ground_truth": {"correctness_pct": rng.choice([None, 0.0, 50.0, 100.0])},
+            "failure_reason": rng.choice(["", "navigation-timeout", "captcha"]),
+            "failure_category": rng.choice(["", "setup", "startup", "site", "extraction"]),
+            "extraction_provenance": {"a": rng.choice(["json_ld", "meta", "regex"])},
+        }
+        for key in ("navigation_s", "wait_s", "extraction_s", "setup_s"):
+            if rng.random() < 0.8:
+                record[key] = round(rng.uniform(0, 10), 3)
+        if rng.random() < 0.7:
+            record["wait_ready"] = rng.random() < 0.5
+        if rng.random() < 0.5:
+            record["extraction_profile"] = {
+                "index_ms": round(rng.uniform(0, 5), 3),
+                "layers": {name: {"ms": round(rng.uniform(0, 2), 3)} for name in ("json_ld", "regex")},
+            }
+        records.append(record)
+    return records
+
+
+def _batch_summary(records):
+    """The per-(tool, site) summary as run_benchmark.summarize computed it from full lists, before it streamed."""
+    grouped = {}
+    for record in records:
+        grouped.setdefault((record["tool"], record["site"]), []).append(record)
+    summary = []
+    for (tool, site), rows in grouped.items():
+        count = Counter(row["outcome"] for row in rows)
+        n = len(rows)
+
+        def times(key, keep=lambda row: True):
+            return timing_stats([row[key] for row in rows if keep(row) and row.get(key) is not None])
+
+        ready = [row["wait_ready"] for row in rows if row.get("wait_ready") is not None]
+        completeness = [100 * sum(1 for f in row["expected"] if row["extracted"].get(f)) / len(row["expected"])
+                        for row in rows]
+        gt_all = [row["ground_truth"]["correctness_pct"] for row in rows
+                  if row["ground_truth"].get("correctness_pct") is not None]
+        gt_success = [row["ground_truth"]["correctness_pct"] for row in rows
+                      if row["ground_truth"].get("correctness_pct") is not None and row["outcome"] == "success"]
+        profiles = [row["extraction_profile"] for row in rows if row.get("extraction_profile")]
+        layer_ms = {}
+        for profile in profiles:
+            for name, layer in profile["layers"].items():
+                layer_ms.setdefault(name, []).append(layer["ms"])
+        provenance = {}
+        for row in rows:
+            for field, layer_name in (row.get("extraction_provenance") or {}).items():
+                provenance.setdefault(field, Counter())[layer_name] += 1
+        categories = Counter(row.get("failure_category") for row in rows)
+        summary.append({
+            "tool": tool,
+            "site": site,
+            "attempts": n,
+            "success": count["success"],
+            "partial": count["partial"],
+            "blocked": count["blocked/challenged"],
+            "timeout": count["timeout"],
+            "crash": count["crash/error"],
+            "success_rate": f"{count['success']}/{n}",
+            "success_rate_pct": round(100 * count["success"] / n, 2),
+            "block_rate_pct": round(100 * count["blocked/challenged"] / n, 2),
+            "partial_rate_pct": round(100 * count["partial"] / n, 2),
+            "timing_total": times("duration_s", lambda row: row["outcome"] != "crash/error"),
+            "timing_success": times("duration_s", lambda row: row["outcome"] == "success"),
+            "timing_navigation": times("navigation_s"),
+            "timing_wait": times("wait_s"),
+            "ready_rate_pct": round(100 * sum(ready) / len(ready), 2) if ready else None,
+            "timing_extraction": times("extraction_s"),
+            "timing_setup": times("setup_s"),
+            "timing_extraction_index_ms": timing_stats([profile["index_ms"] for profile in profiles]),
+            "timing_extraction_layers_ms": {name: timing_stats(values) for name, values in layer_ms.items()},
+            "field_provenance": {field: dict(counts) for field, counts in provenance.items()},
+            "data_completeness_pct": round(sum(completeness) / n, 2),
+            "correctness_pct": round(sum(gt_all) / len(gt_all), 2) if gt_all else None,
+            "correctness_success_only_pct": round(sum(gt_success) / len(gt_success), 2) if gt_success else None,
+            "stability_score": round(max(0, 100 - (count["timeout"] + count["crash/error"]) * 8), 2),
+            "setup_failures": categories["setup"],
+            "startup_failures": categories["startup"],
+            "site_failures": categories["site"],
+            "extraction_failures": categories["extraction"],
+            "failure_reasons": dict(Counter(row["failure_reason"] for row in rows if row.get("failure_reason"))),
+        })
+    return summary
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 100, EXACT_LIMIT])
+def test_exact_up_to_the_limit(n):
+    values = _values(n)
+    stats = TimingStats()
+    for value in values:
+        stats.add(value)
+    assert stats.result() == timing_stats(values)
+
+
+@pytest.mark.parametrize("n", [EXACT_LIMIT + 1, 10_000, 100_000])
+def test_sketch_error_is_bounded_past_the_limit(n):
+    values = _values(n, seed=n)
+    stats = TimingStats()
+    for value in values:
+        stats.add(value)
+    online, exact = stats.result(), timing_stats(values)
+    # Moments and extremes stay exact
+    for key in ("mean", "min", "max", "stdev"):
+        assert online[key] == pytest.approx(exact[key], abs=1e-3)
+    # Quantiles are within SKETCH_ACCURACY of the true ones (plus rounding to 3 places)
+    for key in ("median", "p95"):
+        assert abs(online[key] - exact[key]) <= SKETCH_ACCURACY * exact[key] + 1e-3
+    q = statistics.quantiles(values, n=4)
+    assert abs(online["iqr"] - exact["iqr"]) <= SKETCH_ACCURACY * (q[0] + q[2]) + 2e-3
+
+
+def test_sketch_quantiles_follow_statistics_quantiles():
+    values = _values(5000, seed=1)
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    for got, want in zip(sketch.quantiles(100), statistics.quantiles(values, n=100)):
+        assert abs(got - want) <= SKETCH_ACCURACY * want + 1e-9
+    assert abs(sketch.median() - statistics.median(values)) <= SKETCH_ACCURACY * statistics.median(values)
+
+
+def test_summary_matches_batch_summary():
+    records = _records(2000)
+    aggregator = SummaryAggregator()
+    for record in records:
+        aggregator.add(record)
+    batch = _batch_summary(records)
+    for summary in (aggregator.summary(), summarize(records)):
+        assert summary == batch
+        # Same keys in the same order, so summary.json is byte-for-byte the same
+        assert [list(group) for group in summary] == [list(group) for group in batch]
@@ -0,0 +1,35 @@
+"""Safe mode bounds tokenizing too: adversarial pages return within the budget."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from extractors import extract_report
+from extractors.budget import SAFE_WINDOW, TIME_BUDGET_REASON, Budget
+from extractors.document import DocumentIndex
+
+URL = "https://x.com/jack/status/20"
+EXPECTED = ["post_text", "author_handle", "timestamp", "canonical_url"]
+
+
+@pytest.mark.parametrize("unit", ["<title>x", '<script type="application/ld+json">x', "<meta a"])
+def test_adversarial_page_returns_with_time_budget_exceeded(unit):
+    page = "<html><head>" + unit * (3 * SAFE_WINDOW // len(unit))
+    started = time.perf_counter()
+    report = extract_report("x", page, URL, expected=EXPECTED, budget_s=0.05)
+    assert time.perf_counter() - started < 1
+    assert report["missing"]
+    assert set(report["missing"].values()) == {TIME_BUDGET_REASON}
+    assert not report["fields"].get("post_text")
+
+
+def test_index_stops_at_safe_window():
+    page = "<html><head><title>t</title></head><body>" + "x" * 100 + '<shreddit-post author="late">'
+    index = DocumentIndex(page, Budget(60, window=len(page) - 10))
+    assert index.title == "t"
+    assert index.shreddit_posts == []
+    assert DocumentIndex(page, Budget(60)).shreddit_posts
@@ -0,0 +1,31 @@
+"""A page gets one cache key whether it is passed as read_text() text or as raw bytes."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from extractors.cache import cache_key
+from extractors.pagebytes import map_page
+
+URL = "https://x.com/jack/status/20"
+
+
+@pytest.mark.parametrize("raw", [
+    b"<html><head><title>plain</title></head></html>",
+    b"<html>\r\n<head><title>crlf</title></head>\r</html>\r\n",
+    b"<html><head><title>bad \xff\xfe utf-8 \xc3\xa9</title></head></html>",
+])
+def test_text_and_bytes_share_a_key(tmp_path, raw):
+    path = tmp_path / "page.html"
+    path.write_bytes(raw)
+    text = path.read_text(errors="ignore")
+    with map_page(path) as data:
+        assert cache_key("x", data, URL, ["post_text"], 1024) == cache_key("x", text, URL, ["post_text"], 1024)
+    assert cache_key("x", raw, URL) == cache_key("x", text, URL)
+
+
+def test_key_depends_on_content():
+    assert cache_key("x", "<p>a</p>", URL) != cache_key("x", "<p>b</p>", URL)
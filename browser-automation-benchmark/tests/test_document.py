@@ -0,0 +1,56 @@
+"""DocumentIndex tokenizes malformed pages in linear time and finds the same tokens in text and bytes."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from extractors.document import DocumentIndex
+
+PAGE = (
+    '<html><head><title>A post</title>\n'
+    '<meta property="og:url" content="https://x.com/jack/status/20">\n'
+    '<META content=\'q > r\' name="description">\n'
+    '<script type="application/ld+json">{"@type": "Article", "headline": "h"}</script>\n'
+    '</head><body><title>not the title</title><meta property="og:title" content="body meta">\n'
+    '<shreddit-post author="ieslam" created-timestamp="2024-01-01T00:00:00Z"></shreddit-post>\n'
+    '<SCRIPT TYPE=\'application/ld+json\'>{"@type": "WebPage"}</SCRIPT></body></html>'
+)
+
+# Openers whose close tag (or ">") never comes: each used to rescan the rest of the page
+UNCLOSED = ["<title>x", '<script type="application/ld+json">x', "<meta a", '<meta a"', "<script ", "<shreddit-post "]
+
+
+def _tokens(index):
+    return index.json_ld, index.meta, index.title, [tag for _, tag in index.shreddit_posts]
+
+
+def test_tokens():
+    index = DocumentIndex(PAGE)
+    assert index.title == "A post"
+    assert index.meta == {"og:url": "https://x.com/jack/status/20", "description": "q > r"}
+    assert index.json_ld == ['{"@type": "Article", "headline": "h"}', '{"@type": "WebPage"}']
+    assert index.shreddit_posts == [
+        (PAGE.index("<shreddit-post"), '<shreddit-post author="ieslam" created-timestamp="2024-01-01T00:00:00Z">')
+    ]
+    assert _tokens(DocumentIndex(PAGE.encode())) == _tokens(index)
+
+
+def test_chunks_find_the_same_tokens():
+    for size in (1, 7, 64):
+        index = DocumentIndex()
+        for i in range(0, len(PAGE), size):
+            index.feed(PAGE[i:i + size], 1 << 20)
+        assert _tokens(index) == _tokens(DocumentIndex(PAGE))
+
+
+@pytest.mark.parametrize("unit", UNCLOSED)
+def test_unclosed_openers_are_linear(unit):
+    page = "<html><head>" + unit * (2_000_000 // len(unit)) + ">"
+    started = time.perf_counter()
+    DocumentIndex(page)
+    DocumentIndex(page.encode())
+    assert time.perf_counter() - started < 2
@@ -0,0 +1,27 @@
+"""Chains waiting on a busy site don't hold global slots other sites could use."""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from executor import ConcurrencyLimits, run_chains
+
+
+def test_busy_site_does_not_starve_other_sites():
+    limits = ConcurrencyLimits(workers=2, per_site=1)
+    other_site_ran = threading.Event()
+
+    def chain(site):
+        def run():
+            with limits.slot("playwright", site):
+                if site == "b":
+                    other_site_ran.set()
+                    return [True]
+                # The first "a" attempt keeps its slots until "b" has run (or gives up)
+                return [other_site_ran.wait(timeout=5)]
+        return run
+
+    results = run_chains([chain("a"), chain("a"), chain("a"), chain("b")], limits)
+    assert results == [True, True, True, True]
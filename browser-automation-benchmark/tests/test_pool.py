@@ -0,0 +1,49 @@
+"""Switching a chain between headless and headed keeps every worker accounted for."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from runners import pool as pool_module
+from runners.pool import WorkerPool
+
+REPLY = {"returncode": 0, "stdout": "", "stderr": "", "launch_s": 0.0, "reused": False}
+
+
+class FakeWorker:
+    started = []
+
+    def __init__(self, tool, headless, cwd=None):
+        self.tool = tool
+        self.headless = headless
+        self.alive = True
+        self.launch_s = 0.0
+        self.timed_out = False
+        self.command = f"fake {tool}"
+        FakeWorker.started.append(self)
+
+    def request(self, job, timeout):
+        return dict(REPLY)
+
+    def drain_stderr(self):
+        return ""
+
+    def close(self):
+        self.alive = False
+
+    kill = close
+
+
+def test_headless_switch_returns_the_old_worker_to_the_pool(monkeypatch):
+    monkeypatch.setattr(pool_module, "BrowserWorker", FakeWorker)
+    FakeWorker.started = []
+    workers = WorkerPool()
+    workers.run("camoufox", "x", True, {}, 10)
+    workers.run("camoufox", "x", False, {}, 10)
+    assert len(FakeWorker.started) == 2
+    # The headless worker the switch replaced serves the next headless chain
+    workers.run("camoufox", "reddit", True, {}, 10)
+    assert len(FakeWorker.started) == 2
+    workers.close()
+    assert not any(worker.alive for worker in FakeWorker.started)
@@ -0,0 +1,52 @@
+"""Re-extraction rewrites results without bringing back stale extraction keys."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from attempt_sink import iter_attempts
+from reextract import reextract_run
+
+URL = "https://x.com/jack/status/20"
+PAGE = (
+    '<html><head><meta property="og:description" content="just setting up my twttr">'
+    '<meta name="twitter:creator" content="@jack"></head>'
+    "<body><span>3:50 PM · Mar 21, 2006</span></body></html>"
+)
+
+
+def _run(tmp_path: Path) -> Path:
+    run_dir = tmp_path / "run"
+    adir = run_dir / "artifacts" / "x-x-1"
+    adir.mkdir(parents=True)
+    (adir / "page.html").write_text(PAGE)
+    (adir / "url.txt").write_text(URL)
+    record = {
+        "tool": "playwright", "site": "x", "attempt": 1, "run_id": adir.name, "outcome": "partial",
+        "expected": ["post_text", "author_handle", "timestamp", "canonical_url"], "extracted": {},
+        "error": "", "final_url": URL, "failure_reason": "", "duration_s": 1.0,
+    }
+    (adir / "record.json").write_text(json.dumps(record))
+    stale = dict(
+        record, mode="headless",
+        extraction_missing={"post_text": "time-budget-exceeded"},
+        extraction_profile={"index_ms": 1.0, "index_chars": 1, "layers": {}},
+    )
+    res = run_dir / "results"
+    res.mkdir()
+    (res / "attempts.json").write_text(json.dumps([stale]))
+    return run_dir
+
+
+def test_stale_extraction_keys_are_not_carried_over(tmp_path):
+    run_dir = _run(tmp_path)
+    assert reextract_run(run_dir, workers=1, use_cache=False) == {".": 1}
+    res = run_dir / "results"
+    for records in (json.loads((res / "attempts.json").read_text()), list(iter_attempts(res))):
+        (rec,) = records
+        assert rec["mode"] == "headless"
+        assert rec["extracted"]["post_text"] == "just setting up my twttr"
+        assert "extraction_missing" not in rec
+        assert rec["extraction_profile"]["index_chars"] == len(PAGE.encode())
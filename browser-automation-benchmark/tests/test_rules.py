@@ -0,0 +1,139 @@
+"""Each site's rules extract the expected fields from representative pages."""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from extractors import extract
+from extractors.rules import _R_PAGE_WINDOW
+
+
+def _ld(block):
+    return f'<script type="application/ld+json">{json.dumps(block)}</script>'
+
+
+X_STATUS = "https://x.com/jack/status/20"
+X_PAGE = (
+    "<html><head><title>jack on X: \"just setting up my twttr\" / X</title>"
+    f'<meta property="og:url" content="{X_STATUS}">'
+    '<meta property="og:description" content="just setting up my twttr">'
+    '<meta name="twitter:creator" content="@jack">'
+    "</head><body>3:50 PM · Mar 21, 2006</body></html>"
+)
+X_STATE_PAGE = (
+    "<html><head><title>X</title></head><body><script>window.__INITIAL_STATE__ = "
+    + json.dumps({"entities": {
+        "tweets": {"entities": {"20": {"full_text": "just setting up my twttr", "created_at": "Tue Mar 21 20:50:14 +0000 2006"}}},
+        "users": {"entities": {"12": {"screen_name": "jack"}}},
+    }})
+    + ";</script></body></html>"
+)
+REDDIT_URL = "https://www.reddit.com/r/python/comments/abc/a_post/"
+REDDIT_LD_PAGE = "<html><head>" + _ld({
+    "@type": "DiscussionForumPosting",
+    "headline": "A post",
+    "articleBody": "b" * 400,
+    "author": {"name": "u/spez", "url": "https://www.reddit.com/user/spez"},
+    "datePublished": "2024-01-01T00:00:00Z",
+    "url": REDDIT_URL,
+    "isPartOf": {"url": "https://www.reddit.com/r/python/"},
+}) + "</head></html>"
+# Header and ads above the post mention other users and times; the post comes after them
+REDDIT_HEADER = '<header>u/advertiser posted 12 hours ago, id 20240101</header>'
+REDDIT_POST_PAGE = (
+    f"<html><head><title>A post : r/python</title></head><body>{REDDIT_HEADER}"
+    '<shreddit-post post-title="A post"><span>u/spez</span> 3 hours ago</shreddit-post></body></html>'
+)
+LINKEDIN_PAGE = "<html><head>" + _ld({
+    "@type": "Organization",
+    "name": "Microsoft",
+    "address": {"addressLocality": "Redmond"},
+    "url": "https://www.linkedin.com/company/microsoft",
+    "numberOfEmployees": {"value": 10001},
+}) + "</head></html>"
+INSTAGRAM_PAGE = (
+    '<html><head><meta property="og:title" content="Instagram (@instagram)">'
+    '<meta property="og:url" content="https://www.instagram.com/instagram/"></head></html>'
+)
+
+CASES = [
+    ("x", X_PAGE, X_STATUS, {
+        "post_text": "just setting up my twttr",
+        "author_handle": "jack",
+        "canonical_url": X_STATUS,
+        "timestamp": "3:50 PM · Mar 21, 2006",
+    }),
+    ("x", X_STATE_PAGE, X_STATUS, {
+        "post_text": "just setting up my twttr",
+        "author_handle": "jack",
+        "timestamp": "Tue Mar 21 20:50:14 +0000 2006",
+        "canonical_url": X_STATUS,
+    }),
+    ("reddit", REDDIT_LD_PAGE, REDDIT_URL, {
+        "post_title": "A post",
+        "post_body": "b" * 300,
+        "author": "spez",
+        "timestamp": "2024-01-01T00:00:00Z",
+        "canonical_url": REDDIT_URL,
+        "subreddit": "python",
+    }),
+    ("linkedin", LINKEDIN_PAGE, "https://www.linkedin.com/company/microsoft", {
+        "title_or_company": "Microsoft",
+        "location": "Redmond",
+        "page_url": "https://www.linkedin.com/company/microsoft",
+        "key_metadata": "10001 employees",
+    }),
+    ("instagram", INSTAGRAM_PAGE, "https://www.instagram.com/instagram/", {
+        "username": "Instagram (@instagram)",
+        "canonical_url": "https://www.instagram.com/instagram/",
+    }),
+    ("control_httpbin", '{"headers": {"User-Agent": "Mozilla/5.0 test"}}', "https://httpbin.org/headers", {
+        "user_agent": "Mozilla/5.0 test",
+    }),
+]
+
+
+@pytest.mark.parametrize("site, page, url, fields", CASES, ids=[f"{c[0]}-{i}" for i, c in enumerate(CASES)])
+def test_site_pages(site, page, url, fields):
+    assert extract(site, page, url) == fields
+    assert extract(site, page.encode(), url) == fields
+
+
+def test_if_url_keeps_og_url_to_x_pages():
+    # A page captured off x.com (a redirect, an error page) keeps no canonical_url, og:url or not
+    assert "canonical_url" not in extract("x", X_PAGE, "https://example.com/login")
+    assert extract("x", X_PAGE, X_STATUS)["canonical_url"] == X_STATUS
+
+
+def test_reddit_text_fallbacks_search_from_the_post():
+    fields = extract("reddit", REDDIT_POST_PAGE, REDDIT_URL)
+    assert fields["author"] == "spez"
+    assert fields["timestamp"] == "3 hours ago"
+
+
+def test_reddit_without_a_post_tag_searches_the_page_start():
+    page = REDDIT_POST_PAGE.replace("shreddit-post", "div")
+    fields = extract("reddit", page, REDDIT_URL)
+    assert fields["author"] == "advertiser"
+    assert fields["timestamp"] == "12 hours ago"
+    # ... but only its first _R_PAGE_WINDOW characters
+    far = "<html><body>" + " " * _R_PAGE_WINDOW + "u/spez 3 hours ago</body></html>"
+    fields = extract("reddit", far, REDDIT_URL)
+    assert "author" not in fields and "timestamp" not in fields
+
+
+def test_digit_runs_match_from_their_start():
+    # (?<!\d) leaves the first match alone and keeps a long digit run from being retried at every digit
+    assert extract("reddit", "<div>u/a 123 days ago</div>", REDDIT_URL)["timestamp"] == "123 days ago"
+    run = "7" * 200_000
+    started = time.perf_counter()
+    fields = extract("reddit", f"<div>{run} views, 2 days ago</div>", REDDIT_URL)
+    assert fields["timestamp"] == "2 days ago"
+    fields = extract("linkedin", f"<div>{run} followers · 10001 employees</div>", "https://www.linkedin.com/company/x")
+    assert fields["key_metadata"] == "10001 employees"
+    assert time.perf_counter() - started < 2
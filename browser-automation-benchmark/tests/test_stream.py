@@ -0,0 +1,70 @@
+"""Streaming extraction gives extract()'s fields whatever the chunk size."""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from extractors import extract
+from extractors.stream import extract_stream, iter_chunks
+
+URL = "https://x.com/jack/status/20"
+EXPECTED = ["post_text", "author_handle", "timestamp", "canonical_url"]
+
+# The state blob sits in the first kilobyte; the timestamp only in the page's last line
+STATE = {
+    "entities": {
+        "tweets": {"entities": {"20": {"full_text": "just setting up my twttr"}}},
+        "users": {"entities": {"12": {"screen_name": "jack"}}},
+    }
+}
+PAGE = (
+    "<html><head><script>window.__INITIAL_STATE__=" + json.dumps(STATE) + ";</script></head><body>"
+    + "<p>filler words here</p>" * 400
+    + "<span>3:50 PM · Mar 21, 2006</span></body></html>"
+)
+
+
+def _stream(expected=None):
+    return extract_stream("x", io.BytesIO(PAGE.encode()), URL, expected=expected, chunk_size=1024)
+
+
+def test_app_state_from_first_chunk_survives_later_chunks():
+    result = _stream(EXPECTED)
+    assert result["complete"]
+    assert result["fields"] == extract("x", PAGE, URL, expected=EXPECTED)
+    assert result["fields"]["post_text"] == "just setting up my twttr"
+    assert result["fields"]["author_handle"] == "jack"
+
+
+def test_app_state_kept_without_expected_list():
+    fields = _stream()["fields"]
+    assert fields["post_text"] == "just setting up my twttr"
+    assert fields["author_handle"] == "jack"
+    assert fields["timestamp"] == "3:50 PM · Mar 21, 2006"
+
+
+# A post_text match ("\n<line>\n...@") that starts 6000 characters before the "@" that completes it
+LONG_MATCH_PAGE = (
+    "<html><head></head><body>\n" + "L" * 30 + "\n" + "y" * 6000 + "@handle more\n" + "M" * 30 + "\n@z\n</body></html>"
+)
+
+
+@pytest.mark.parametrize("page", [PAGE, LONG_MATCH_PAGE], ids=["app_state", "long_match"])
+@pytest.mark.parametrize("chunk_size", [1, 100, 1024, 4096, 8192, 1 << 20])
+def test_matches_extract_across_chunk_sizes(page, chunk_size):
+    fields = extract_stream("x", io.BytesIO(page.encode()), URL, chunk_size=chunk_size)["fields"]
+    assert fields == extract("x", page, URL)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100, 1 << 20])
+def test_crlf_pages_decode_as_read_text(tmp_path, chunk_size):
+    path = tmp_path / "page.html"
+    path.write_bytes(LONG_MATCH_PAGE.replace("\n", "\r\n").encode() + b"\r")
+    text = path.read_text(errors="ignore")
+    assert "".join(iter_chunks(path, chunk_size)) == text
+    assert extract_stream("x", path, URL, chunk_size=chunk_size)["fields"] == extract("x", text, URL)